@@ -0,0 +1,268 @@
+'''
+Author:         Aryan Shukla
+Module Name:    AI CoPilot intent registry
+Tools Used:     Python 3.13.3, XPPython3 4.5.0
+
+Maps recognized intents to actions that are resolved once, at plugin start:
+
+    CommandIntent   "GEAR_UP"     -> xp.commandOnce(<cached command ref>)
+    DatarefIntent   "SET_HEADING" -> xp.setDataf(<cached dataref>, 270.0)
+
+Dataref intents are matched by keyword ("SET HEADING 270") rather than by
+the classifier, and carry a numeric parameter parsed from the clause (digits
+or spoken words like "TWO SEVEN ZERO"). Keywords are indexed once, as word
+tuples in a dict, so matching a clause is a few dict lookups; the longest
+keyword wins ("VERTICAL SPEED" over "SPEED").
+
+The intent file (JSON) extends or overrides the built-in command table:
+
+    {
+      "commands": {"TAXI_LIGHT_ON": "sim/lights/taxi_lights_on"},
+      "datarefs": {
+        "SET_HEADING": {
+          "keywords": ["HEADING", "HDG"],
+          "dataref": "sim/cockpit2/autopilot/heading_dial_deg_mag_pilot",
+          "min": 0, "max": 360, "wrap": true
+        }
+      }
+    }
+
+"levels" (optional) lists keywords after which values below 1000 are flight
+levels ("FL 350" -> 35000). "pattern" (a regex) can stand in for "keywords";
+such intents are only tried after the keyword lookup misses.
+'''
+
+import json
+import os
+import re
+from XPPython3 import xp  # type: ignore
+
+
+NUMBER_WORDS = {
+    "ZERO": 0, "OH": 0, "ONE": 1, "TWO": 2, "THREE": 3, "FOUR": 4, "FIVE": 5,
+    "SIX": 6, "SEVEN": 7, "EIGHT": 8, "NINE": 9, "NINER": 9, "TEN": 10,
+    "ELEVEN": 11, "TWELVE": 12, "THIRTEEN": 13, "FOURTEEN": 14, "FIFTEEN": 15,
+    "SIXTEEN": 16, "SEVENTEEN": 17, "EIGHTEEN": 18, "NINETEEN": 19, "TWENTY": 20,
+    "THIRTY": 30, "FORTY": 40, "FIFTY": 50, "SIXTY": 60, "SEVENTY": 70,
+    "EIGHTY": 80, "NINETY": 90,
+}
+SIGN_WORDS = ("MINUS", "NEGATIVE")
+DIGIT_GROUP = re.compile(r"(?<=\d),(?=\d{3}\b)")
+
+
+def JoinDigitGroups(text: str) -> str:
+    '''"10,000" -> "10000", so thousands separators (as the Google backend
+    writes them) are neither clause breaks nor the end of a number.'''
+    return DIGIT_GROUP.sub("", text)
+
+
+def ExtractNumber(text: str):
+    '''Return the number spoken in `text`, or None.
+
+    "SET HEADING 270", "HEADING TWO SEVEN ZERO", "SPEED TWO FIFTY" and
+    "ALTITUDE TEN THOUSAND FIVE HUNDRED" are all understood, as are
+    "10,000", "10 THOUSAND" and "ONE ZERO THOUSAND". MINUS or NEGATIVE
+    before the number makes it negative.'''
+    text = JoinDigitGroups(text.upper())
+    match = re.search(r"-?\d+(?:\.\d+)?", text)
+    if match:
+        value = float(match.group())
+        scale = re.match(r"\s*(THOUSAND|HUNDRED)\b", text[match.end():])
+        if scale:
+            value *= 1000 if scale.group(1) == "THOUSAND" else 100
+        if value > 0 and re.search(r"\b(?:%s)\b" % "|".join(SIGN_WORDS), text[:match.start()]):
+            value = -value
+        return value
+
+    words = [w for w in re.findall(r"[A-Z]+", text)
+             if w in NUMBER_WORDS or w in ("HUNDRED", "THOUSAND", "POINT") or w in SIGN_WORDS]
+    if not any(w in NUMBER_WORDS for w in words):
+        return None
+
+    sign = -1.0 if any(w in SIGN_WORDS for w in words) else 1.0
+    words = [w for w in words if w not in SIGN_WORDS]
+
+    fraction = ""
+    if "POINT" in words:
+        idx = words.index("POINT")
+        fraction = "".join(str(NUMBER_WORDS[w]) for w in words[idx + 1:] if NUMBER_WORDS.get(w, 10) < 10)
+        words = words[:idx]
+
+    # Aviation style digit-by-digit: "TWO SEVEN ZERO" -> 270
+    if len(words) > 1 and all(NUMBER_WORDS.get(w, 10) < 10 for w in words):
+        whole = float("".join(str(NUMBER_WORDS[w]) for w in words))
+    else:
+        total, current = 0, 0
+        for k, w in enumerate(words):
+            if w == "HUNDRED":
+                current = max(current, 1) * 100
+            elif w == "THOUSAND":
+                total += max(current, 1) * 1000
+                current = 0
+            elif NUMBER_WORDS[w] >= 10 and 0 < current < 20:
+                # Grouped hundreds: "TWO FIFTY" -> 250, "ONE TWENTY" -> 120
+                current = current * 100 + NUMBER_WORDS[w]
+            elif NUMBER_WORDS[w] < 10 and k and NUMBER_WORDS.get(words[k - 1], 10) < 10:
+                # Digit run: "ONE ZERO THOUSAND" -> 10 thousand
+                current = current * 10 + NUMBER_WORDS[w]
+            else:
+                current += NUMBER_WORDS[w]
+        whole = float(total + current)
+
+    return sign * (whole + (float("0." + fraction) if fraction else 0.0))
+
+
+class CommandIntent:
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+        self.ref = None
+
+    def Resolve(self):
+        self.ref = xp.findCommand(self.command)
+        return self.ref is not None
+
+    def Describe(self, value=None):
+        return self.name.replace("_", " ")
+
+    def Execute(self, value=None):
+        xp.commandOnce(self.ref)
+
+
+class DatarefIntent:
+    def __init__(self, name, dataref, keywords=(), pattern=None, min=None, max=None, wrap=False,
+                 type="float", levels=()):
+        self.name = name
+        self.dataref = dataref
+        self.keywords = [tuple(k.upper().split()) for k in keywords]
+        self.pattern = re.compile(pattern) if pattern else None
+        # After these keywords values below 1000 are flight levels (hundreds of feet)
+        self.levels = {tuple(k.upper().split()) for k in levels}
+        self.min = min
+        self.max = max
+        self.wrap = wrap
+        self.type = type
+        self.ref = None
+
+    def Resolve(self):
+        self.ref = xp.findDataRef(self.dataref)
+        return self.ref is not None and bool(xp.canWriteDataRef(self.ref))
+
+    def Parse(self, clause: str):
+        '''Return the value to write for `clause` (already matched to this
+        intent), or None if it carries no number.'''
+        value = ExtractNumber(clause)
+        if value is None:
+            return None
+        if self.levels and abs(value) < 1000 and FindKeyword(Words(clause), self.levels):
+            value *= 100
+        if self.wrap and self.max is not None:
+            low = self.min or 0.0
+            value = low + (value - low) % (self.max - low)
+        else:
+            if self.min is not None:
+                value = max(self.min, value)
+            if self.max is not None:
+                value = min(self.max, value)
+        return value
+
+    def Describe(self, value=None):
+        return f"{self.name.replace('_', ' ')} {value:g}"
+
+    def Execute(self, value=None):
+        if self.type == "int":
+            xp.setDatai(self.ref, int(round(value)))
+        else:
+            xp.setDataf(self.ref, float(value))
+
+
+def Words(clause: str) -> list:
+    return [w.strip(".,?!") for w in clause.upper().split()]
+
+
+def FindKeyword(words, keywords, longest=None):
+    '''First of the longest word tuples from `keywords` (a set or dict) found
+    in `words`, or None.'''
+    longest = longest or max((len(k) for k in keywords), default=0)
+    for n in range(min(longest, len(words)), 0, -1):
+        for i in range(len(words) - n + 1):
+            key = tuple(words[i:i + n])
+            if key in keywords:
+                return key
+    return None
+
+
+class IntentRegistry:
+    def __init__(self):
+        self.commands = {}          # intent name -> CommandIntent
+        self.datarefs = []          # DatarefIntents, in file order
+        self.unresolved = []
+        self.byName = {}            # intent name -> DatarefIntent
+        self.keywords = {}          # keyword word tuple -> DatarefIntent
+        self.longest = 0
+        self.patterns = []          # DatarefIntents without keywords
+
+    @classmethod
+    def Load(cls, intent_to_command, path=None):
+        registry = cls()
+        commands = dict(intent_to_command)
+        datarefs = {}
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                config = json.load(f)
+            commands.update(config.get("commands", {}))
+            datarefs = config.get("datarefs", {})
+
+        for name, command in commands.items():
+            registry.commands[name] = CommandIntent(name, command)
+        for name, spec in datarefs.items():
+            registry.datarefs.append(DatarefIntent(name, **spec))
+        registry.Index()
+        return registry
+
+    def Index(self):
+        self.byName = {i.name: i for i in self.datarefs}
+        self.keywords = {}
+        for intent in self.datarefs:
+            for key in intent.keywords:
+                self.keywords.setdefault(key, intent)
+        self.longest = max((len(k) for k in self.keywords), default=0)
+        self.patterns = [i for i in self.datarefs if not i.keywords and i.pattern is not None]
+
+    def Resolve(self):
+        '''Look up every command / dataref once. Unresolved intents are dropped
+        from the registry and returned.'''
+        self.unresolved = [i for i in self.commands.values() if not i.Resolve()]
+        self.unresolved += [i for i in self.datarefs if not i.Resolve()]
+
+        for intent in self.unresolved:
+            self.commands.pop(intent.name, None)
+        self.datarefs = [i for i in self.datarefs if i not in self.unresolved]
+        self.Index()
+        return self.unresolved
+
+    def MatchName(self, clause: str):
+        '''Name of the dataref intent whose keyword `clause` contains, else None.'''
+        key = FindKeyword(Words(clause), self.keywords, self.longest) if self.keywords else None
+        if key is not None:
+            return self.keywords[key].name
+        for intent in self.patterns:
+            if intent.pattern.search(clause.upper()):
+                return intent.name
+        return None
+
+    def Action(self, name, clause: str):
+        '''(intent, value) to run for `clause` classified as `name`, or None.'''
+        if name in self.commands:
+            return self.commands[name], None
+        intent = self.byName.get(name)
+        if intent is None:
+            return None
+        value = intent.Parse(clause)
+        return (intent, value) if value is not None else None
+
+    def MatchDataref(self, clause: str):
+        '''Return (intent, value) for a parameterised clause, else None.'''
+        name = self.MatchName(clause)
+        return self.Action(name, clause) if name is not None else None
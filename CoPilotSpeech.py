@@ -0,0 +1,272 @@
+'''
+Author:         Aryan Shukla
+Module Name:    AI CoPilot speech recognition backends
+Tools Used:     Python 3.13.3, SpeechRecognition, Vosk
+
+Push-to-talk recognizers used by PI_CoPilot. Every backend follows the same
+cycle:
+
+    backend.Start()          # key pressed: audio is captured on a thread
+    text = backend.Stop()    # key released: returns the transcript
+    backend.Close()          # plugin stopping
+
+Audio comes from an AudioSource: the microphone inside X-Plane, or a WAV file
+for offline tests and benchmarks. Streaming engines (Vosk) decode each chunk as
+it arrives while the key is held, so Stop() only has to flush the last chunk.
+
+Streaming engines also report the hypothesis so far while the key is held:
+
+    backend.onPartial = callback    # callback(text), on the capture thread
+
+`text` is the whole utterance so far (finalized segments plus the current
+partial); it is only reported when it changes.
+'''
+
+import json
+import threading
+import time
+import wave
+
+
+class RecognitionError(Exception):
+    '''The recognition engine failed (network, model, device).'''
+
+
+class NotUnderstoodError(RecognitionError):
+    '''Audio was captured but no words could be recognized.'''
+
+
+# ============================================================
+# Audio sources
+# ============================================================
+class MicrophoneSource:
+    '''Default system microphone via SpeechRecognition / PyAudio.'''
+
+    def __init__(self, sr, sample_rate=16000, chunk=1024):
+        self.sr = sr
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.mic = None
+        self.sample_width = 2
+
+    def Open(self):
+        self.mic = self.sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.chunk)
+        self.mic.__enter__()
+        self.sample_width = self.mic.SAMPLE_WIDTH
+
+    def Read(self):
+        return self.mic.stream.read(self.chunk)
+
+    def Close(self):
+        if self.mic is not None:
+            self.mic.__exit__(None, None, None)
+            self.mic = None
+
+
+class WavFileSource:
+    '''Replays a 16-bit mono WAV file in chunks. With realtime=True each chunk
+    is paced to its playback duration, like a microphone would deliver it.'''
+
+    def __init__(self, path, chunk=1024, realtime=True):
+        self.path = path
+        self.chunk = chunk
+        self.realtime = realtime
+        self.wav = None
+        self.sample_rate = 16000
+        self.sample_width = 2
+
+    def Open(self):
+        self.wav = wave.open(self.path, 'rb')
+        self.sample_rate = self.wav.getframerate()
+        self.sample_width = self.wav.getsampwidth()
+
+    def Read(self):
+        data = self.wav.readframes(self.chunk)
+        if self.realtime and data:
+            time.sleep(len(data) / (self.sample_width * self.sample_rate))
+        return data
+
+    def Close(self):
+        if self.wav is not None:
+            self.wav.close()
+            self.wav = None
+
+    def Duration(self):
+        with wave.open(self.path, 'rb') as w:
+            return w.getnframes() / w.getframerate()
+
+
+# ============================================================
+# Recognizers
+# ============================================================
+class StreamingRecognizer:
+    '''Base class: captures chunks from `source` on a thread between Start()
+    and Stop(). Subclasses implement Reset(), AcceptChunk() and Finish().'''
+
+    def __init__(self, source):
+        self.source = source
+        self.thread = None
+        self.stopEvent = threading.Event()
+        self.error = None
+        self.onPartial = None
+        self.lastPartial = ""
+
+    def Start(self):
+        self.source.Open()
+        try:
+            self.Reset()
+        except Exception:
+            self.source.Close()
+            raise
+        self.lastPartial = ""
+        self.error = None
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self.CaptureLoop, name="CoPilotCaptureThread", daemon=True)
+        self.thread.start()
+
+    def CaptureLoop(self):
+        try:
+            while not self.stopEvent.is_set():
+                chunk = self.source.Read()
+                if not chunk:
+                    break
+                self.AcceptChunk(chunk)
+        except Exception as e:
+            self.error = e
+
+    def Stop(self) -> str:
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.source.Close()
+        if self.error is not None:
+            raise RecognitionError(str(self.error)) from self.error
+
+        text = self.Finish().strip()
+        if not text:
+            raise NotUnderstoodError("no speech recognized")
+        return text
+
+    def Close(self):
+        if self.thread is not None:
+            self.stopEvent.set()
+            self.thread.join()
+            self.thread = None
+            self.source.Close()
+
+    def Reset(self):
+        pass
+
+    def EmitPartial(self, text):
+        text = " ".join(text.split())
+        if text and text != self.lastPartial:
+            self.lastPartial = text
+            if self.onPartial is not None:
+                self.onPartial(text)
+
+    def AcceptChunk(self, chunk: bytes):
+        raise NotImplementedError
+
+    def Finish(self) -> str:
+        raise NotImplementedError
+
+
+class GoogleRecognizer(StreamingRecognizer):
+    '''Buffers the whole utterance and sends it to the Google Web Speech API
+    on release. Needs network access.'''
+
+    def __init__(self, source, sr):
+        super().__init__(source)
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self.frames = []
+
+    def Reset(self):
+        self.frames = []
+
+    def AcceptChunk(self, chunk):
+        self.frames.append(chunk)
+
+    def Finish(self):
+        audio = self.sr.AudioData(b"".join(self.frames), self.source.sample_rate, self.source.sample_width)
+        try:
+            return self.recognizer.recognize_google(audio)
+        except self.sr.UnknownValueError as e:
+            raise NotUnderstoodError(str(e)) from e
+        except self.sr.RequestError as e:
+            raise RecognitionError(str(e)) from e
+
+
+class VoskRecognizer(StreamingRecognizer):
+    '''Offline Kaldi recognizer on the CPU. Chunks are decoded as they arrive,
+    so the transcript is ready almost as soon as the key is released, and the
+    running hypothesis (PartialResult) is reported through onPartial.'''
+
+    def __init__(self, source, model_path, phrases=None):
+        super().__init__(source)
+        import vosk
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+        # Optional grammar: restricting the vocabulary to our command phrases
+        # makes decoding both faster and more accurate.
+        self.grammar = json.dumps(list(phrases) + ["[unk]"]) if phrases else None
+        self.kaldi = None
+        self.segments = []          # text of segments Kaldi has finalized (endpoints)
+
+    def Reset(self):
+        self.segments = []
+        if self.grammar:
+            self.kaldi = self.vosk.KaldiRecognizer(self.model, self.source.sample_rate, self.grammar)
+        else:
+            self.kaldi = self.vosk.KaldiRecognizer(self.model, self.source.sample_rate)
+
+    def AcceptChunk(self, chunk):
+        if self.kaldi.AcceptWaveform(chunk):
+            # Endpoint: this segment is final and Kaldi starts a new one
+            self.segments.append(json.loads(self.kaldi.Result()).get("text", "").replace("[unk]", ""))
+            partial = ""
+        else:
+            partial = json.loads(self.kaldi.PartialResult()).get("partial", "").replace("[unk]", "")
+        self.EmitPartial(" ".join(self.segments + [partial]))
+
+    def Finish(self):
+        text = json.loads(self.kaldi.FinalResult()).get("text", "")
+        return " ".join(" ".join(self.segments + [text.replace("[unk]", "")]).split())
+
+
+class ScriptedRecognizer(StreamingRecognizer):
+    '''Test stand-in: consumes audio like a real backend but returns the next
+    transcript from `transcripts`, so the command path runs without any
+    engine, model or network. While audio arrives it reports that transcript
+    as partials, one more word per chunk.'''
+
+    def __init__(self, source, transcripts):
+        super().__init__(source)
+        self.transcripts = list(transcripts)
+        self.chunks = 0
+
+    def Reset(self):
+        self.chunks = 0
+
+    def AcceptChunk(self, chunk):
+        self.chunks += 1
+        if self.transcripts:
+            self.EmitPartial(" ".join(self.transcripts[0].split()[:self.chunks]))
+
+    def Finish(self):
+        return self.transcripts.pop(0) if self.transcripts else ""
+
+
+def CreateRecognizer(backend, sr=None, source=None, vosk_model_path=None, phrases=None, transcripts=None):
+    '''Build a recognizer by name: "google", "vosk" or "scripted".'''
+    if source is None:
+        source = MicrophoneSource(sr)
+    if backend == "google":
+        return GoogleRecognizer(source, sr)
+    if backend == "vosk":
+        return VoskRecognizer(source, vosk_model_path, phrases)
+    if backend == "scripted":
+        return ScriptedRecognizer(source, transcripts or [])
+    raise ValueError(f"Unknown recognizer backend: {backend}")
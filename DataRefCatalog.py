@@ -0,0 +1,170 @@
+'''
+Author:         Aryan Shukla
+Module Name:    DataRefs.txt catalog with prefix / trigram search
+Tools Used:     Python 3.13.3
+
+Parses X-Plane's Resources/plugins/DataRefs.txt once and keeps a search index
+in a cache file next to it (rebuilt only when DataRefs.txt changes).
+
+    catalog = DataRefCatalog.Load(datarefs_txt, cache_path)
+    for entry in catalog.Search('n1 percent'):
+        print(entry['name'], entry['type'], entry['units'])
+
+Search terms are matched case-insensitively against dataref names; every
+term must appear. When all terms are shorter than three characters the first
+is looked up as a prefix (of the whole name if it contains '/', otherwise of
+any path segment) in sorted name / segment lists. Longer terms use a trigram
+index: the id lists of the term's trigrams are intersected and the survivors
+are checked for the full substring. Results rank whole-name prefixes first,
+then path-segment prefixes, then shorter names.
+'''
+
+import heapq
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+
+CACHE_VERSION = 1
+
+
+def Trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class DataRefCatalog:
+    def __init__(self, names, types, writable, units, descs, grams=None):
+        self.names = names
+        self.types = types
+        self.writable = writable
+        self.units = units
+        self.descs = descs
+        self.lower = [n.lower() for n in names]
+
+        # Prefix index: ids sorted by lowercase name
+        self.sortedIds = sorted(range(len(names)), key=self.lower.__getitem__)
+        self.sortedNames = [self.lower[i] for i in self.sortedIds]
+        segments = sorted((seg, i) for i, name in enumerate(self.lower) for seg in name.split('/'))
+        self.segmentKeys = [seg for seg, _ in segments]
+        self.segmentIds = [i for _, i in segments]
+
+        if grams is None:
+            postings = {}
+            for i, name in enumerate(self.lower):
+                for g in Trigrams(name):
+                    postings.setdefault(g, array('I')).append(i)
+            grams = postings
+        self.grams = grams
+
+    # ------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------
+    @classmethod
+    def Parse(cls, path):
+        names, types, writable, units, descs = [], [], [], [], []
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                cols = re.split(r'\t+', line.rstrip('\r\n'))
+                if len(cols) < 2 or '/' not in cols[0]:
+                    continue        # version header, blank lines
+                cols += [''] * (5 - len(cols))
+                names.append(cols[0].strip())
+                types.append(cols[1].strip())
+                writable.append(cols[2].strip() == 'y')
+                units.append(cols[3].strip())
+                descs.append(' '.join(c.strip() for c in cols[4:] if c.strip()))
+        return cls(names, types, writable, units, descs)
+
+    @classmethod
+    def Load(cls, path, cachePath=None):
+        '''Catalog for DataRefs.txt at `path`, from `cachePath` when it was
+        built from the same file (size and mtime), otherwise parsed and cached.'''
+        st = os.stat(path)
+        source = (os.path.abspath(path), st.st_size, st.st_mtime)
+        if cachePath and os.path.exists(cachePath):
+            try:
+                with open(cachePath, 'rb') as f:
+                    state = pickle.load(f)
+                if state.get('version') == CACHE_VERSION and state.get('source') == source:
+                    return cls(state['names'], state['types'], state['writable'],
+                               state['units'], state['descs'], state['grams'])
+            except Exception:
+                pass        # unreadable cache: rebuild it
+
+        catalog = cls.Parse(path)
+        if cachePath:
+            state = {
+                'version': CACHE_VERSION, 'source': source,
+                'names': catalog.names, 'types': catalog.types, 'writable': catalog.writable,
+                'units': catalog.units, 'descs': catalog.descs, 'grams': catalog.grams,
+            }
+            tmp = cachePath + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cachePath)
+        return catalog
+
+    # ------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------
+    def __len__(self):
+        return len(self.names)
+
+    def Entry(self, i):
+        return {
+            'name': self.names[i], 'type': self.types[i], 'writable': self.writable[i],
+            'units': self.units[i], 'desc': self.descs[i],
+        }
+
+    def Find(self, name):
+        '''Entry for an exact dataref name, or None.'''
+        key = name.lower()
+        at = bisect_left(self.sortedNames, key)
+        if at < len(self.sortedNames) and self.sortedNames[at] == key:
+            return self.Entry(self.sortedIds[at])
+        return None
+
+    def PrefixIds(self, prefix):
+        keys, ids = (self.sortedNames, self.sortedIds) if '/' in prefix else (self.segmentKeys, self.segmentIds)
+        lo = bisect_left(keys, prefix)
+        hi = bisect_left(keys, prefix + '\uffff')
+        return ids[lo:hi]
+
+    def TermIds(self, term):
+        if len(term) < 3:
+            return None             # too short to narrow down; checked per candidate
+        lists = sorted((self.grams.get(g, ()) for g in Trigrams(term)), key=len)
+        ids = set(lists[0])
+        for other in lists[1:]:
+            if not ids:
+                break
+            ids.intersection_update(other)
+        return {i for i in ids if term in self.lower[i]}
+
+    def Search(self, query, limit=50):
+        terms = query.lower().split()
+        if not terms:
+            return []
+
+        candidates = None
+        for term in terms:
+            ids = self.TermIds(term)
+            if ids is not None:
+                candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            # Only short terms: fall back to a prefix match on the first one
+            candidates = set(self.PrefixIds(terms[0]))
+        candidates = [i for i in candidates if all(t in self.lower[i] for t in terms)]
+
+        def Rank(i):
+            name = self.lower[i]
+            if name.startswith(terms[0]):
+                first = 0
+            elif any(seg.startswith(terms[0]) for seg in name.split('/')):
+                first = 1
+            else:
+                first = 2
+            return first, len(name), name
+
+        return [self.Entry(i) for i in heapq.nsmallest(limit, candidates, key=Rank)]
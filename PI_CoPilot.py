@@ -1,8 +1,15 @@
 import os
-import joblib
+import re
+import time
+import threading
+from collections import OrderedDict, deque
 from XPPython3 import xp  # type: ignore
-import speech_recognition as sr
-from sentence_transformers import SentenceTransformer
+import CoPilotIntents
+import CoPilotSpeech
+
+
+CLAUSE_BREAK = re.compile(r"[,;]|\.(?!\d)|\b(?:AND|THEN)\b")
+
 
 class PythonInterface:
     def __init__(self):
@@ -13,16 +20,55 @@ class PythonInterface:
         self.hotkeyPress = None
         self.hotkeyRelease = None
 
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # speech_recognition, joblib and sentence_transformers (torch) are imported
+        # by LoadModels() on a background thread once the plugin is enabled, so
+        # they do not add to X-Plane's plugin load time.
+        self.sr = None
+        self.recognizer = None
         self.isRecording = False
-        self.audioData = None
 
-        model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml_model", "ai_copilot.pkl")
-        xp.log(f"path - {model_path}")
+        # "vosk" runs offline and decodes while the key is held; "google" needs
+        # network and decodes after release. Vosk falls back to Google if the
+        # package or model is missing.
+        self.RECOGNIZER_BACKEND = "vosk"
+        self.vosk_model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml_model", "vosk-model-small-en-us")
+
+        self.model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml_model", "ai_copilot.pkl")
+        self.centroids_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml_model", "intent_centroids.npz")
+        self.classifier = None
+        self.embedding_model = None
+        self.np = None
+
+        # Optional nearest-centroid fast path. Rows of `centroids` are unit vectors,
+        # so one matrix-vector product gives the cosine similarity to every intent.
+        # Below CENTROID_THRESHOLD the full classifier decides.
+        self.centroids = None
+        self.centroid_intents = None
+        self.CENTROID_THRESHOLD = 0.80
+
+        # Normalized transcript -> intent, least recently used evicted first
+        self.intentCache = OrderedDict()
+        self.INTENT_CACHE_SIZE = 256
 
-        self.classifier = joblib.load(model_path)
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # (intent, value) actions from one utterance run in order, COMMAND_SPACING seconds apart,
+        # from a single flight loop
+        self.commandQueue = deque()
+        self.commandLoopActive = False
+        self.COMMAND_SPACING = 0.5
+
+        # With a streaming recognizer, clauses that are complete in the partial
+        # transcript ("GEAR DOWN AND ...") are queued while the key is still held.
+        # partialClauses holds the normalized clauses already queued this press.
+        self.ACT_ON_PARTIAL = True
+        self.partialClauses = []
+        self.partialSpoken = []
+
+        # "COLD" -> "WARMING" -> "READY" (or "FAILED")
+        self.modelState = "COLD"
+        self.loaderThread = None
+        # True: load in the background as soon as the plugin is enabled.
+        # False: load on the first push-to-talk press (saves memory if unused).
+        self.PRELOAD_MODELS = True
 
         self.intent_to_command = {
             "GEAR_UP": "sim/flight_controls/landing_gear_up",               # verified
@@ -45,7 +91,15 @@ class PythonInterface:
             "ENGINE_2_OFF": "sim/starters/shut_down_2"                      # verified
         }
 
+        # Extra command intents and parameterised dataref intents ("SET HEADING 270")
+        self.intents_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CoPilotIntents.json")
+        self.registry = None
+
     def XPluginStart(self):
+        self.registry = CoPilotIntents.IntentRegistry.Load(self.intent_to_command, self.intents_path)
+        for intent in self.registry.Resolve():
+            target = getattr(intent, "command", None) or intent.dataref
+            xp.log(f"[AI CoPilot] Unresolved intent {intent.name}: {target}")
 
         self.hotkeyPress = xp.registerHotKey(
             xp.VK_Z,
@@ -62,7 +116,9 @@ class PythonInterface:
 
         return self.Name, self.Sig, self.Desc
 
-    def XPluginEnable(self): 
+    def XPluginEnable(self):
+        if self.PRELOAD_MODELS:
+            self.StartLoader()
         return 1
 
     def XPluginReceiveMessage(self, inFromWho, inMessage, inParam):
@@ -71,41 +127,258 @@ class PythonInterface:
     def XPluginStop(self):
         xp.unregisterHotKey(self.hotkeyPress)
         xp.unregisterHotKey(self.hotkeyRelease)
+        if self.recognizer is not None:
+            self.recognizer.Close()
+        if self.commandLoopActive:
+            xp.unregisterFlightLoopCallback(self.CommandFlightLoop, None)
+            self.commandLoopActive = False
 
     def XPluginDisable(self):
         pass
 
+    def StartLoader(self):
+        if self.modelState in ("COLD", "FAILED"):
+            self.modelState = "WARMING"
+            self.loaderThread = threading.Thread(
+                target=self.LoadModels,
+                name="CoPilotLoaderThread",
+                daemon=True
+            )
+            self.loaderThread.start()
+
+    def LoadModels(self):
+        t0 = time.perf_counter()
+        try:
+            import joblib
+            import numpy as np
+            import speech_recognition as sr
+            from sentence_transformers import SentenceTransformer
+            t_import = time.perf_counter()
+
+            xp.log(f"path - {self.model_path}")
+            classifier = joblib.load(self.model_path)
+            embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            if os.path.exists(self.centroids_path):
+                with np.load(self.centroids_path, allow_pickle=False) as npz:
+                    centroids = np.asarray(npz["centroids"], dtype=np.float32)
+                    self.centroid_intents = [str(i) for i in npz["intents"]]
+                centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+                self.centroids = centroids
+            t_load = time.perf_counter()
+
+            # Warm-up inference: the first encode() builds the tokenizer caches and
+            # torch kernels, which would otherwise land on the first real command.
+            classifier.predict(embedding_model.encode(["gear up"]))
+            t_warm = time.perf_counter()
+
+            self.np = np
+            self.sr = sr
+            self.recognizer = self.CreateRecognizer()
+            self.recognizer.onPartial = self.OnPartial
+            self.classifier = classifier
+            self.embedding_model = embedding_model
+            self.modelState = "READY"
+
+            xp.log(
+                f"[AI CoPilot] Ready | imports {t_import - t0:.2f}s | "
+                f"models {t_load - t_import:.2f}s | warm-up {t_warm - t_load:.2f}s"
+            )
+        except Exception as e:
+            self.modelState = "FAILED"
+            xp.log(f"[AI CoPilot] Model loading failed: {e}")
+
+    def CreateRecognizer(self):
+        backend = self.RECOGNIZER_BACKEND
+        if backend == "vosk":
+            try:
+                return CoPilotSpeech.CreateRecognizer("vosk", sr=self.sr, vosk_model_path=self.vosk_model_path)
+            except Exception as e:
+                xp.log(f"[AI CoPilot] Vosk unavailable ({e}), using Google recognizer")
+                backend = "google"
+        return CoPilotSpeech.CreateRecognizer(backend, sr=self.sr)
+
     def OnPressCallback(self, inRefcon):
+        if self.modelState == "COLD":
+            self.StartLoader()
+        if self.modelState != "READY":
+            xp.speakString("CoPilot warming up" if self.modelState == "WARMING" else "CoPilot unavailable")
+            return
+
         if not self.isRecording:
-            xp.speakString("Listening")
+            self.partialClauses = []
+            self.partialSpoken = []
+            try:
+                self.recognizer.Start()
+            except Exception as e:
+                xp.log(f"[AI CoPilot] Could not start recognizer: {e}")
+                xp.speakString("Microphone unavailable")
+                return
             self.isRecording = True
-            self.source = self.microphone.__enter__()
-            self.recognizer.adjust_for_ambient_noise(self.source, duration=0.5)
-            self.audioData = self.recognizer.listen(self.source, timeout=None, phrase_time_limit=None)
+            xp.speakString("Listening")
+            if self.ACT_ON_PARTIAL:
+                # Polls while the key is held so early clauses run right away
+                self.StartCommandLoop()
 
     def OnReleaseCallback(self, inRefcon):
         if self.isRecording:
             xp.speakString("Processing")
             self.isRecording = False
-            self.microphone.__exit__(None, None, None)
 
             try:
-                text = self.recognizer.recognize_google(self.audioData).upper()
-                self.ExecuteCommand(text)
-            except sr.UnknownValueError:
+                text = self.recognizer.Stop().upper()
+                self.ExecuteCommand(text, self.partialClauses, self.partialSpoken)
+            except CoPilotSpeech.NotUnderstoodError:
                 xp.speakString("I could not understand you")
-            except sr.RequestError:
+            except CoPilotSpeech.RecognitionError:
                 xp.speakString("Recognition service failed")
 
-    def ExecuteCommand(self, text: str):
-        embedding = self.embedding_model.encode([text])
-        intent_idx = self.classifier.predict(embedding)[0]
-        
-        command_ref_name = self.intent_to_command.get(intent_idx)
-        if command_ref_name:
-            cmd_ref = xp.findCommand(command_ref_name)
-            xp.commandOnce(cmd_ref)
-            xp.log(f"[AI CoPilot] Recognized: {text} | Executing: {intent_idx}")
-            xp.speakString(f"Executing {intent_idx}")
+    @staticmethod
+    def NormalizeTranscript(text: str) -> str:
+        text = CoPilotIntents.JoinDigitGroups(text.upper())
+        return " ".join(re.sub(r"[^A-Z0-9 ]+", " ", text).split())
+
+    @staticmethod
+    def SegmentUtterance(text: str) -> list:
+        # "GEAR DOWN, FLAPS DOWN AND PARKING BRAKE ON" -> three clauses
+        clauses = CLAUSE_BREAK.split(text.upper())
+        return [c.strip() for c in clauses if c.strip()]
+
+    @staticmethod
+    def CompleteClauses(text: str) -> list:
+        # "GEAR DOWN AND FLAPS" -> ["GEAR DOWN"]: only clauses followed by a break
+        clauses = CLAUSE_BREAK.split(CoPilotIntents.JoinDigitGroups(text.upper()))[:-1]
+        return [c.strip() for c in clauses if c.strip()]
+
+    def OnPartial(self, text: str):
+        '''Recognizer partial result (capture thread): queue the clauses that
+        became complete since the last call. No xp calls here; the command
+        flight loop runs the queue.'''
+        if not self.ACT_ON_PARTIAL or not self.isRecording:
+            return
+        clauses = self.CompleteClauses(text)
+        keys = [self.NormalizeTranscript(c) for c in clauses]
+        done = len(self.partialClauses)
+        if keys[:done] != self.partialClauses or len(keys) == done:
+            # Nothing new, or the engine revised a clause already acted on;
+            # the final transcript settles the rest on release.
+            return
+
+        new = clauses[done:]
+        intents = self.ClassifyIntents(new, match=self.registry.MatchName)
+        for intent, clause in zip(intents, new):
+            action = self.registry.Action(intent, clause)
+            if action is not None:
+                self.commandQueue.append(action)
+            self.partialSpoken.append(action[0].Describe(action[1]) if action is not None else None)
+        self.partialClauses.extend(keys[done:])
+
+    def ClassifyIntent(self, text: str) -> str:
+        return self.ClassifyIntents([text])[0]
+
+    def ClassifyIntents(self, texts: list, match=None) -> list:
+        '''Intent name per text. `match(text)` (optional) is tried on cache
+        misses before anything is embedded; the names it returns are cached
+        like classifier results.'''
+        keys = [self.NormalizeTranscript(t) for t in texts]
+        intents = [None] * len(keys)
+
+        pending = []
+        for i, key in enumerate(keys):
+            intent = self.intentCache.get(key)
+            if intent is None and match is not None:
+                intent = match(texts[i])
+                if intent is not None:
+                    self.intentCache[key] = intent
+            if intent is not None:
+                self.intentCache.move_to_end(key)
+                intents[i] = intent
+            else:
+                pending.append(i)
+
+        if not pending:
+            self.TrimCache()
+            return intents
+
+        # One batched encode() for every clause that missed the cache
+        embeddings = self.embedding_model.encode([keys[i] for i in pending])
+        fallback = list(range(len(pending)))
+
+        if self.centroids is not None:
+            norms = self.np.linalg.norm(embeddings, axis=1, keepdims=True)
+            scores = (embeddings / self.np.maximum(norms, 1e-12)) @ self.centroids.T
+            best = scores.argmax(axis=1)
+            fallback = []
+            for j, i in enumerate(pending):
+                if scores[j, best[j]] >= self.CENTROID_THRESHOLD:
+                    intents[i] = self.centroid_intents[best[j]]
+                else:
+                    fallback.append(j)
+
+        if fallback:
+            predicted = self.classifier.predict(embeddings[fallback])
+            for j, intent in zip(fallback, predicted):
+                intents[pending[j]] = intent
+
+        for i in pending:
+            self.intentCache[keys[i]] = intents[i]
+        self.TrimCache()
+        return intents
+
+    def TrimCache(self):
+        while len(self.intentCache) > self.INTENT_CACHE_SIZE:
+            self.intentCache.popitem(last=False)
+
+    def ExecuteCommand(self, text: str, done=(), doneSpoken=()):
+        '''Run the clauses of `text`. The first len(done) clauses were already
+        queued from partial results (`doneSpoken` holds their descriptions, None
+        if not recognized) and are not run again.'''
+        # "10,000" is one number, not a clause break
+        clauses = self.SegmentUtterance(CoPilotIntents.JoinDigitGroups(text))
+        if done:
+            keys = [self.NormalizeTranscript(c) for c in clauses[:len(done)]]
+            if keys != list(done):
+                xp.log(f"[AI CoPilot] Final transcript revised clauses already executed: {' | '.join(done)}")
+            total = max(len(clauses), len(done))
+            clauses = clauses[len(done):]
         else:
+            total = len(clauses)
+
+        # Cached clauses resolve without any matching; on a miss the registry's
+        # keyword index catches parameterised clauses ("HEADING 270") before the
+        # rest are embedded and classified together in one batch.
+        intents = self.ClassifyIntents(clauses, match=self.registry.MatchName)
+        actions = [self.registry.Action(intent, clause) for intent, clause in zip(intents, clauses)]
+
+        recognized = [action for action in actions if action is not None]
+        spoken = [s for s in doneSpoken if s is not None] + [intent.Describe(value) for intent, value in recognized]
+        if not spoken:
             xp.speakString("Command not recognized")
+            return
+
+        if recognized:
+            self.commandQueue.extend(recognized)
+            self.StartCommandLoop()
+
+        xp.log(f"[AI CoPilot] Recognized: {text} | Executing: {', '.join(spoken)}")
+        summary = spoken[0] if len(spoken) == 1 else ", ".join(spoken[:-1]) + " and " + spoken[-1]
+        if len(spoken) < total:
+            summary += f". {total - len(spoken)} not recognized"
+        xp.speakString(f"Executing {summary}")
+
+    def StartCommandLoop(self):
+        if not self.commandLoopActive:
+            xp.registerFlightLoopCallback(self.CommandFlightLoop, -1, None)
+            self.commandLoopActive = True
+
+    def CommandFlightLoop(self, elapsedSinceLastCall, elapsedTimeSinceLastFlightLoop, loopCounter, refcon):
+        if not self.commandQueue and self.isRecording:
+            # Key still held: keep polling for clauses queued from partials
+            return -1
+        if not self.commandQueue:
+            xp.unregisterFlightLoopCallback(self.CommandFlightLoop, None)
+            self.commandLoopActive = False
+            return 0
+
+        intent, value = self.commandQueue.popleft()
+        intent.Execute(value)
+        return self.COMMAND_SPACING if self.commandQueue else -1
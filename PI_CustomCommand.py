@@ -1,37 +1,167 @@
 '''
 Author:         Aryan Shukla
-Plugin Name:    Heading Target Controller
+Plugin Name:    Autopilot Target Controller
 Tools Used:     Python 3.13.3, XPPython3 4.5.0
 '''
 
+import heapq
 from XPPython3 import xp  # type: ignore
 
 
+# ------------------------------------------------------------
+# DIAL CONFIGURATION
+#   dataref  : the autopilot dial being driven
+#   up/down  : sim commands that animate the knob by one `step`
+#   wrap     : dial wraps around (heading, course)
+#   target   : initial target value
+# ------------------------------------------------------------
+DIALS = {
+    "heading": {
+        "dataref": "sim/cockpit2/autopilot/heading_dial_deg_mag_pilot",
+        "up": "sim/autopilot/heading_up",
+        "down": "sim/autopilot/heading_down",
+        "step": 1.0, "wrap": 360.0, "target": 20.0,
+    },
+    "course": {
+        "dataref": "sim/cockpit2/radios/actuators/nav1_obs_deg_mag_pilot",
+        "up": "sim/radios/obs1_up",
+        "down": "sim/radios/obs1_down",
+        "step": 1.0, "wrap": 360.0, "target": 0.0,
+    },
+    "altitude": {
+        "dataref": "sim/cockpit2/autopilot/altitude_dial_ft",
+        "up": "sim/autopilot/altitude_up",
+        "down": "sim/autopilot/altitude_down",
+        "step": 100.0, "wrap": None, "target": 10000.0,
+    },
+    "speed": {
+        "dataref": "sim/cockpit2/autopilot/airspeed_dial_kts_mach",
+        "up": "sim/autopilot/airspeed_up",
+        "down": "sim/autopilot/airspeed_down",
+        "step": 1.0, "wrap": None, "target": 250.0,
+    },
+    "vertical_speed": {
+        "dataref": "sim/cockpit2/autopilot/vvi_dial_fpm",
+        "up": "sim/autopilot/vertical_speed_up",
+        "down": "sim/autopilot/vertical_speed_down",
+        "step": 100.0, "wrap": None, "target": 0.0,
+    },
+}
+
+
+class Dial:
+    '''One autopilot dial and its in-flight slew. Slews follow a smoothstep
+    profile lasting between MIN and MAX time-to-target depending on distance.'''
+
+    def __init__(self, name, dataref, up, down, step, wrap, target):
+        self.name = name
+        self.datarefName = dataref
+        self.upName = up
+        self.downName = down
+        self.step = step
+        self.wrap = wrap
+        self.target = target
+
+        self.dialDR = None
+        self.upCmd = None
+        self.downCmd = None
+
+        self.start = 0.0
+        self.delta = 0.0            # signed distance start -> target
+        self.totalSteps = 0
+        self.stepsDone = 0
+        self.slewStart = 0.0
+        self.slewDuration = 0.0
+        self.active = False
+        self.seq = 0                # seq of this dial's live schedule entry
+
+    def Resolve(self):
+        self.dialDR = xp.findDataRef(self.datarefName)
+        self.upCmd = xp.findCommand(self.upName)
+        self.downCmd = xp.findCommand(self.downName)
+
+    def Begin(self, now, minTime, maxTime):
+        '''Start (or restart from the current dial value) a slew to self.target.'''
+        current = xp.getDataf(self.dialDR)
+        if self.wrap:
+            current %= self.wrap
+            self.target %= self.wrap
+            # Shortest way round
+            self.delta = (self.target - current + self.wrap / 2) % self.wrap - self.wrap / 2
+        else:
+            self.delta = self.target - current
+
+        self.start = current
+        self.totalSteps = int(round(abs(self.delta) / self.step))
+        self.stepsDone = 0
+        self.slewStart = now
+
+        # Half a revolution (or 180 steps) takes maxTime, a single step minTime
+        span = self.wrap / 2 if self.wrap else 180 * self.step
+        frac = min(abs(self.delta) / span, 1.0)
+        self.slewDuration = minTime + frac * (maxTime - minTime)
+        self.active = abs(self.delta) > 1e-6
+        return self.active
+
+    @staticmethod
+    def Ease(p):
+        # Smoothstep: accelerate out of the start, decelerate into the target
+        p = min(max(p, 0.0), 1.0)
+        return p * p * (3.0 - 2.0 * p)
+
+    def Update(self, now, mode):
+        '''Advance the slew to `now`. Returns False once the target is reached.'''
+        progress = self.Ease((now - self.slewStart) / self.slewDuration)
+
+        if mode == "dataref":
+            value = self.start + self.delta * progress
+            xp.setDataf(self.dialDR, value % self.wrap if self.wrap else value)
+        else:
+            # Catch up to where the profile says the knob should be; several
+            # steps may be issued in one frame.
+            due = int(round(self.totalSteps * progress))
+            cmd = self.upCmd if self.delta > 0 else self.downCmd
+            while self.stepsDone < due:
+                xp.commandOnce(cmd)
+                self.stepsDone += 1
+
+        if progress >= 1.0:
+            if mode == "dataref":
+                xp.setDataf(self.dialDR, self.target)
+            self.active = False
+        return self.active
+
+
 class PythonInterface:
     def __init__(self):
-        self.Name = "Heading Target Controller"
+        self.Name = "Autopilot Target Controller"
         self.Sig = "aryanshukla.plugin.headingtarget"
-        self.Desc = "Smoothly Rotate Heading Knob To Fixed Target Heading"
+        self.Desc = "Smoothly Rotate Autopilot Knobs To Target Values"
 
         # ------------------------------------------------------------
         # CONFIGURATION
         # ------------------------------------------------------------
-        self.TARGET_HEADING = 20.0      # <<< CHANGE TARGET HERE (0–359)
-        self.STEP_INTERVAL = 0.1        # seconds per degree (animation speed)
+        self.MAX_TIME_TO_TARGET = 2.0   # seconds for a half turn / 180 steps
+        self.MIN_TIME_TO_TARGET = 0.3   # seconds for a single step
+        self.UPDATE_INTERVAL = 1 / 30   # seconds between updates of one dial
+        self.SLEW_MODE = "command"      # "command" = up/down steps, "dataref" = write dial directly
+
+        self.dials = {name: Dial(name, **cfg) for name, cfg in DIALS.items()}
 
         # ------------------------------------------------------------
         # X-Plane handles
         # ------------------------------------------------------------
-        self.hdgDialDR = None
-        self.hdgUpCmd = None
-        self.hdgDownCmd = None
-        self.mainCmd = None
+        self.goCmds = {}                # command ref -> dial
+        self.nudgeCmds = {}             # command ref -> (dial, +1 / -1)
+        self.targetDRs = []
 
         # ------------------------------------------------------------
-        # Motion state
+        # Scheduler: heap of (next due time, seq, dial name) shared by every
+        # active slew, serviced by one flight loop. Only the entry whose seq
+        # matches dial.seq is live; superseded entries are skipped when popped.
         # ------------------------------------------------------------
-        self.stepsRemaining = 0
-        self.direction = 0              # +1 = up, -1 = down
+        self.schedule = []
+        self.seq = 0
         self.flightLoopActive = False
 
     # ============================================================
@@ -39,95 +169,119 @@ class PythonInterface:
     # ============================================================
     def XPluginStart(self):
 
-        xp.log(">>> Heading Target Plugin: XPluginStart <<<")
-
-        # Find heading selector DataRef
-        self.hdgDialDR = xp.findDataRef(
-            "sim/cockpit2/autopilot/heading_dial_deg_mag_pilot"
-        )
+        xp.log(">>> Autopilot Target Plugin: XPluginStart <<<")
 
-        # Find sim commands that drive the knob animation
-        self.hdgUpCmd = xp.findCommand("sim/autopilot/heading_up")
-        self.hdgDownCmd = xp.findCommand("sim/autopilot/heading_down")
+        for name, dial in self.dials.items():
+            dial.Resolve()
 
-        # Create custom command
-        self.mainCmd = xp.createCommand(
-            "vimaan/autopilot/heading_go_to_target",
-            "Rotate Heading Knob To Target Heading"
-        )
-
-        xp.registerCommandHandler(
-            self.mainCmd,
-            self.commandHandler,
-            0,
-            None
-        )
-
-        xp.log(">>> Heading Target Plugin READY <<<")
+            # "go to target" keeps the original vimaan/autopilot/heading_go_to_target
+            goCmd = xp.createCommand(
+                f"vimaan/autopilot/{name}_go_to_target",
+                f"Rotate {name.replace('_', ' ')} knob to target"
+            )
+            upCmd = xp.createCommand(
+                f"vimaan/autopilot/{name}_target_up",
+                f"Raise {name.replace('_', ' ')} target by one step and go"
+            )
+            downCmd = xp.createCommand(
+                f"vimaan/autopilot/{name}_target_down",
+                f"Lower {name.replace('_', ' ')} target by one step and go"
+            )
+            self.goCmds[goCmd] = dial
+            self.nudgeCmds[upCmd] = (dial, +1)
+            self.nudgeCmds[downCmd] = (dial, -1)
+            for cmd in (goCmd, upCmd, downCmd):
+                xp.registerCommandHandler(cmd, self.commandHandler, 0, None)
+
+            # Writing vimaan/autopilot/<dial>_target slews to the new value
+            self.targetDRs.append(xp.registerDataAccessor(
+                f"vimaan/autopilot/{name}_target",
+                dataType=xp.Type_Float,
+                writable=1,
+                readFloat=self.readTarget,
+                writeFloat=self.writeTarget,
+                readRefCon=name,
+                writeRefCon=name
+            ))
+
+        xp.log(">>> Autopilot Target Plugin READY <<<")
         return self.Name, self.Sig, self.Desc
 
     # ============================================================
-    # Command handler
+    # Command handler / target datarefs
     # ============================================================
     def commandHandler(self, cmdRef, phase, refcon):
 
         if phase != xp.CommandBegin:
             return 1
 
-        # If animation already running, ignore new command
-        if self.flightLoopActive:
-            xp.log(">>> Rotation already in progress <<<")
-            return 1
+        if cmdRef in self.goCmds:
+            self.slewTo(self.goCmds[cmdRef], self.goCmds[cmdRef].target)
+        elif cmdRef in self.nudgeCmds:
+            dial, sign = self.nudgeCmds[cmdRef]
+            self.slewTo(dial, dial.target + sign * dial.step)
+        return 1
 
-        current = xp.getDataf(self.hdgDialDR) % 360.0
-        target = self.TARGET_HEADING % 360.0
+    def readTarget(self, refcon):
+        return self.dials[refcon].target
 
-        # Compute shortest path
-        cw = (target - current) % 360.0
-        ccw = (current - target) % 360.0
+    def writeTarget(self, refcon, value):
+        self.slewTo(self.dials[refcon], value)
 
-        if cw <= ccw:
-            self.direction = +1
-            self.stepsRemaining = int(round(cw))
-        else:
-            self.direction = -1
-            self.stepsRemaining = int(round(ccw))
+    # ============================================================
+    # Scheduler
+    # ============================================================
+    def slewTo(self, dial, target):
+        # A new target retargets an in-flight slew from wherever the knob is now
+        wasActive = dial.active
+        dial.target = target
+        now = xp.getElapsedTime()
+
+        if not dial.Begin(now, self.MIN_TIME_TO_TARGET, self.MAX_TIME_TO_TARGET):
+            return
 
         xp.log(
-            f">>> Rotate HDG {current:.1f} → {target:.1f} | "
-            f"Steps={self.stepsRemaining} | "
-            f"Dir={'UP' if self.direction > 0 else 'DOWN'}"
+            f">>> {'Retarget' if wasActive else 'Rotate'} {dial.name} "
+            f"{dial.start:.1f} → {dial.target:.1f} | "
+            f"Steps={dial.totalSteps} | Time={dial.slewDuration:.2f}s"
         )
 
-        if self.stepsRemaining > 0:
-            xp.registerFlightLoopCallback(
-                self.flightLoop,
-                self.STEP_INTERVAL,
-                None
-            )
-            self.flightLoopActive = True
+        # Service the new slew now; any entry already queued for this dial goes stale
+        self.seq += 1
+        dial.seq = self.seq
+        heapq.heappush(self.schedule, (now, self.seq, dial.name))
 
-        return 1
+        if not self.flightLoopActive:
+            xp.registerFlightLoopCallback(self.flightLoop, -1, None)
+            self.flightLoopActive = True
 
     # ============================================================
-    # Flight loop callback (smooth animation)
+    # Flight loop callback (services every active slew)
     # ============================================================
     def flightLoop(self, elapsedMe, elapsedSim, counter, refcon):
 
-        if self.stepsRemaining <= 0:
-            xp.log(">>> Heading rotation complete <<<")
-
+        now = xp.getElapsedTime()
+
+        while self.schedule and self.schedule[0][0] <= now:
+            _, seq, name = heapq.heappop(self.schedule)
+            dial = self.dials[name]
+            if seq != dial.seq or not dial.active:
+                continue
+            if dial.Update(now, self.SLEW_MODE):
+                self.seq += 1
+                dial.seq = self.seq
+                heapq.heappush(self.schedule, (now + self.UPDATE_INTERVAL, self.seq, name))
+            else:
+                xp.log(f">>> {name} rotation complete <<<")
+
+        if not self.schedule:
             xp.unregisterFlightLoopCallback(self.flightLoop, None)
             self.flightLoopActive = False
             return 0
 
-        if self.direction > 0:
-            xp.commandOnce(self.hdgUpCmd)
-        else:
-            xp.commandOnce(self.hdgDownCmd)
-
-        self.stepsRemaining -= 1
-        return self.STEP_INTERVAL
+        # Sleep until the earliest dial is due, or run again next frame
+        wait = self.schedule[0][0] - now
+        return wait if wait > 0 else -1
 
     # ============================================================
     # Required callbacks
@@ -145,6 +299,12 @@ class PythonInterface:
     def XPluginStop(self):
         xp.log(">>> Plugin Stopping <<<")
 
+        for cmd in list(self.goCmds) + list(self.nudgeCmds):
+            xp.unregisterCommandHandler(cmd, self.commandHandler, 0, None)
+        for ref in self.targetDRs:
+            xp.unregisterDataAccessor(ref)
+
         if self.flightLoopActive:
             xp.unregisterFlightLoopCallback(self.flightLoop, None)
             self.flightLoopActive = False
+        self.schedule.clear()
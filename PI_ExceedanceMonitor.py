@@ -0,0 +1,309 @@
+'''
+Author:         Aryan Shukla
+Plugin Name:    Exceedance Monitor
+Tools Used:     Python 3.13.3, XPPython3 4.5.0
+
+Live exceedance alerts during the session (the in-sim counterpart of the
+post-flight checks on GenFDR files). Rules come from ExceedanceRules.json and
+are compiled once when monitoring starts:
+
+    {"name": "SINK RATE", "signal": "vspd", "stat": "mean", "window": 5.0,
+     "op": "<", "limit": -2000,
+     "when": [{"signal": "radio_alt", "op": "<", "limit": 2500}]}
+
+stat is "value", "mean", "max" or "min" over `window` seconds; limit is a
+number or the name of another signal. Signals are sampled every
+sample_period seconds. Each (signal, stat, window) keeps one rolling window,
+shared by every rule that uses it, and updates in O(1) per sample whatever
+its length.
+'''
+
+import os
+import json
+import math
+from collections import deque
+from XPPython3 import xp  # type: ignore
+
+
+class RollingMean:
+    '''Ring buffer with a running sum. The sum is compensated (Neumaier), so
+    adding and removing samples for hours does not let rounding error build
+    up. Non-finite samples are counted rather than summed; while one is in
+    the window the mean is NaN.'''
+
+    def __init__(self, size):
+        self.buf = [0.0] * size
+        self.size = size
+        self.count = 0
+        self.idx = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.nonfinite = 0
+
+    def add(self, v):
+        if not math.isfinite(v):
+            self.nonfinite += 1
+            return
+        t = self.total + v
+        if abs(self.total) >= abs(v):
+            self.compensation += (self.total - t) + v
+        else:
+            self.compensation += (v - t) + self.total
+        self.total = t
+
+    def push(self, v):
+        if self.count == self.size:
+            old = self.buf[self.idx]
+            if math.isfinite(old):
+                self.add(-old)
+            else:
+                self.nonfinite -= 1
+        else:
+            self.count += 1
+        self.buf[self.idx] = v
+        self.add(v)
+        self.idx += 1
+        if self.idx == self.size:
+            self.idx = 0
+
+    def value(self):
+        if not self.count or self.nonfinite:
+            return float('nan')
+        return (self.total + self.compensation) / self.count
+
+
+class RollingExtreme:
+    '''Monotonic deque of (sample number, value): amortized O(1) rolling max
+    (or min with sign=-1).'''
+
+    def __init__(self, size, sign=1.0):
+        self.size = size
+        self.sign = sign
+        self.dq = deque()
+        self.n = 0
+
+    def push(self, v):
+        key = self.sign * v
+        dq = self.dq
+        while dq and dq[-1][1] <= key:
+            dq.pop()
+        dq.append((self.n, key))
+        if dq[0][0] <= self.n - self.size:
+            dq.popleft()
+        self.n += 1
+
+    def value(self):
+        return self.sign * self.dq[0][1] if self.dq else float('nan')
+
+
+class Latest:
+    def __init__(self):
+        self.v = float('nan')
+
+    def push(self, v):
+        self.v = v
+
+    def value(self):
+        return self.v
+
+
+OPS = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+}
+
+
+class Rule:
+    def __init__(self, name, stat, op, limit, conditions, message, cooldown):
+        self.name = name
+        self.stat = stat            # bound .value of a shared window
+        self.op = OPS[op]
+        self.limit = limit          # callable returning the limit
+        self.conditions = conditions
+        self.message = message
+        self.cooldown = cooldown
+        self.active = False
+        self.lastSpoken = -1e9
+
+    def check(self):
+        if not all(cond() for cond in self.conditions):
+            return False
+        return self.op(self.stat(), self.limit())
+
+
+class PythonInterface:
+    def __init__(self):
+        self.Name = "Exceedance Monitor"
+        self.Sig = "aryanshukla.plugin005.exceedancemonitor"
+        self.Desc = "Speaks And Displays Live Flight Exceedance Alerts"
+
+        self.rules_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ExceedanceRules.json")
+
+        self.isMonitoring = False
+        self.sample_period = 0.1
+        self.signals = []           # (dataref pointer, abs?, [windows fed by it])
+        self.windows = {}           # (signal, stat, samples) -> window
+        self.rules = []
+        self.activeAlerts = []
+
+        self.HUD_X = 10
+        self.LINE_HEIGHT = 20
+
+    # ============================================================
+    # Rule compilation
+    # ============================================================
+    def CompileRules(self, config):
+        self.sample_period = float(config.get("sample_period", 0.1))
+        signals = config["signals"]
+        self.windows = {}
+        feeds = {name: [] for name in signals}
+
+        def window(signal, stat="value", seconds=0.0):
+            if signal not in signals:
+                raise ValueError(f"Unknown signal '{signal}'")
+            size = max(1, int(round(seconds / self.sample_period)))
+            key = (signal, stat, size if stat != "value" else 0)
+            if key not in self.windows:
+                if stat == "value":
+                    w = Latest()
+                elif stat == "mean":
+                    w = RollingMean(size)
+                elif stat == "max":
+                    w = RollingExtreme(size, 1.0)
+                elif stat == "min":
+                    w = RollingExtreme(size, -1.0)
+                else:
+                    raise ValueError(f"Unknown stat '{stat}'")
+                self.windows[key] = w
+                feeds[signal].append(w)
+            return self.windows[key].value
+
+        def limit(value):
+            if isinstance(value, str):
+                return window(value)
+            return lambda v=float(value): v
+
+        def condition(spec):
+            stat = window(spec["signal"], spec.get("stat", "value"), spec.get("window", 0.0))
+            op, lim = OPS[spec["op"]], limit(spec["limit"])
+            return lambda: op(stat(), lim())
+
+        self.rules = [
+            Rule(
+                name=spec["name"],
+                stat=window(spec["signal"], spec.get("stat", "value"), spec.get("window", 0.0)),
+                op=spec["op"],
+                limit=limit(spec["limit"]),
+                conditions=[condition(c) for c in spec.get("when", [])],
+                message=spec.get("message", spec["name"]),
+                cooldown=float(spec.get("cooldown", 10.0)),
+            )
+            for spec in config["rules"]
+        ]
+
+        # Signals nothing reads are not sampled
+        self.signals = [
+            (xp.findDataRef(spec["dataref"]), bool(spec.get("abs", False)), feeds[name])
+            for name, spec in signals.items() if feeds[name]
+        ]
+
+    # ============================================================
+    # Start / stop
+    # ============================================================
+    def StartMonitoring(self):
+        try:
+            with open(self.rules_path) as f:
+                self.CompileRules(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            xp.log(f"Exceedance Monitor --> Bad rules file: {e}")
+            return
+
+        xp.log(f"Exceedance Monitor --> Started ({len(self.rules)} rules, {len(self.windows)} windows).")
+        self.isMonitoring = True
+        self.activeAlerts = []
+        xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: OFF")
+        xp.registerFlightLoopCallback(self.FlightLoopCallback, self.sample_period, 0)
+        xp.registerDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
+
+    def StopMonitoring(self):
+        xp.unregisterFlightLoopCallback(self.FlightLoopCallback, 0)
+        xp.unregisterDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
+        self.isMonitoring = False
+        self.activeAlerts = []
+        xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: ON")
+        xp.log("Exceedance Monitor --> Stopped.")
+
+    def ToggleMonitoring(self, menuRefCon, itemRefCon):
+        if self.isMonitoring:
+            self.StopMonitoring()
+        else:
+            self.StartMonitoring()
+
+    # ============================================================
+    # Sampling and rule evaluation
+    # ============================================================
+    def Sample(self, now):
+        for ref, absolute, windows in self.signals:
+            v = xp.getDataf(ref)
+            if absolute:
+                v = abs(v)
+            for w in windows:
+                w.push(v)
+
+        alerts = []
+        for rule in self.rules:
+            firing = rule.check()
+            if firing:
+                alerts.append(rule.name)
+                if not rule.active and now - rule.lastSpoken >= rule.cooldown:
+                    xp.speakString(rule.message)
+                    rule.lastSpoken = now
+            rule.active = firing
+        self.activeAlerts = alerts
+
+    def FlightLoopCallback(self, elapsedSinceLastCall, elapsedTimeSinceLastFlightLoop, loopCounter, refcon):
+        self.Sample(xp.getElapsedTime())
+        return self.sample_period
+
+    def DrawCallback(self, inPhase, inAfter, inRefCon):
+        if not self.activeAlerts:
+            return 1
+        screen_width, screen_height = xp.getScreenSize()
+        y = screen_height // 2
+        for name in self.activeAlerts:
+            xp.drawString(
+                rgb=(1.0, 0.0, 0.0),
+                x=self.HUD_X,
+                y=y,
+                value=name,
+                fontID=xp.Font_Proportional
+            )
+            y -= self.LINE_HEIGHT
+        return 1
+
+    # ============================================================
+    # Required callbacks
+    # ============================================================
+    def XPluginStart(self):
+        self.menuId = xp.createMenu("Exceedance Monitor", None, 0, self.ToggleMonitoring, 0)
+        self.menuIndex = xp.appendMenuItem(self.menuId, "Toggle: ON", 1, 1)
+
+        return self.Name, self.Sig, self.Desc
+
+    def XPluginEnable(self):
+        return 1
+
+    def XPluginReceiveMessage(self, inFromWho, inMessage, inParam):
+        pass
+
+    def XPluginDisable(self):
+        if self.isMonitoring:
+            self.StopMonitoring()
+        if hasattr(self, 'menuId') and self.menuId is not None:
+            xp.destroyMenu(self.menuId)
+            self.menuId = None
+
+    def XPluginStop(self):
+        pass
@@ -4,222 +4,17 @@ Plugin Name:    Plot Timeseries Data Live (ParaViz)
 Tools Used:     Python 3.13.3, XPPython3 4.5.0
 """
 
+import os
+import re
 import time
 import threading
-from queue import Queue, Empty
-from collections import deque
+from queue import Queue
 from XPPython3 import xp  # type: ignore
-from PyQt5 import QtWidgets, QtCore
-import pyqtgraph as pg
-
-
-class PlotterWindow(QtWidgets.QWidget):
-    def __init__(self, dataQ, paraNames, notifyStop):
-        super().__init__()
-
-        self.dataQ = dataQ
-        self.paraNames = paraNames
-        self.notifyStop = notifyStop
-
-        self.isRunning = True
-        self.isPaused = False
-        self.isClosing = False
-
-        self.maxlen = 14400
-        self.data = {param: deque(maxlen=self.maxlen) for param in self.paraNames}
-        self.time = deque(maxlen=self.maxlen)
-
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #0f1116;
-                color: #e0e0e0;
-                font-family: "Segoe UI", "Roboto", sans-serif;
-                font-size: 12pt;
-            }
-            QCheckBox {
-                spacing: 8px;
-                font-weight: 600;
-            }
-            QPushButton {
-                background-color: #2d89ef;
-                border-radius: 10px;
-                padding: 8px 14px;
-                font-size: 12pt; font-weight: 600; color: white;
-            }
-            QPushButton:hover {
-                background-color: #1b5fbf;
-            }
-        """)
-
-        main_layout = QtWidgets.QHBoxLayout(self)
-
-        self.plot_widget = pg.PlotWidget(background="#0f1116")
-        pi = self.plot_widget.getPlotItem()
-        self.plot_widget.showGrid(x=True, y=True, alpha=0.25)
-        pi.getAxis("bottom").setTextPen("#CCCCCC")
-        pi.getAxis("left").setTextPen("#CCCCCC")
-        pi.showAxis("right", False)
-
-        main_layout.addWidget(self.plot_widget, 4)
-
-        self.base_curve = self.plot_widget.plot([], [], pen=pg.mkPen((0, 0, 0, 0)))
-        self.curves = {}
-        self.viewboxes = {}
-        self.axes = {}
-
-        colors = ["#4DB6AC", "#F08913", "#DDC8E0", "#FFD54F", "#90A4AE", "#2B16E9"]
-
-        side_panel = QtWidgets.QFrame()
-        side_panel.setStyleSheet("QFrame { background-color: #181b22; border-radius: 12px; }")
-        side_layout = QtWidgets.QVBoxLayout(side_panel)
-        side_layout.setContentsMargins(15, 15, 15, 15)
-
-        title = QtWidgets.QLabel("<--- PARAMETERS --->")
-        title.setStyleSheet("font-size: 12pt; font-weight: bold; color: #ffffff;")
-        side_layout.addWidget(title)
-
-        self.checkboxes = {}
-
-        for i, param in enumerate(self.paraNames):
-            color = colors[i % len(colors)]
-
-            vb = pg.ViewBox()
-            axis = pg.AxisItem(orientation="right")
-            axis.setPen(color)
-            axis.setTextPen(color)
-            axis.setLabel(text=param, color=color)
-
-            pi.layout.addItem(axis, 2, 3 + i)
-            pi.scene().addItem(vb)
-            axis.linkToView(vb)
-            vb.setXLink(pi.vb)
-
-            curve = pg.PlotCurveItem(pen=pg.mkPen(color, width=2))
-            vb.addItem(curve)
-
-            self.curves[param] = curve
-            self.viewboxes[param] = vb
-            self.axes[param] = axis
-
-            axis.setVisible(False)
-            curve.setVisible(False)
-
-            cb = QtWidgets.QCheckBox(param)
-            cb.setStyleSheet(f"QCheckBox {{ color: {color}; font-weight: bold; }}")
-            cb.stateChanged.connect(self.UpdateSelected)
-            side_layout.addWidget(cb)
-            self.checkboxes[param] = cb
-
-        side_layout.addStretch()
-
-        btn_row = QtWidgets.QGridLayout()
-        self.pause_btn = QtWidgets.QPushButton("Pause")
-        self.reset_btn = QtWidgets.QPushButton("Reset")
-        btn_row.addWidget(self.pause_btn, 0, 0, 1, 2)
-        btn_row.addWidget(self.reset_btn, 1, 0, 1, 2)
-        side_layout.addLayout(btn_row)
-        self.pause_btn.clicked.connect(self.TogglePauseResume)
-        self.reset_btn.clicked.connect(self.ResetPlotting)
-
-        main_layout.addWidget(side_panel, 1)
-
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.UpdatePlot)
-        self.t0 = time.time()
-        self.timer.start(200)
-
-        pi.vb.sigResized.connect(self.UpdateViews)
-        self.UpdateViews()
-
-        first_param = self.paraNames[0]
-        self.checkboxes[first_param].setChecked(True)
-        self.UpdateSelected()
-
-    def closeEvent(self, event):
-        self.isClosing = True
-        if self.timer.isActive():
-            self.timer.stop()
-        try:
-            self.notifyStop()
-        finally:
-            super().closeEvent(event)
-
-    def UpdateViews(self):
-        pi = self.plot_widget.getPlotItem()
-        vb_main = pi.vb
-        rect = vb_main.sceneBoundingRect()
-        for vb in self.viewboxes.values():
-            vb.setGeometry(rect)
-            vb.linkedViewChanged(vb_main, vb.XAxis)
-
-    def UpdateSelected(self):
-        for p, cb in self.checkboxes.items():
-            vis = cb.isChecked()
-            self.curves[p].setVisible(vis)
-            self.axes[p].setVisible(vis)
-        self.UpdateViews()
-
-    def TogglePauseResume(self):
-        if not self.isRunning:
-            return
-        if not self.isPaused:
-            self.isPaused = True
-            self.timer.stop()
-            self.pause_btn.setText("Resume")
-        else:
-            self.isPaused = False
-            self.timer.start(200)
-            self.pause_btn.setText("Pause")
-
-    def ResetPlotting(self):
-        self.isRunning = True
-        self.isPaused = False
-        if self.timer.isActive():
-            self.timer.stop()
-        self.time.clear()
-        for p in self.paraNames:
-            self.data[p].clear()
-            self.curves[p].setData([], [])
-        self.base_curve.setData([], [])
-        self.pause_btn.setText("Pause")
-
-        self.t0 = time.time()
-        for cb in self.checkboxes.values():
-            cb.setChecked(False)
-        first_param = self.paraNames[0]
-        self.checkboxes[first_param].setChecked(True)
-        self.UpdateSelected()
-        self.timer.start(200)
-
-    def UpdatePlot(self):
-        if not self.isRunning or self.isPaused or self.isClosing:
-            return
-
-        latest = None
-        try:
-            while True:
-                latest = self.dataQ.get_nowait()
-        except Empty:
-            pass
-
-        if latest is None:
-            return
-
-        timestamp, values = latest
-        self.time.append(timestamp - self.t0)
-        for p, v in values.items():
-            self.data[p].append(v)
 
-        if len(self.time) > 0:
-            th = list(self.time)
-            self.base_curve.setData(th, [0] * len(th))
-
-            for p, cb in self.checkboxes.items():
-                if cb.isChecked() and len(self.data[p]) > 0:
-                    self.curves[p].setData(th, list(self.data[p]))
-                    self.viewboxes[p].enableAutoRange(axis=self.viewboxes[p].YAxis, enable=True)
-
-        self.UpdateViews()
+# PyQt5 / pyqtgraph (via ParaVizWindow) are imported on first use in LaunchUI(),
+# or in the background after XPluginEnable() when PRELOAD_UI is set. The
+# DataRefs.txt catalog is loaded by LaunchUI() (LoadCatalog()) on the Qt
+# thread, off the sim thread; the preloader does not touch it.
 
 
 class PythonInterface:
@@ -237,6 +32,13 @@ class PythonInterface:
         }
         self.datarefs_pointer = {}
 
+        # Parameters added / removed from the window at runtime. The Qt thread
+        # only queues requests; findDataRef() runs in the flight loop.
+        self.requestQ = Queue()
+        self.arrayBuffer = [0.0]
+        self.catalog_path = None
+        self.catalog_cache = os.path.join(os.path.dirname(os.path.abspath(__file__)), "DataRefs.cache")
+
         self.isPlotting = False
         self.qtThread = None
         self.qtApp = None
@@ -244,18 +46,44 @@ class PythonInterface:
         self.window = None
         self.stopRequested = threading.Event()
 
+        # Plot history is journaled here so it survives an X-Plane crash
+        self.journal_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paraviz.journal")
+
+        # "overlay" (one plot, an axis per parameter) or "stacked" (one pane per
+        # group, shared time axis); switchable from the window as well
+        self.LAYOUT = "overlay"
+        self.GROUPS = {'PTCH': 'ATTITUDE', 'ROLL': 'ATTITUDE'}
+
+        self.PRELOAD_UI = False         # import the Qt stack in the background once enabled
+        self.preloadThread = None
+
     def XPluginStart(self):
         self.paravizMenuId = xp.createMenu("ParaViz", None, 0, self.MenuHandler, None)
         self.toggleMenuItemId = xp.appendMenuItem(self.paravizMenuId, "Toggle: ON", 'toggle')
 
-        self.datarefs_pointer = {param: xp.findDataRef(dataref) for param, dataref in self.parameters.items()}
+        self.datarefs_pointer = {param: self.ResolveDataRef(dataref) for param, dataref in self.parameters.items()}
+        self.catalog_path = os.path.join(xp.getSystemPath(), "Resources", "plugins", "DataRefs.txt")
 
         return self.Name, self.Sig, self.Desc
 
-    def XPluginEnable(self): return 1
+    def XPluginEnable(self):
+        if self.PRELOAD_UI and self.preloadThread is None:
+            self.preloadThread = threading.Thread(
+                target=self.PreloadUI,
+                name="ParaVizPreloadThread",
+                daemon=True
+            )
+            self.preloadThread.start()
+        return 1
+
     def XPluginReceiveMessage(self, inFromWho, inMessage, inParam): pass
     def XPluginDisable(self): pass
-    def XPluginStop(self): pass
+
+    def XPluginStop(self):
+        # Closing the window checkpoints the journal with active=False, so a
+        # clean shutdown is not restored as an interrupted session next time
+        if self.isPlotting or self.window is not None:
+            self.StopPlotting()
 
     def MenuHandler(self, menuRef, itemRef):
         self.isPlotting = not self.isPlotting
@@ -276,12 +104,42 @@ class PythonInterface:
         xp.registerFlightLoopCallback(self.FlightLoopCallback, 1, None)
         xp.registerDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
 
+    def PreloadUI(self):
+        t0 = time.perf_counter()
+        try:
+            import ParaVizWindow  # noqa: F401
+            xp.log(f"[ParaViz] Qt preloaded in {time.perf_counter() - t0:.2f}s")
+        except Exception as e:
+            xp.log(f"[ParaViz] Qt preload failed: {e}")
+
+    def LoadCatalog(self):
+        from DataRefCatalog import DataRefCatalog
+
+        if not self.catalog_path or not os.path.exists(self.catalog_path):
+            return None
+        try:
+            return DataRefCatalog.Load(self.catalog_path, self.catalog_cache)
+        except Exception as e:
+            xp.log(f"[ParaViz] DataRefs.txt catalog unavailable: {e}")
+            return None
+
     def LaunchUI(self):
+        from PyQt5 import QtWidgets
+        from ParaVizWindow import PlotterWindow
+        from SessionJournal import SessionJournal
+
+        journal = SessionJournal(self.journal_path)
         self.qtApp = QtWidgets.QApplication([])
         self.window = PlotterWindow(
             self.dataQ,
             list(self.parameters.keys()),
-            notifyStop=self.RequestStop
+            notifyStop=self.RequestStop,
+            journal=journal,
+            catalog=self.LoadCatalog(),
+            notifyAdd=self.SubscribeParameter,
+            notifyRemove=self.UnsubscribeParameter,
+            layout=self.LAYOUT,
+            groups=self.GROUPS
         )
         self.window.setWindowTitle("ParaViz")
         self.window.show()
@@ -292,10 +150,56 @@ class PythonInterface:
         finally:
             self.window = None
             self.qtApp = None
+            journal.close()
 
     def RequestStop(self):
         self.stopRequested.set()
 
+    # ============================================================
+    # Runtime parameters
+    # ============================================================
+    def SubscribeParameter(self, label, dataref):
+        self.requestQ.put(('add', label, dataref))
+
+    def UnsubscribeParameter(self, label):
+        self.requestQ.put(('remove', label, None))
+
+    def ApplyRequests(self):
+        while not self.requestQ.empty():
+            action, label, dataref = self.requestQ.get_nowait()
+            if action == 'add':
+                entry = self.ResolveDataRef(dataref)
+                if entry is not None:
+                    self.datarefs_pointer[label] = entry
+                    self.parameters[label] = dataref
+            else:
+                self.datarefs_pointer.pop(label, None)
+                self.parameters.pop(label, None)
+
+    def ResolveDataRef(self, dataref):
+        # "name" or "name[index]" for one element of an array dataref
+        m = re.match(r'^(.*?)(?:\[(\d+)\])?$', dataref.strip())
+        ref = xp.findDataRef(m.group(1))
+        if ref is None:
+            xp.log(f"[ParaViz] dataref not found: {dataref}")
+            return None
+        index = int(m.group(2)) if m.group(2) is not None else None
+        return ref, xp.getDataRefTypes(ref), index
+
+    def ReadDataRef(self, entry):
+        ref, types, index = entry
+        if index is not None:
+            if types & xp.Type_IntArray:
+                xp.getDatavi(ref, self.arrayBuffer, index, 1)
+            else:
+                xp.getDatavf(ref, self.arrayBuffer, index, 1)
+            return float(self.arrayBuffer[0])
+        if types & xp.Type_Double:
+            return xp.getDatad(ref)
+        if types & xp.Type_Int and not types & xp.Type_Float:
+            return float(xp.getDatai(ref))
+        return xp.getDataf(ref)
+
     def StopPlotting(self):
         self.stopRequested.clear()
 
@@ -310,6 +214,7 @@ class PythonInterface:
 
         if self.window is not None:
             try:
+                from PyQt5 import QtCore
                 QtCore.QMetaObject.invokeMethod(
                     self.window, "close", QtCore.Qt.QueuedConnection
                 )
@@ -335,7 +240,8 @@ class PythonInterface:
             self.StopPlotting()
             return 0
 
-        values = {p: xp.getDataf(dref) for p, dref in self.datarefs_pointer.items()}
+        self.ApplyRequests()
+        values = {p: self.ReadDataRef(entry) for p, entry in self.datarefs_pointer.items() if entry is not None}
         self.dataQ.put((time.time(), values))
         return 1
 
@@ -0,0 +1,98 @@
+'''
+Author:         Aryan Shukla
+Plugin Name:    Telemetry Publisher
+Tools Used:     Python 3.13.3, XPPython3 4.5.0
+
+Streams sampled datarefs to external programs over UDP (see Telemetry.py for
+the protocol and tools/telemetry_client.py for a reference client).
+'''
+
+import time
+from XPPython3 import xp  # type: ignore
+from Telemetry import Publisher, DEFAULT_PORT
+
+
+class PythonInterface:
+    def __init__(self):
+        self.Name = "Telemetry"
+        self.Sig = "aryanshukla.plugin006.telemetry"
+        self.Desc = "Streams Sampled Datarefs To External Consumers Over UDP"
+
+        self.datarefs = {
+            'LAT': 'sim/flightmodel/position/latitude',
+            'LON': 'sim/flightmodel/position/longitude',
+            'ALT': 'sim/flightmodel2/position/pressure_altitude',
+            'HDG': 'sim/flightmodel/position/mag_psi',
+            'PTCH': 'sim/flightmodel/position/theta',
+            'ROLL': 'sim/flightmodel/position/phi',
+            'CAS': 'sim/cockpit2/gauges/indicators/airspeed_kts_pilot',
+            'VSPD': 'sim/cockpit2/gauges/indicators/vvi_fpm_pilot',
+            'FLAP': 'sim/flightmodel/controls/flaprat',
+        }
+        self.parameters = list(self.datarefs.keys())
+
+        self.HOST = '127.0.0.1'         # '0.0.0.0' to accept subscribers from other machines
+        self.PORT = DEFAULT_PORT
+        self.SAMPLE_INTERVAL = 0.05     # seconds between samples (20 Hz)
+
+        self.isStreaming = False
+        self.publisher = None
+
+    def StartStreaming(self):
+        self.publisher = Publisher(self.parameters, host=self.HOST, port=self.PORT)
+        try:
+            self.publisher.start()
+        except OSError as e:
+            xp.log(f"Telemetry --> Could not open port {self.PORT}: {e}")
+            self.publisher = None
+            return
+
+        xp.log(f"Telemetry --> Started on {self.HOST}:{self.publisher.port}.")
+        self.isStreaming = True
+        xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: OFF")
+        xp.registerFlightLoopCallback(self.FlightLoopCallback, self.SAMPLE_INTERVAL, 0)
+
+    def StopStreaming(self):
+        xp.unregisterFlightLoopCallback(self.FlightLoopCallback, 0)
+        if self.publisher is not None:
+            self.publisher.stop()
+            self.publisher = None
+        self.isStreaming = False
+        xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: ON")
+        xp.log("Telemetry --> Stopped.")
+
+    def ToggleStreaming(self, menuRefCon, itemRefCon):
+        if self.isStreaming:
+            self.StopStreaming()
+        else:
+            self.StartStreaming()
+
+    def FlightLoopCallback(self, elapsedSinceLastCall, elapsedTimeSinceLastFlightLoop, loopCounter, refcon):
+        # Nothing to read or queue while no one is subscribed
+        if self.publisher.subscribers:
+            self.publisher.push(time.time(), tuple(xp.getDataf(ref) for ref in self.datarefs_pointers))
+        return self.SAMPLE_INTERVAL
+
+    def XPluginStart(self):
+        self.datarefs_pointers = [xp.findDataRef(self.datarefs[param]) for param in self.parameters]
+
+        self.menuId = xp.createMenu("Telemetry", None, 0, self.ToggleStreaming, 0)
+        self.menuIndex = xp.appendMenuItem(self.menuId, "Toggle: ON", 1, 1)
+
+        return self.Name, self.Sig, self.Desc
+
+    def XPluginEnable(self):
+        return 1
+
+    def XPluginReceiveMessage(self, inFromWho, inMessage, inParam):
+        pass
+
+    def XPluginDisable(self):
+        if self.isStreaming:
+            self.StopStreaming()
+        if hasattr(self, 'menuId') and self.menuId is not None:
+            xp.destroyMenu(self.menuId)
+            self.menuId = None
+
+    def XPluginStop(self):
+        pass
@@ -0,0 +1,576 @@
+"""
+Author:         Aryan Shukla
+Module Name:    ParaViz plotter window
+Tools Used:     Python 3.13.3, PyQt5, pyqtgraph
+
+Qt side of PI_ParaViz. Kept in its own module so PyQt5 and pyqtgraph are only
+imported when plotting starts (or by the optional preloader), not when X-Plane
+loads the plugin.
+"""
+
+import math
+import time
+from array import array
+from queue import Empty
+from collections import deque
+import numpy as np
+from PyQt5 import QtWidgets, QtCore
+import pyqtgraph as pg
+
+COLORS = ["#4DB6AC", "#F08913", "#DDC8E0", "#FFD54F", "#90A4AE", "#2B16E9"]
+PANE_HEIGHT = 160
+
+
+class PlotterWindow(QtWidgets.QWidget):
+    def __init__(self, dataQ, paraNames, notifyStop, journal=None,
+                 catalog=None, notifyAdd=None, notifyRemove=None,
+                 layout="overlay", groups=None):
+        super().__init__()
+
+        self.dataQ = dataQ
+        self.paraNames = []
+        self.notifyStop = notifyStop
+
+        # Optional DataRefCatalog for the search box. Parameters added from it
+        # are reported through notifyAdd(label, dataref) so the plugin can
+        # resolve and sample them; removed ones through notifyRemove(label).
+        self.catalog = catalog
+        self.notifyAdd = notifyAdd
+        self.notifyRemove = notifyRemove
+        self.datarefs = {}
+
+        # Optional SessionJournal: buffers are checkpointed every
+        # CHECKPOINT_INTERVAL seconds and reloaded if the last session crashed
+        self.journal = journal
+        self.CHECKPOINT_INTERVAL = 10.0
+        self.lastCheckpoint = time.time()
+
+        self.isRunning = True
+        self.isPaused = False
+        self.isClosing = False
+
+        self.maxlen = 14400
+        self.data = {}
+        self.time = deque(maxlen=self.maxlen)
+
+        # Layouts: "overlay" puts every curve on one plot with its own right
+        # axis; "stacked" gives each group (default: each parameter) its own
+        # pane in a scroll area, X-linked to the others. Only panes scrolled
+        # into view are redrawn; the rest are marked dirty and redrawn when
+        # they come back into view.
+        self.layoutMode = layout
+        self.groups = dict(groups or {})
+        self.panes = {}
+        self.paneParams = {}
+        self.paneCurves = {}
+        self.paneDirty = set()
+        self.frameTimes = deque(maxlen=600)
+
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #0f1116;
+                color: #e0e0e0;
+                font-family: "Segoe UI", "Roboto", sans-serif;
+                font-size: 12pt;
+            }
+            QCheckBox {
+                spacing: 8px;
+                font-weight: 600;
+            }
+            QPushButton {
+                background-color: #2d89ef;
+                border-radius: 10px;
+                padding: 8px 14px;
+                font-size: 12pt; font-weight: 600; color: white;
+            }
+            QPushButton:hover {
+                background-color: #1b5fbf;
+            }
+        """)
+
+        main_layout = QtWidgets.QHBoxLayout(self)
+
+        self.plot_widget = pg.PlotWidget(background="#0f1116")
+        pi = self.plot_widget.getPlotItem()
+        self.plot_widget.showGrid(x=True, y=True, alpha=0.25)
+        pi.getAxis("bottom").setTextPen("#CCCCCC")
+        pi.getAxis("left").setTextPen("#CCCCCC")
+        pi.showAxis("right", False)
+
+        main_layout.addWidget(self.plot_widget, 4)
+
+        self.stackScroll = QtWidgets.QScrollArea()
+        self.stackScroll.setWidgetResizable(True)
+        self.stackScroll.setStyleSheet("QScrollArea { border: none; }")
+        stack_host = QtWidgets.QWidget()
+        self.stackLayout = QtWidgets.QVBoxLayout(stack_host)
+        self.stackLayout.setContentsMargins(0, 0, 0, 0)
+        self.stackLayout.setSpacing(2)
+        self.stackScroll.setWidget(stack_host)
+        self.stackScroll.verticalScrollBar().valueChanged.connect(lambda _: self.DrawPanes())
+        self.stackScroll.setVisible(False)
+        main_layout.addWidget(self.stackScroll, 4)
+
+        self.base_curve = self.plot_widget.plot([], [], pen=pg.mkPen((0, 0, 0, 0)))
+        self.curves = {}
+        self.viewboxes = {}
+        self.axes = {}
+        self.colors = {}
+        self.rows = {}
+        self.overlayItems = {}
+        self.colorIndex = 0
+
+        side_panel = QtWidgets.QFrame()
+        side_panel.setStyleSheet("QFrame { background-color: #181b22; border-radius: 12px; }")
+        side_layout = QtWidgets.QVBoxLayout(side_panel)
+        side_layout.setContentsMargins(15, 15, 15, 15)
+
+        title = QtWidgets.QLabel("<--- PARAMETERS --->")
+        title.setStyleSheet("font-size: 12pt; font-weight: bold; color: #ffffff;")
+        side_layout.addWidget(title)
+
+        self.checkboxes = {}
+        self.paramLayout = QtWidgets.QVBoxLayout()
+        side_layout.addLayout(self.paramLayout)
+
+        for param in paraNames:
+            self.CreateParameter(param)
+
+        if self.catalog is not None:
+            self.search = QtWidgets.QLineEdit()
+            self.search.setPlaceholderText(f"Search {len(self.catalog):,} datarefs ...")
+            self.search.setStyleSheet("QLineEdit { background-color: #0f1116; border-radius: 6px; padding: 4px; }")
+            self.results = QtWidgets.QListWidget()
+            self.results.setMaximumHeight(180)
+            self.results.setStyleSheet("QListWidget { background-color: #0f1116; font-size: 10pt; }")
+            self.search.textChanged.connect(self.UpdateSearch)
+            self.results.itemActivated.connect(self.AddFromCatalog)
+            side_layout.addWidget(self.search)
+            side_layout.addWidget(self.results)
+
+        side_layout.addStretch()
+
+        btn_row = QtWidgets.QGridLayout()
+        self.pause_btn = QtWidgets.QPushButton("Pause")
+        self.reset_btn = QtWidgets.QPushButton("Reset")
+        self.layout_btn = QtWidgets.QPushButton("Stacked")
+        btn_row.addWidget(self.pause_btn, 0, 0, 1, 2)
+        btn_row.addWidget(self.reset_btn, 1, 0, 1, 2)
+        btn_row.addWidget(self.layout_btn, 2, 0, 1, 2)
+        side_layout.addLayout(btn_row)
+        self.pause_btn.clicked.connect(self.TogglePauseResume)
+        self.reset_btn.clicked.connect(self.ResetPlotting)
+        self.layout_btn.clicked.connect(
+            lambda: self.SetLayout("overlay" if self.layoutMode == "stacked" else "stacked")
+        )
+
+        main_layout.addWidget(side_panel, 1)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.UpdatePlot)
+        self.t0 = time.time()
+        self.RestoreHistory()
+        self.timer.start(200)
+
+        pi.vb.sigResized.connect(self.UpdateViews)
+        self.UpdateViews()
+
+        if self.paraNames:
+            self.checkboxes[self.paraNames[0]].setChecked(True)
+        self.UpdateSelected()
+        self.SetLayout(self.layoutMode)
+
+    # ------------------------------------------------------------
+    # Parameters (created on add, freed on remove)
+    # ------------------------------------------------------------
+    def CreateParameter(self, param):
+        pi = self.plot_widget.getPlotItem()
+        color = COLORS[self.colorIndex % len(COLORS)]
+        self.colorIndex += 1
+
+        vb = pg.ViewBox()
+        axis = pg.AxisItem(orientation="right")
+        axis.setPen(color)
+        axis.setTextPen(color)
+        axis.setLabel(text=param, color=color)
+
+        pi.scene().addItem(vb)
+        axis.linkToView(vb)
+        vb.setXLink(pi.vb)
+
+        curve = pg.PlotCurveItem(pen=pg.mkPen(color, width=2), connect='finite')
+        vb.addItem(curve)
+
+        self.paraNames.append(param)
+        self.curves[param] = curve
+        self.viewboxes[param] = vb
+        self.axes[param] = axis
+        self.colors[param] = color
+        # Pad with NaN so the new buffer lines up with the shared time buffer
+        self.data[param] = deque([math.nan] * len(self.time), maxlen=self.maxlen)
+
+        axis.setVisible(False)
+        curve.setVisible(False)
+
+        row = QtWidgets.QWidget()
+        row_layout = QtWidgets.QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        cb = QtWidgets.QCheckBox(param)
+        cb.setStyleSheet(f"QCheckBox {{ color: {color}; font-weight: bold; }}")
+        cb.stateChanged.connect(self.UpdateSelected)
+        remove = QtWidgets.QPushButton("x")
+        remove.setFixedWidth(28)
+        remove.setStyleSheet("QPushButton { background-color: #2a2e38; padding: 2px; font-size: 10pt; }")
+        remove.clicked.connect(lambda _, p=param: self.RemoveParameter(p))
+        row_layout.addWidget(cb)
+        row_layout.addWidget(remove)
+        self.paramLayout.addWidget(row)
+        self.checkboxes[param] = cb
+        self.rows[param] = row
+
+        self.LayoutAxes()
+        if self.layoutMode == "stacked":
+            self.RebuildPanes()
+
+    def RemoveParameter(self, param):
+        if param not in self.curves:
+            return
+        pi = self.plot_widget.getPlotItem()
+        axis, vb = self.axes.pop(param), self.viewboxes.pop(param)
+        pi.layout.removeItem(axis)
+        pi.scene().removeItem(axis)
+        pi.scene().removeItem(vb)
+        self.rows.pop(param).deleteLater()
+
+        self.paraNames.remove(param)
+        for table in (self.curves, self.colors, self.data, self.checkboxes, self.overlayItems, self.datarefs):
+            table.pop(param, None)
+        if self.notifyRemove is not None:
+            self.notifyRemove(param)
+
+        # Pane state may outlive a layout switch; never leave the removed parameter in it
+        self.paneCurves.pop(param, None)
+        for params in self.paneParams.values():
+            if param in params:
+                params.remove(param)
+
+        self.LayoutAxes()
+        self.UpdateViews()
+        if self.layoutMode == "stacked":
+            self.RebuildPanes()
+            self.Redraw()
+
+    def LayoutAxes(self):
+        pi = self.plot_widget.getPlotItem()
+        placed = {pi.layout.itemAt(i) for i in range(pi.layout.count())}
+        for axis in self.axes.values():
+            if axis in placed:
+                pi.layout.removeItem(axis)
+        for i, param in enumerate(self.paraNames):
+            pi.layout.addItem(self.axes[param], 2, 3 + i)
+
+    def AddParameter(self, dataref, label=None):
+        '''Plot `dataref` (optionally "name[index]") under `label`, default
+        its last path segment.'''
+        label = label or dataref.rsplit('/', 1)[-1]
+        base, n = label, 2
+        while label in self.curves:
+            label, n = f"{base}_{n}", n + 1
+
+        self.CreateParameter(label)
+        self.datarefs[label] = dataref
+        if self.notifyAdd is not None:
+            self.notifyAdd(label, dataref)
+        self.checkboxes[label].setChecked(True)
+        return label
+
+    # ------------------------------------------------------------
+    # Stacked layout
+    # ------------------------------------------------------------
+    def SetLayout(self, mode):
+        self.layoutMode = mode
+        stacked = mode == "stacked"
+        if stacked:
+            self.RebuildPanes()
+        else:
+            self.ClearPanes()
+        self.plot_widget.setVisible(not stacked)
+        self.stackScroll.setVisible(stacked)
+        self.layout_btn.setText("Overlay" if stacked else "Stacked")
+        self.Redraw()
+
+    def ClearPanes(self):
+        for pane in self.panes.values():
+            self.stackLayout.removeWidget(pane)
+            pane.deleteLater()
+        self.panes, self.paneParams, self.paneCurves = {}, {}, {}
+        self.paneDirty = set()
+
+    def RebuildPanes(self):
+        self.ClearPanes()
+        for p in self.paraNames:
+            group = self.groups.get(p, p)
+            if group not in self.panes:
+                pane = pg.PlotWidget(background="#0f1116")
+                pane.setMinimumHeight(PANE_HEIGHT)
+                pane.showGrid(x=True, y=True, alpha=0.25)
+                pi = pane.getPlotItem()
+                pi.setLabel("left", group, color=self.colors[p])
+                pi.getAxis("left").setTextPen("#CCCCCC")
+                pi.getAxis("bottom").setTextPen("#CCCCCC")
+                self.stackLayout.addWidget(pane)
+                self.panes[group] = pane
+                self.paneParams[group] = []
+            self.paneParams[group].append(p)
+            curve = pg.PlotCurveItem(pen=pg.mkPen(self.colors[p], width=2), connect='finite')
+            self.panes[group].getPlotItem().addItem(curve)
+            self.paneCurves[p] = curve
+
+        self.LinkPanes()
+
+    def LinkPanes(self):
+        # Hide panes with nothing selected; the shared time axis is drawn
+        # only under the last visible pane
+        shown = []
+        for group, pane in self.panes.items():
+            selected = [p for p in self.paneParams[group] if p in self.checkboxes and self.checkboxes[p].isChecked()]
+            for p in self.paneParams[group]:
+                if p in self.paneCurves:
+                    self.paneCurves[p].setVisible(p in selected)
+            pane.setVisible(bool(selected))
+            if selected:
+                shown.append(pane)
+        for i, pane in enumerate(shown):
+            pi = pane.getPlotItem()
+            pi.setXLink(shown[0].getPlotItem() if i else None)
+            pi.showAxis("bottom", i == len(shown) - 1)
+        self.paneDirty = set(self.panes)
+
+    def DrawPanes(self, x=None):
+        if not self.panes or not self.time:
+            return
+        if x is None:
+            x = np.fromiter(self.time, float, len(self.time))
+        for group, pane in self.panes.items():
+            if group not in self.paneDirty or not pane.isVisible() or pane.visibleRegion().isEmpty():
+                continue            # culled: stays dirty until scrolled into view
+            for p in self.paneParams[group]:
+                if p in self.checkboxes and self.checkboxes[p].isChecked():
+                    self.paneCurves[p].setData(x, np.fromiter(self.data[p], float, len(self.data[p])))
+            self.paneDirty.discard(group)
+
+    def DrawOverlay(self, x):
+        self.base_curve.setData(x, np.zeros_like(x))
+        for p, cb in self.checkboxes.items():
+            if cb.isChecked() and len(self.data[p]) > 0:
+                self.curves[p].setData(x, np.fromiter(self.data[p], float, len(self.data[p])))
+                self.viewboxes[p].enableAutoRange(axis=self.viewboxes[p].YAxis, enable=True)
+        self.UpdateViews()
+
+    def Redraw(self):
+        if not self.time:
+            return
+        x = np.fromiter(self.time, float, len(self.time))
+        if self.layoutMode == "stacked":
+            self.paneDirty = set(self.panes)
+            self.DrawPanes(x)
+        else:
+            self.DrawOverlay(x)
+
+    def UpdateSearch(self, text):
+        self.results.clear()
+        for entry in self.catalog.Search(text, limit=50):
+            if entry['type'].startswith('byte'):
+                continue            # strings, nothing to plot
+            item = QtWidgets.QListWidgetItem(f"{entry['name']}  ({entry['type']})")
+            item.setToolTip(f"{entry['units']}  {entry['desc']}".strip())
+            item.setData(QtCore.Qt.UserRole, entry)
+            self.results.addItem(item)
+
+    def AddFromCatalog(self, item):
+        entry = item.data(QtCore.Qt.UserRole)
+        dataref = entry['name']
+        if '[' in entry['type']:
+            dataref += '[0]'        # arrays: plot the first element
+        self.AddParameter(dataref)
+
+    def RestoreHistory(self):
+        if self.journal is None:
+            return
+        state = self.journal.load()
+        if state is None:
+            return
+        meta, arrays = state
+        if not meta.get('active'):
+            return
+
+        # Bring back parameters added from the catalog in the crashed session
+        for p, dataref in meta.get('datarefs', {}).items():
+            if p not in self.curves:
+                self.AddParameter(dataref, label=p)
+
+        self.t0 = meta['t0']
+        self.time.extend(arrays['time'])
+        for p in self.paraNames:
+            if p in arrays:
+                self.data[p].extend(arrays[p])
+            else:
+                self.data[p].extend([math.nan] * len(arrays['time']))
+
+    def Checkpoint(self, active=True):
+        if self.journal is None:
+            return
+        arrays = {'time': array('d', self.time)}
+        arrays.update({p: array('f', self.data[p]) for p in self.paraNames})
+        self.journal.checkpoint({
+            'active': active, 't0': self.t0, 'params': list(self.paraNames), 'datarefs': self.datarefs
+        }, arrays)
+        self.lastCheckpoint = time.time()
+
+    def ShowOverlay(self, overlay):
+        '''Static comparison view (see tools/fdr_compare.py). For each parameter
+        it draws every aligned flight faintly, the p5-p95 band, and the mean in
+        the parameter's usual curve, all on the overlay's shared x axis. Live
+        updates stop.'''
+        if self.layoutMode == "stacked":
+            self.SetLayout("overlay")
+        self.isRunning = False
+        if self.timer.isActive():
+            self.timer.stop()
+
+        x = np.asarray(overlay['x'], dtype=float)
+        pi = self.plot_widget.getPlotItem()
+        pi.setLabel('bottom', overlay['xlabel'])
+        for vb in [pi.vb] + list(self.viewboxes.values()):
+            vb.invertX(bool(overlay['invert_x']))
+        self.base_curve.setData(x, np.zeros_like(x))
+
+        for p in self.paraNames:
+            vb = self.viewboxes[p]
+            for item in self.overlayItems.pop(p, []):
+                vb.removeItem(item)
+            d = overlay['params'].get(p)
+            if d is None:
+                # Not part of the comparison (e.g. added from the catalog): blank it
+                self.curves[p].setData([], [])
+                continue
+
+            # All flights as one NaN-separated curve instead of one item each
+            flights = np.asarray(d['flights'], dtype=float)
+            gap = np.full((len(flights), 1), np.nan)
+            xs = np.hstack([np.tile(x, (len(flights), 1)), gap]).ravel()
+            ys = np.hstack([flights, gap]).ravel()
+            faint = pg.mkColor(self.colors[p])
+            faint.setAlpha(50)
+            spaghetti = pg.PlotCurveItem(xs, ys, pen=pg.mkPen(faint, width=1), connect='finite')
+
+            ok = np.isfinite(d['lo']) & np.isfinite(d['hi'])
+            fill = pg.mkColor(self.colors[p])
+            fill.setAlpha(70)
+            band = pg.FillBetweenItem(
+                pg.PlotCurveItem(x[ok], d['lo'][ok]), pg.PlotCurveItem(x[ok], d['hi'][ok]), brush=fill
+            )
+
+            vb.addItem(spaghetti)
+            vb.addItem(band)
+            self.overlayItems[p] = [spaghetti, band]
+
+            self.curves[p].setData(x, np.asarray(d['mean'], dtype=float), connect='finite')
+            vb.enableAutoRange(axis=vb.YAxis, enable=True)
+
+        self.UpdateSelected()
+
+    def closeEvent(self, event):
+        self.isClosing = True
+        if self.timer.isActive():
+            self.timer.stop()
+        try:
+            self.Checkpoint(active=False)
+        except Exception:
+            pass
+        try:
+            self.notifyStop()
+        finally:
+            super().closeEvent(event)
+
+    def UpdateViews(self):
+        pi = self.plot_widget.getPlotItem()
+        vb_main = pi.vb
+        rect = vb_main.sceneBoundingRect()
+        for vb in self.viewboxes.values():
+            vb.setGeometry(rect)
+            vb.linkedViewChanged(vb_main, vb.XAxis)
+
+    def UpdateSelected(self):
+        for p, cb in self.checkboxes.items():
+            vis = cb.isChecked()
+            self.curves[p].setVisible(vis)
+            self.axes[p].setVisible(vis)
+            for item in self.overlayItems.get(p, []):
+                item.setVisible(vis)
+        self.UpdateViews()
+        if self.panes:
+            self.LinkPanes()
+            self.DrawPanes()
+
+    def TogglePauseResume(self):
+        if not self.isRunning:
+            return
+        if not self.isPaused:
+            self.isPaused = True
+            self.timer.stop()
+            self.pause_btn.setText("Resume")
+        else:
+            self.isPaused = False
+            self.timer.start(200)
+            self.pause_btn.setText("Pause")
+
+    def ResetPlotting(self):
+        self.isRunning = True
+        self.isPaused = False
+        if self.timer.isActive():
+            self.timer.stop()
+        self.time.clear()
+        for p in self.paraNames:
+            self.data[p].clear()
+            self.curves[p].setData([], [])
+        for curve in self.paneCurves.values():
+            curve.setData([], [])
+        self.base_curve.setData([], [])
+        self.pause_btn.setText("Pause")
+
+        self.t0 = time.time()
+        for cb in self.checkboxes.values():
+            cb.setChecked(False)
+        if self.paraNames:
+            self.checkboxes[self.paraNames[0]].setChecked(True)
+        self.UpdateSelected()
+        self.Checkpoint()
+        self.timer.start(200)
+
+    def UpdatePlot(self):
+        if not self.isRunning or self.isPaused or self.isClosing:
+            return
+
+        latest = None
+        try:
+            while True:
+                latest = self.dataQ.get_nowait()
+        except Empty:
+            pass
+
+        if latest is None:
+            return
+
+        timestamp, values = latest
+        self.time.append(timestamp - self.t0)
+        for p in self.paraNames:
+            # Parameters the plugin has not resolved yet read as gaps
+            self.data[p].append(values.get(p, math.nan))
+
+        t0 = time.perf_counter()
+        self.Redraw()
+        self.frameTimes.append(time.perf_counter() - t0)
+
+        if time.time() - self.lastCheckpoint >= self.CHECKPOINT_INTERVAL:
+            self.Checkpoint()
@@ -0,0 +1,168 @@
+'''
+Author:         Aryan Shukla
+Module Name:    Crash-tolerant session journal
+Tools Used:     Python 3.13.3
+
+Keeps the latest checkpoint of a plugin's session state (a small JSON dict
+plus optional typed arrays) in a memory-mapped file, so a session can be
+resumed after X-Plane crashes.
+
+    journal = SessionJournal('paraviz.journal')
+    journal.checkpoint({'active': True, 't0': t0}, {'time': array('d', times)})
+    meta, arrays = journal.load() or ({}, {})
+
+File layout:
+
+    [0, 64)         primary header
+    [64, 128)       backup header
+    [4096, ...)     two payload regions, used alternately
+
+    header   4s magic b'XPSJ', u16 version, u16 pad, u64 generation,
+             u64 payload offset, u64 payload length, u32 payload crc32,
+             u32 header crc32
+    payload  u32 json length, utf-8 JSON meta, then the raw bytes of each
+             array listed in meta['__arrays__'] as [name, typecode, count]
+
+A checkpoint writes the payload into the region no header points to, then
+the backup header, then the primary header, flushing after each step. A
+crash at any point leaves at least one header whose CRCs check out and whose
+payload is untouched.
+'''
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+
+MAGIC = b'XPSJ'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQQQI')     # followed by u32 header crc
+HEADER_SIZE = HEADER.size + 4
+PRIMARY, BACKUP = 0, 64
+DATA_START = 4096
+
+
+class SessionJournal:
+    def __init__(self, path, capacity=1 << 20):
+        self.path = path
+        exists = os.path.exists(path)
+        self.file = open(path, 'r+b' if exists else 'w+b')
+        size = os.fstat(self.file.fileno()).st_size
+        if (size - DATA_START) // 2 <= 0:
+            self.file.truncate(DATA_START + 2 * capacity)
+        # An existing file keeps the region layout it was written with; its
+        # headers point into those regions
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.capacity = (len(self.map) - DATA_START) // 2
+        self.generation = 0
+        self.current = self.readHeader()
+        if self.current is not None:
+            self.generation = self.current[0]
+        if self.capacity < capacity:
+            self.grow(capacity)
+
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # ------------------------------------------------------------
+    # Headers
+    # ------------------------------------------------------------
+    def packHeader(self, generation, offset, length, crc):
+        head = HEADER.pack(MAGIC, VERSION, 0, generation, offset, length, crc)
+        return head + struct.pack('<I', zlib.crc32(head))
+
+    def parseHeader(self, at):
+        raw = self.map[at:at + HEADER_SIZE]
+        head, (crc,) = raw[:HEADER.size], struct.unpack('<I', raw[HEADER.size:])
+        if zlib.crc32(head) != crc:
+            return None
+        magic, version, _, generation, offset, length, payloadCrc = HEADER.unpack(head)
+        if magic != MAGIC or version != VERSION or offset + length > len(self.map):
+            return None
+        if zlib.crc32(self.map[offset:offset + length]) != payloadCrc:
+            return None
+        return generation, offset, length
+
+    def readHeader(self):
+        candidates = [h for h in (self.parseHeader(PRIMARY), self.parseHeader(BACKUP)) if h]
+        return max(candidates) if candidates else None
+
+    # ------------------------------------------------------------
+    # Checkpoint / load
+    # ------------------------------------------------------------
+    def checkpoint(self, meta, arrays=None):
+        arrays = arrays or {}
+        meta = dict(meta)
+        meta['__arrays__'] = [[name, a.typecode, len(a)] for name, a in arrays.items()]
+        text = json.dumps(meta).encode('utf-8')
+        payload = b''.join([struct.pack('<I', len(text)), text] + [a.tobytes() for a in arrays.values()])
+
+        if len(payload) > self.capacity:
+            self.grow(len(payload))
+
+        # Write into whichever region the live header does not point at
+        regions = (DATA_START, DATA_START + self.capacity)
+        offset = regions[1] if self.current and self.current[1] == regions[0] else regions[0]
+        self.map[offset:offset + len(payload)] = payload
+        self.map.flush()
+
+        self.generation += 1
+        header = self.packHeader(self.generation, offset, len(payload), zlib.crc32(payload))
+        self.map[BACKUP:BACKUP + HEADER_SIZE] = header
+        self.map.flush()
+        self.map[PRIMARY:PRIMARY + HEADER_SIZE] = header
+        self.map.flush()
+        self.current = (self.generation, offset, len(payload))
+
+    def grow(self, needed):
+        '''Enlarge both regions. The live payload is first re-committed to the
+        start of region 0, which cannot overlap where it lives now.'''
+        live = None
+        if self.current:
+            _, offset, length = self.current
+            live = self.map[offset:offset + length]
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.map.close()
+        self.file.truncate(DATA_START + 2 * capacity)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.capacity = capacity
+
+        if live is not None and self.current[1] != DATA_START:
+            self.map[DATA_START:DATA_START + len(live)] = live
+            self.map.flush()
+            self.generation += 1
+            header = self.packHeader(self.generation, DATA_START, len(live), zlib.crc32(live))
+            self.map[BACKUP:BACKUP + HEADER_SIZE] = header
+            self.map.flush()
+            self.map[PRIMARY:PRIMARY + HEADER_SIZE] = header
+            self.map.flush()
+            self.current = (self.generation, DATA_START, len(live))
+
+    def load(self):
+        '''Return (meta, arrays) of the latest intact checkpoint, or None.'''
+        if self.current is None:
+            return None
+        _, offset, length = self.current
+        payload = self.map[offset:offset + length]
+        (n,) = struct.unpack_from('<I', payload)
+        meta = json.loads(payload[4:4 + n].decode('utf-8'))
+        arrays = {}
+        pos = 4 + n
+        for name, typecode, count in meta.pop('__arrays__', []):
+            a = array(typecode)
+            nbytes = a.itemsize * count
+            a.frombytes(payload[pos:pos + nbytes])
+            arrays[name] = a
+            pos += nbytes
+        return meta, arrays
@@ -0,0 +1,253 @@
+'''
+Author:         Aryan Shukla
+Module Name:    Telemetry streaming (publisher + reference client)
+Tools Used:     Python 3.13.3, NumPy (client only)
+
+Streams sampled dataref values out of the sim over UDP. The flight loop only
+appends (time, values) to a queue; a background thread batches, filters,
+rate-limits, packs and sends.
+
+Subscribing: a client sends a SUBSCRIBE datagram to the publisher port
+
+    b'XPTS' + JSON {"params": ["ALT", "CAS"] or null for all, "rate": 10 (Hz, 0 = every sample)}
+
+and repeats it at least every SUB_TIMEOUT seconds to stay subscribed
+(b'XPTU' unsubscribes). The publisher answers with a SCHEMA frame and then
+sends DATA frames. seq numbers each subscriber's DATA frames 1, 2, 3, ...
+(restarting with every new SCHEMA); SCHEMA frames carry seq 0, so a gap in
+seq between DATA frames is a dropped datagram.
+
+Frame layout (little endian):
+
+    header  4s magic b'XPTM', u8 version, u8 kind (0 schema, 1 data), u32 seq,
+            u16 nsamples, u16 nparams
+    SCHEMA  utf-8 JSON {"params": [all parameter names, index = id]}
+    DATA    u16 ids[nparams], f64 times[nsamples], f32 values[nsamples][nparams]
+'''
+
+import json
+import select
+import socket
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+
+MAGIC = b'XPTM'
+SUBSCRIBE = b'XPTS'
+UNSUBSCRIBE = b'XPTU'
+VERSION = 1
+KIND_SCHEMA, KIND_DATA = 0, 1
+HEADER = struct.Struct('<4sBBIHH')
+
+DEFAULT_PORT = 49710
+MAX_DATAGRAM = 1400         # stay under a typical MTU
+SUB_TIMEOUT = 10.0
+
+
+class Subscriber:
+    def __init__(self, addr, ids, rate):
+        self.addr = addr
+        self.request = (tuple(ids), rate)
+        self.ids = ids
+        self.idsBytes = array('H', ids).tobytes()
+        self.minInterval = 1.0 / rate if rate else 0.0
+        self.lastSample = -1e18
+        self.lastSeen = time.monotonic()
+        self.seq = 0                # last DATA seq sent to this subscriber
+        # Samples per datagram so a frame fits in MAX_DATAGRAM
+        rowBytes = 8 + 4 * len(ids)
+        self.maxSamples = max(1, (MAX_DATAGRAM - HEADER.size - len(self.idsBytes)) // rowBytes)
+
+
+class Publisher:
+    '''Call push() from the flight loop; everything else runs on a thread.'''
+
+    def __init__(self, params, host='127.0.0.1', port=DEFAULT_PORT, batchInterval=0.05):
+        self.params = list(params)
+        self.index = {name: i for i, name in enumerate(self.params)}
+        self.host = host
+        self.port = port
+        self.batchInterval = batchInterval
+
+        # (time, values tuple); deque appends are thread-safe. Bounded so a stalled
+        # sender thread cannot grow memory without limit.
+        self.queue = deque(maxlen=10000)
+        self.subscribers = {}
+        self.sent = 0
+        self.sock = None
+        self.thread = None
+        self.stopEvent = threading.Event()
+
+    # ------------------------------------------------------------
+    # Flight-loop side
+    # ------------------------------------------------------------
+    def push(self, t, values):
+        if self.subscribers:
+            self.queue.append((t, values))
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+    def start(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.host, self.port))
+        self.port = self.sock.getsockname()[1]
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self.run, name="TelemetryThread", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.subscribers.clear()
+        self.queue.clear()
+
+    # ------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------
+    def run(self):
+        while not self.stopEvent.is_set():
+            readable, _, _ = select.select([self.sock], [], [], self.batchInterval)
+            if readable:
+                self.receive()
+
+            now = time.monotonic()
+            for addr in [a for a, s in self.subscribers.items() if now - s.lastSeen > SUB_TIMEOUT]:
+                del self.subscribers[addr]
+
+            batch = []
+            while self.queue:
+                batch.append(self.queue.popleft())
+            if batch:
+                for sub in list(self.subscribers.values()):
+                    self.publish(sub, batch)
+
+    def receive(self):
+        try:
+            data, addr = self.sock.recvfrom(65536)
+        except OSError:
+            return
+        if data.startswith(UNSUBSCRIBE):
+            self.subscribers.pop(addr, None)
+            return
+        if not data.startswith(SUBSCRIBE):
+            return
+        try:
+            request = json.loads(data[4:].decode('utf-8') or '{}')
+        except ValueError:
+            return
+
+        names = request.get('params') or self.params
+        ids = [self.index[n] for n in names if n in self.index]
+        rate = float(request.get('rate') or 0)
+        sub = self.subscribers.get(addr)
+        if sub is None or sub.request != (tuple(ids), rate):
+            sub = Subscriber(addr, ids, rate)
+            self.subscribers[addr] = sub
+            self.sendTo(addr, self.frame(KIND_SCHEMA, 0, 0, 0, json.dumps({'params': self.params}).encode('utf-8')))
+        sub.lastSeen = time.monotonic()
+
+    def publish(self, sub, batch):
+        if sub.minInterval:
+            kept = []
+            for t, values in batch:
+                if t - sub.lastSample >= sub.minInterval:
+                    kept.append((t, values))
+                    sub.lastSample = t
+            batch = kept
+
+        ids = sub.ids
+        for start in range(0, len(batch), sub.maxSamples):
+            rows = batch[start:start + sub.maxSamples]
+            times = array('d', [t for t, _ in rows])
+            values = array('f', [values[i] for _, values in rows for i in ids])
+            payload = sub.idsBytes + times.tobytes() + values.tobytes()
+            sub.seq = sub.seq % 0xFFFFFFFF + 1
+            self.sendTo(sub.addr, self.frame(KIND_DATA, sub.seq, len(rows), len(ids), payload))
+
+    def frame(self, kind, seq, nsamples, nparams, payload):
+        return HEADER.pack(MAGIC, VERSION, kind, seq, nsamples, nparams) + payload
+
+    def sendTo(self, addr, frame):
+        try:
+            self.sock.sendto(frame, addr)
+            self.sent += 1
+        except OSError:
+            self.subscribers.pop(addr, None)
+
+
+class TelemetryClient:
+    '''Reference client: subscribes and decodes DATA frames into NumPy arrays.
+
+        client = TelemetryClient(params=["ALT", "CAS"], rate=10)
+        names, times, values = client.receive()   # values.shape == (len(times), len(names))
+    '''
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, params=None, rate=0, timeout=1.0):
+        import numpy as np
+        self.np = np
+        self.server = (host, port)
+        self.params = params
+        self.rate = rate
+        self.timeout = timeout
+        self.schema = None
+        self.lastSubscribe = 0.0
+        self.lastSeq = None
+        self.dropped = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1' if host in ('127.0.0.1', 'localhost') else '', 0))
+        self.sock.settimeout(timeout)
+        self.subscribe()
+
+    def subscribe(self):
+        request = json.dumps({'params': self.params, 'rate': self.rate}).encode('utf-8')
+        self.sock.sendto(SUBSCRIBE + request, self.server)
+        self.lastSubscribe = time.monotonic()
+
+    def close(self):
+        try:
+            self.sock.sendto(UNSUBSCRIBE, self.server)
+        finally:
+            self.sock.close()
+
+    def decode(self, data):
+        '''Return (names, times, values) for a DATA frame, None for anything else.'''
+        np = self.np
+        magic, version, kind, seq, nsamples, nparams = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        if kind == KIND_SCHEMA:
+            # A new subscription restarts the DATA sequence at 1
+            self.schema = json.loads(data[HEADER.size:].decode('utf-8'))['params']
+            self.lastSeq = None
+            return None
+        if self.lastSeq is not None and seq > self.lastSeq:
+            self.dropped += seq - self.lastSeq - 1
+        self.lastSeq = seq
+
+        offset = HEADER.size
+        ids = np.frombuffer(data, dtype='<u2', count=nparams, offset=offset)
+        offset += 2 * nparams
+        times = np.frombuffer(data, dtype='<f8', count=nsamples, offset=offset)
+        offset += 8 * nsamples
+        values = np.frombuffer(data, dtype='<f4', count=nsamples * nparams, offset=offset).reshape(nsamples, nparams)
+        names = [self.schema[i] for i in ids] if self.schema else [str(i) for i in ids]
+        return names, times, values
+
+    def receive(self):
+        '''Block until the next DATA frame (renewing the subscription as needed).
+        Raises socket.timeout if nothing arrives within `timeout`.'''
+        while True:
+            if time.monotonic() - self.lastSubscribe > SUB_TIMEOUT / 3:
+                self.subscribe()
+            data, _ = self.sock.recvfrom(65536)
+            decoded = self.decode(data)
+            if decoded is not None:
+                return decoded
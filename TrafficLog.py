@@ -0,0 +1,132 @@
+'''
+Author:         Aryan Shukla
+Module Name:    Columnar traffic log (GenFDR sidecar)
+Tools Used:     Python 3.13.3, NumPy (reader only)
+
+Stores one row per traffic aircraft per sample, column by column, so a tick
+with 60 aircraft costs the same number of writes as a tick with one.
+
+    log = TrafficWriter('flight.fdr.traffic', ['lat', 'lon', 'ele'])
+    log.append(t, sample, ids, {'lat': lats, 'lon': lons, ...})
+    log.flush()
+    cols = ReadTraffic('flight.fdr.traffic')     # {'time': ndarray, ...}
+
+File layout (little endian):
+
+    header  4s magic b'XPTF', u16 version, u32 schema length,
+            utf-8 JSON {"columns": [[name, typecode], ...]}
+    block   4s b'BLCK', u32 nrows, then for each column in schema order
+            nrows values of that column's typecode
+
+Rows are buffered in memory and written as one block per flush(). A block cut
+short by a crash is ignored by the reader; reopening the writer with
+`resumeAt=` (an offset returned by flush()) drops it before appending again.
+'''
+
+import json
+import struct
+from array import array
+
+MAGIC = b'XPTF'
+BLOCK = b'BLCK'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+BLOCK_HEADER = struct.Struct('<4sI')
+
+# Leading columns every row carries; the per-aircraft fields follow
+KEY_COLUMNS = [('time', 'd'), ('sample', 'i'), ('id', 'i')]
+
+
+class TrafficWriter:
+    def __init__(self, path, fields, resumeAt=None, flushRows=4096):
+        '''`fields` is a list of float field names. The file is created fresh
+        unless `resumeAt` is given, in which case the existing file is cut back
+        to that offset and appended to.'''
+        self.path = path
+        self.columns = KEY_COLUMNS + [(name, 'f') for name in fields]
+        self.fields = list(fields)
+        self.flushRows = flushRows
+        self.rows = 0
+
+        if resumeAt is not None:
+            with open(path, 'r+b') as f:
+                schema = ReadSchema(f)
+                if schema != [list(c) for c in self.columns]:
+                    raise ValueError(f"{path}: column schema does not match")
+                f.truncate(resumeAt)
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+            schema = json.dumps({'columns': self.columns}).encode('utf-8')
+            self.file.write(HEADER.pack(MAGIC, VERSION, len(schema)) + schema)
+            self.file.flush()
+
+        self.buffers = {name: array(code) for name, code in self.columns}
+
+    def append(self, t, sample, ids, values):
+        '''Add len(ids) rows. `values` maps each field to a sequence at least
+        len(ids) long; only the first len(ids) entries are used.'''
+        n = len(ids)
+        if n == 0:
+            return
+        b = self.buffers
+        b['time'].extend(array('d', (t,)) * n)
+        b['sample'].extend(array('i', (sample,)) * n)
+        b['id'].extend(ids)
+        for name in self.fields:
+            b[name].extend(values[name][:n])
+        self.rows += n
+        if self.rows >= self.flushRows:
+            self.flush()
+
+    def flush(self):
+        '''Write buffered rows as one block. Returns the file offset after it.'''
+        if self.rows:
+            self.file.write(BLOCK_HEADER.pack(BLOCK, self.rows))
+            for name, _ in self.columns:
+                self.buffers[name].tofile(self.file)
+                del self.buffers[name][:]
+            self.rows = 0
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+def ReadSchema(f):
+    magic, version, length = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a traffic log")
+    return json.loads(f.read(length).decode('utf-8'))['columns']
+
+
+def ReadTraffic(path):
+    '''Return {column: ndarray} with every complete block concatenated.'''
+    import numpy as np
+
+    with open(path, 'rb') as f:
+        columns = ReadSchema(f)
+        data = f.read()
+
+    dtypes = [(name, np.dtype(code).newbyteorder('<')) for name, code in columns]
+    parts = {name: [] for name, _ in columns}
+    pos = 0
+    while pos + BLOCK_HEADER.size <= len(data):
+        magic, nrows = BLOCK_HEADER.unpack_from(data, pos)
+        size = BLOCK_HEADER.size + nrows * sum(dt.itemsize for _, dt in dtypes)
+        if magic != BLOCK or pos + size > len(data):
+            break       # torn final block
+        at = pos + BLOCK_HEADER.size
+        for name, dt in dtypes:
+            parts[name].append(np.frombuffer(data, dt, nrows, at))
+            at += nrows * dt.itemsize
+        pos += size
+
+    return {
+        name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dt)
+        for name, dt in dtypes
+    }
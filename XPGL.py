@@ -2,11 +2,15 @@ import pygame
 import random
 import sys
 import os
+import json
+import time
+import argparse
 import traceback
 from enum import Enum
 from OpenGL.GL import glClearColor, glClearDepth, glEnable, \
     GL_TEXTURE_2D, glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, \
-    glLoadIdentity, glOrtho, GL_BLEND, GL_TRUE, glDepthMask, glFlush
+    glLoadIdentity, glOrtho, GL_BLEND, GL_TRUE, glDepthMask, glFlush, \
+    glFinish, glGetString, GL_RENDERER
 
 # ==================================================================================
 # SET SYSPATH to include XPPython3... If you're executing this from
@@ -25,6 +29,8 @@ sys.path.insert(0, 'Resources/plugins/PythonPlugins')
 from XPPython3 import xpgl # type: ignore
 from XPPython3.xpgl import Colors # type: ignore
 from XPPython3.xpgl.mock_xp import xp # type: ignore
+from XPGLCache import GeometryCache
+import XPGLTrace
 # pylint: enable=wrong-import-position
 
 # ==================================================================================
@@ -52,6 +58,10 @@ Mode = Modes.Window
 #   dataref values, XPluginInstance variables, etc.
 Data = {}
 
+#
+#   Set by --record: a XPGLTrace.TraceRecorder capturing every xpgl call made by draw()
+Recorder = None
+
 #
 #   Two functions for your to customize:
 #   * load()
@@ -90,6 +100,19 @@ def load():
     Data['Textures']['logo'] = xpgl.loadImage('Resources/plugins/XPPython3/xppython3.png')
     Data['Fonts']['Helvetica'] = xpgl.loadFont('Resources/fonts/Roboto-Regular.ttf', 18)
     Data['fontID'] = xpgl.loadFont("Resources/fonts/Roboto-Bold.ttf", 26)
+    Data['cache'] = GeometryCache()
+    Data['text'] = None     # TextBatcher, built by textBatcher() on the first batched text draw
+
+
+def textBatcher():
+    # XPGLText needs freetype; import it and rasterize the atlas only once a
+    # routine actually draws batched text.
+    if Data['text'] is None:
+        from XPGLText import TextBatcher
+        Data['text'] = TextBatcher()
+        Data['Fonts']['HelveticaAtlas'] = Data['text'].loadFont('Resources/fonts/Roboto-Regular.ttf', 18)
+    return Data['text']
+
 
 def draw():
     # Here is my draw routine... since I'm calling two different draw routines, I simply redirect
@@ -109,15 +132,21 @@ def draw():
 # code can completely be within draw(), above.
 
 def draw_example1():
+    # Nothing here moves, so the whole scene is recorded once and replayed;
+    # it is re-recorded only when the window size or stencil mode changes.
+    Data['cache'].draw('example1', draw_example1_static, Width, Height, Data['stencil'])
+
+
+def draw_example1_static(width, height, stencil):
     # to axis lines
-    xpgl.drawLine(Width / 2, 0, Width / 2, Height)
-    xpgl.drawLine(0, Height / 2, Width, Height / 2)
+    xpgl.drawLine(width / 2, 0, width / 2, height)
+    xpgl.drawLine(0, height / 2, width, height / 2)
 
     with xpgl.maskContext():
-        xpgl.drawTriangle(Width / 2, Height - 60, Width - 50, 40, 50, 40, color=Colors['green'])
-        xpgl.drawUnderMask(stencil=Data['stencil'])
-        xpgl.drawCircle(Width / 2, Height / 2, 150, isFilled=True, color=Colors['orange'])
-    xpgl.drawCircle(Width / 2, Height / 2, 50, isFilled=True)
+        xpgl.drawTriangle(width / 2, height - 60, width - 50, 40, 50, 40, color=Colors['green'])
+        xpgl.drawUnderMask(stencil=stencil)
+        xpgl.drawCircle(width / 2, height / 2, 150, isFilled=True, color=Colors['orange'])
+    xpgl.drawCircle(width / 2, height / 2, 50, isFilled=True)
 
 
 def computeLogoPosition(logo_width, logo_height):
@@ -132,15 +161,29 @@ def computeLogoPosition(logo_width, logo_height):
     return Data['logo_x'], Data['logo_y']
 
 
+def draw_example2_text(font, height):
+    xpgl.drawLine(125, 400, 125, height, color=xpgl.Colors['cyan'])
+    xpgl.drawText(font, 125, 480, "Left-Aligned", color=xpgl.Colors['green'])
+    xpgl.drawText(font, 125, 460, "Right-Aligned", alignment='r', color=xpgl.Colors['green'])
+    xpgl.drawText(font, 125, 440, "Center-Aligned", alignment='C', color=xpgl.Colors['green'])
+
+
+def draw_example2_arc(width, height):
+    with xpgl.graphicsContext():
+        xpgl.setRotateTransform(90, width / 2, height / 2)
+        xpgl.drawArc(width / 2, height / 2,
+                     radius_inner=10, radius_outer=20,
+                     start_angle=0, arc_angle=180, color=xpgl.Colors['red'])
+
+
 def draw_example2():
-    # first, some aligned text
-    xpgl.drawLine(125, 400, 125, Height, color=xpgl.Colors['cyan'])
-    xpgl.drawText(Data['Fonts']['Helvetica'], 125, 480, "Left-Aligned", color=xpgl.Colors['green'])
-    xpgl.drawText(Data['Fonts']['Helvetica'], 125, 460, "Right-Aligned", alignment='r', color=xpgl.Colors['green'])
-    xpgl.drawText(Data['Fonts']['Helvetica'], 125, 440, "Center-Aligned", alignment='C', color=xpgl.Colors['green'])
+    cache = Data['cache']
+
+    # first, some aligned text (static, cached)
+    cache.draw('example2.text', draw_example2_text, Data['Fonts']['Helvetica'], Height)
 
     # draw a line "underneath" the logo and triangles
-    xpgl.drawLine(0, 0, Width, Height, color=xpgl.Colors['pink'])
+    cache.draw('example2.diagonal', xpgl.drawLine, 0, 0, Width, Height, color=xpgl.Colors['pink'])
 
     # draw a bouncing logo
     logo_width = 140
@@ -161,15 +204,71 @@ def draw_example2():
         # Second the drawing(s) affected by the mask
         xpgl.drawTriangle(100, 100, Width / 2, Height - 100, Width - 100, 100, xpgl.Colors['green'])
 
-    # draw a rotated arc above everything else
-    with xpgl.graphicsContext():
-        xpgl.setRotateTransform(90, Width / 2, Height / 2)
-        xpgl.drawArc(Width / 2, Height / 2,
-                     radius_inner=10, radius_outer=20,
-                     start_angle=0, arc_angle=180, color=xpgl.Colors['red'])
+    # draw a rotated arc above everything else (static, cached)
+    cache.draw('example2.arc', draw_example2_arc, Width, Height)
     glFlush()
 
 
+####
+# 1,000 static primitives, drawn directly or through the GeometryCache. Compare with
+#   python XPGL.py --benchmark 300 --routine draw_static_immediate
+#   python XPGL.py --benchmark 300 --routine draw_static_cached
+
+def draw_static_primitives(count, font):
+    rng = random.Random(1234)
+    colors = list(Colors.values())
+    for i in range(count):
+        x, y = rng.uniform(0, Width), rng.uniform(0, Height)
+        color = colors[i % len(colors)]
+        kind = i % 4
+        if kind == 0:
+            xpgl.drawLine(x, y, x + rng.uniform(-40, 40), y + rng.uniform(-40, 40), color=color)
+        elif kind == 1:
+            xpgl.drawTriangle(x, y, x + 12, y, x + 6, y + 10, color)
+        elif kind == 2:
+            xpgl.drawCircle(x, y, rng.uniform(3, 12), isFilled=bool(i % 8 == 2), color=color)
+        else:
+            xpgl.drawText(font, x, y, f"{i:04d}", alignment='L', color=color)
+
+
+def draw_static_immediate():
+    draw_static_primitives(1000, Data['Fonts']['Helvetica'])
+
+
+def draw_static_cached():
+    Data['cache'].draw('static1000', draw_static_primitives, 1000, Data['Fonts']['Helvetica'])
+
+
+####
+# Many changing labels per frame (Data['labels'], default 100), through xpgl.drawText
+# or the batched glyph atlas. Compare with
+#   python XPGL.py --benchmark 300 --routine draw_labels_xpgl --labels 10 100 1000
+#   python XPGL.py --benchmark 300 --routine draw_labels_batched --labels 10 100 1000
+
+def label_layout(count):
+    alignments = ('L', 'r', 'C')
+    colors = list(Colors.values())
+    cols = max(1, int(count ** 0.5))
+    for i in range(count):
+        x = 40 + (i % cols) * (Width - 80) / cols
+        y = 20 + (i // cols) * (Height - 40) / max(1, (count + cols - 1) // cols)
+        yield x, y, f"{(xp.getCycleNumber() + i) % 10000:05d}", alignments[i % 3], colors[i % len(colors)]
+
+
+def draw_labels_xpgl():
+    font = Data['Fonts']['Helvetica']
+    for x, y, text, alignment, color in label_layout(Data.get('labels', 100)):
+        xpgl.drawText(font, x, y, text, alignment=alignment, color=color)
+
+
+def draw_labels_batched():
+    batcher = textBatcher()
+    font = Data['Fonts']['HelveticaAtlas']
+    for x, y, text, alignment, color in label_layout(Data.get('labels', 100)):
+        batcher.drawText(font, x, y, text, alignment=alignment, color=color)
+    batcher.flush()
+
+
 # =================================================================================================
 # You should not need to modify anything below here.
 # We set up the GLUT window with callbacks, and set the OpenGL
@@ -180,7 +279,22 @@ def draw_example2():
 # =================================================================================================
 
 
+def stopRecording():
+    if Recorder is not None:
+        Recorder.close()
+
+
+def writeResult(result, output=None):
+    if output:
+        with open(output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
 def keyPressed(key):
+    if key in ('q', 'X'):
+        stopRecording()
     if key == 'q':
         os._exit(0)
     elif key == 'X':
@@ -197,12 +311,13 @@ def keyPressed(key):
 FRAME_EVENT = pygame.USEREVENT + 1
 
 
-def main():
+def initDisplay(hidden=False):
     pygame.init()
     pygame.display.gl_set_attribute(pygame.GL_STENCIL_SIZE, 8)
     pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 16)
     pygame.display.gl_set_attribute(pygame.GL_ALPHA_SIZE, 16)
-    pygame.display.set_mode((Width, Height), pygame.OPENGL | pygame.RESIZABLE)
+    flags = pygame.OPENGL | (pygame.HIDDEN if hidden else pygame.RESIZABLE)
+    pygame.display.set_mode((Width, Height), flags)
     glClearColor(0.0, 0.0, 0.0, 1.0)  # This Will Clear The Background Color To Black
     glClearDepth(1.0)  # Enables Clearing Of The Depth Buffer
     if Mode in (Modes.AvionicsScreen, ):
@@ -212,6 +327,29 @@ def main():
     pygame.display.set_caption("OpenGL Tester")
     glLoadIdentity()  # Reset The Projection Matrix
 
+
+def prepareFrame():
+    glEnable(GL_TEXTURE_2D)
+    glEnable(GL_BLEND)
+    glDepthMask(GL_TRUE)
+    if Mode in (Modes.AvionicsScreen, ):
+        glClear(GL_DEPTH_BUFFER_BIT)
+    else:
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)  # glClearColor() is previously set
+    glLoadIdentity()  # Reset The View... (0, 0) is center of screen X runs left-right, Y runs Up down.
+    glOrtho(0, Width, 0, Height, 0, 1)
+
+
+def drawFrame(routine):
+    if Recorder is None:
+        routine()
+    else:
+        with Recorder.frame():
+            routine()
+
+
+def main():
+    initDisplay()
     pygame.time.set_timer(FRAME_EVENT, 29)
 
     load()
@@ -219,6 +357,7 @@ def main():
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                stopRecording()
                 pygame.quit()
                 quit()
             elif event.type == pygame.KEYDOWN:
@@ -226,18 +365,10 @@ def main():
             elif event.type == FRAME_EVENT:
                 xp.Counter += 1
 
-        glEnable(GL_TEXTURE_2D)
-        glEnable(GL_BLEND)
-        glDepthMask(GL_TRUE)
-        if Mode in (Modes.AvionicsScreen, ):
-            glClear(GL_DEPTH_BUFFER_BIT)
-        else:
-            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)  # glClearColor() is previously set
-        glLoadIdentity()  # Reset The View... (0, 0) is center of screen X runs left-right, Y runs Up down.
-        glOrtho(0, Width, 0, Height, 0, 1)
+        prepareFrame()
 
         try:
-            draw()
+            drawFrame(draw)
         except Exception as e:
             print(f"Error while drawing screen {e}")
             traceback.print_exception(e)
@@ -250,7 +381,142 @@ def main():
         pygame.time.wait(10)
 
 
+# =================================================================================================
+# Headless benchmark
+#   Draws `frames` frames as fast as possible in a hidden window for each Mode and
+#   reports per-frame draw() time percentiles as JSON. glFinish() brackets the draw,
+#   so the time includes the GL work, not only the command submission.
+#
+#   For a CPU-only Linux box use Mesa's software rasterizer, e.g.
+#       LIBGL_ALWAYS_SOFTWARE=1 GALLIUM_DRIVER=llvmpipe xvfb-run -a python XPGL.py --benchmark 500
+# =================================================================================================
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * (len(samples) - 1) + 0.5))]  # noqa: E731
+    return {
+        'frames': len(samples),
+        'mean_ms': round(sum(samples) / len(samples) * 1e3, 4),
+        'p50_ms': round(pick(0.50) * 1e3, 4),
+        'p90_ms': round(pick(0.90) * 1e3, 4),
+        'p99_ms': round(pick(0.99) * 1e3, 4),
+        'max_ms': round(samples[-1] * 1e3, 4),
+    }
+
+
+def benchmark(frames, warmup=20, modes=None, routine=None):
+    global Mode
+    routine = routine or draw
+    initDisplay(hidden=True)
+    load()
+
+    results = {
+        'renderer': (glGetString(GL_RENDERER) or b'').decode(errors='replace'),
+        'routine': routine.__name__,
+        'size': [Width, Height],
+        'modes': {},
+    }
+    for mode in modes or list(Modes):
+        Mode = mode
+        samples = []
+        for i in range(warmup + frames):
+            xp.Counter += 1
+            prepareFrame()
+            glFinish()
+            t0 = time.perf_counter()
+            drawFrame(routine)
+            if Mode not in (Modes.AvionicsScreen, ):
+                glFlush()
+            glFinish()
+            elapsed = time.perf_counter() - t0
+            pygame.display.flip()
+            pygame.event.pump()
+            if i >= warmup:
+                samples.append(elapsed)
+        results['modes'][mode.name] = percentiles(samples)
+
+    pygame.quit()
+    return results
+
+
+def endReplayFrame():
+    glFlush()
+    pygame.display.flip()
+    pygame.event.pump()
+
+
+def replayTrace(path, loops=1, sync=False):
+    # Replays a trace recorded with XPGLTrace.TraceRecorder (in X-Plane, or with
+    # --record here) at full speed; reports per-call-type timing histograms.
+    initDisplay(hidden=True)
+    renderer = (glGetString(GL_RENDERER) or b'').decode(errors='replace')
+    trace = XPGLTrace.TraceReader(path)
+    stats = XPGLTrace.ReplayStats()
+    objects = {}
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        XPGLTrace.replay(trace, xpgl, stats=stats, sync=glFinish if sync else None, objects=objects,
+                         beginFrame=prepareFrame, endFrame=endReplayFrame)
+    glFinish()
+    elapsed = time.perf_counter() - t0
+    pygame.quit()
+
+    frames = len(trace.frames) * loops
+    return {
+        'renderer': renderer,
+        'trace': path,
+        'frames': frames,
+        'fps': round(frames / elapsed, 2) if elapsed else None,
+        'sync': sync,
+        'calls': stats.report(),
+    }
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="OpenGL tester for xpgl draw routines")
+    parser.add_argument('--benchmark', type=int, metavar='FRAMES',
+                        help="run headless, draw FRAMES frames per mode and print timings as JSON")
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--mode', action='append', choices=[m.name for m in Modes],
+                        help="mode(s) to benchmark (default: all)")
+    parser.add_argument('--routine', default='draw',
+                        help="draw routine to benchmark: draw, draw_example1, draw_example2")
+    parser.add_argument('--labels', type=int, nargs='+',
+                        help="label counts for the draw_labels_* routines; one run per count")
+    parser.add_argument('--record', metavar='TRACE',
+                        help="record xpgl calls of every drawn frame into TRACE (relative to X-Plane root)")
+    parser.add_argument('--replay', metavar='TRACE', help="replay TRACE headless and print per-call timings")
+    parser.add_argument('--loops', type=int, default=1, help="times to replay the trace")
+    parser.add_argument('--sync', action='store_true',
+                        help="glFinish() after every replayed call to attribute GPU time per call")
+    parser.add_argument('--output', help="write JSON results to this file (relative to X-Plane root) instead of stdout")
+    args = parser.parse_args()
+
+    if args.record:
+        Recorder = XPGLTrace.TraceRecorder(args.record, xpgl)
+
+    if args.replay:
+        writeResult(replayTrace(args.replay, loops=args.loops, sync=args.sync), args.output)
+        sys.exit(0)
+
+    if args.benchmark:
+        runs = []
+        for labels in args.labels or [None]:
+            if labels is not None:
+                Data['labels'] = labels
+            run = benchmark(
+                args.benchmark,
+                warmup=args.warmup,
+                modes=[Modes[m] for m in args.mode] if args.mode else None,
+                routine=globals()[args.routine],
+            )
+            if labels is not None:
+                run['labels'] = labels
+            runs.append(run)
+        stopRecording()
+        writeResult(runs[0] if len(runs) == 1 else runs, args.output)
+        sys.exit(0)
+
     print("Hit 'q' key in window to quit.")
     print("Hit 'f' key in window 'flip' to different drawing routine.")
     print("Hit 's' key in window alter stencil vs. mask")
@@ -0,0 +1,67 @@
+'''
+Author:         Aryan Shukla
+Module Name:    XPGL retained geometry cache
+Tools Used:     Python 3.13.3, XPPython3 4.5.0, PyOpenGL
+
+Records static xpgl drawing (lines, text, circles, triangles, mask contexts...)
+once into an OpenGL display list and replays it with a single glCallList() on
+every following frame.
+
+    cache = GeometryCache()
+
+    def axes(width, height):
+        xpgl.drawLine(width / 2, 0, width / 2, height)
+        xpgl.drawLine(0, height / 2, width, height / 2)
+
+    def draw():
+        cache.draw('axes', axes, Width, Height)   # re-recorded only if Width/Height change
+
+Each entry is keyed by name; the arguments passed with it are its inputs, and
+when they differ from the recorded ones the entry is re-recorded. Anything
+that changes every frame (rotations from the cycle number, moving textures)
+should stay outside the cache.
+
+Display lists capture GL calls, not X-Plane's cached graphics state: set
+whatever xp.setGraphicsState() the shapes need before cache.draw(), exactly as
+you would before drawing them directly.
+'''
+
+from OpenGL.GL import glGenLists, glNewList, glEndList, glCallList, glDeleteLists, GL_COMPILE
+
+
+class GeometryCache:
+    def __init__(self):
+        self.entries = {}           # name -> (inputs, display list id)
+        self.recordings = 0         # number of (re)recordings, for diagnostics
+
+    def draw(self, name, fn, *args, **kwargs):
+        '''Replay `name`, recording fn(*args, **kwargs) first if it is missing or
+        its inputs changed.'''
+        inputs = (args, tuple(sorted(kwargs.items())))
+        entry = self.entries.get(name)
+
+        if entry is None or entry[0] != inputs:
+            if entry is not None:
+                glDeleteLists(entry[1], 1)
+            listId = glGenLists(1)
+            glNewList(listId, GL_COMPILE)
+            try:
+                fn(*args, **kwargs)
+            finally:
+                glEndList()
+            entry = (inputs, listId)
+            self.entries[name] = entry
+            self.recordings += 1
+
+        glCallList(entry[1])
+
+    def invalidate(self, name=None):
+        '''Drop one entry, or all of them, so they are re-recorded on next draw.'''
+        names = [name] if name is not None else list(self.entries)
+        for n in names:
+            entry = self.entries.pop(n, None)
+            if entry is not None:
+                glDeleteLists(entry[1], 1)
+
+    def release(self):
+        self.invalidate()
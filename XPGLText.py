@@ -0,0 +1,177 @@
+'''
+Author:         Aryan Shukla
+Module Name:    XPGL batched text rendering
+Tools Used:     Python 3.13.3, XPPython3 4.5.0, PyOpenGL, freetype-py, NumPy
+
+Draws many labels per frame with one texture bind and one draw call per font.
+Each font is rasterized once into a glyph atlas texture; drawText() only
+appends textured quads to a vertex array, and flush() draws everything queued
+for the frame.
+
+    text = TextBatcher()
+    font = text.loadFont('Resources/fonts/Roboto-Regular.ttf', 18)
+
+    def draw():
+        for label in labels:
+            text.drawText(font, label.x, label.y, label.text, alignment='r', color=Colors['green'])
+        text.flush()
+
+Arguments and alignment ('L' left, 'r'/'R' right, 'C' center) follow
+xpgl.drawText; (x, y) is the baseline start, and colors are xpgl.Colors
+entries (RGB or RGBA, 0-1).
+'''
+
+import numpy as np
+import freetype
+from OpenGL.GL import glTexImage2D, glTexParameteri, glPixelStorei, glEnableClientState, \
+    glDisableClientState, glVertexPointer, glTexCoordPointer, glColorPointer, glDrawArrays, \
+    GL_TEXTURE_2D, GL_ALPHA, GL_UNSIGNED_BYTE, GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, \
+    GL_LINEAR, GL_UNPACK_ALIGNMENT, GL_VERTEX_ARRAY, GL_TEXTURE_COORD_ARRAY, GL_COLOR_ARRAY, \
+    GL_FLOAT, GL_QUADS
+try:
+    from XPPython3 import xp  # type: ignore
+except ImportError:
+    from XPPython3.xpgl.mock_xp import xp  # type: ignore  # pygame harness (XPGL.py)
+
+
+class GlyphAtlas:
+    '''All printable ASCII glyphs of one font/size packed into one alpha texture.'''
+
+    def __init__(self, fontFile, size, chars=None, width=512):
+        chars = chars or [chr(c) for c in range(32, 127)]
+        face = freetype.Face(fontFile)
+        face.set_pixel_sizes(0, size)
+
+        # Rasterize, then shelf-pack left to right, top to bottom
+        bitmaps = {}
+        x = y = rowHeight = 0
+        placements = {}
+        for ch in chars:
+            face.load_char(ch, freetype.FT_LOAD_RENDER)
+            g = face.glyph
+            bmp = np.array(g.bitmap.buffer, dtype=np.uint8).reshape(g.bitmap.rows, g.bitmap.width)
+            h, w = bmp.shape
+            if x + w + 1 > width:
+                x, y, rowHeight = 0, y + rowHeight + 1, 0
+            placements[ch] = (x, y, w, h, g.bitmap_left, g.bitmap_top, g.advance.x / 64.0)
+            bitmaps[ch] = bmp
+            x += w + 1
+            rowHeight = max(rowHeight, h)
+
+        height = 1
+        while height < y + rowHeight + 1:
+            height *= 2
+        image = np.zeros((height, width), dtype=np.uint8)
+        self.index = {}             # char -> row in the arrays below
+        uvs, boxes, advances = [], [], []
+        for i, (ch, (gx, gy, w, h, left, top, advance)) in enumerate(placements.items()):
+            image[gy:gy + h, gx:gx + w] = bitmaps[ch]
+            self.index[ch] = i
+            uvs.append((gx / width, gy / height, (gx + w) / width, (gy + h) / height))
+            boxes.append((left, top - h, left + w, top))      # quad offsets from the pen position
+            advances.append(advance)
+        self.uvs = np.array(uvs, dtype=np.float32)
+        self.boxes = np.array(boxes, dtype=np.float32)
+        self.advances = np.array(advances, dtype=np.float32)
+        self.advanceOf = dict(zip(self.index, advances))
+
+        self.textureID = xp.generateTextureNumbers(1)[0]
+        xp.bindTexture2d(self.textureID, 0)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_ALPHA, width, height, 0, GL_ALPHA, GL_UNSIGNED_BYTE, image.tobytes())
+
+    def measure(self, text):
+        advanceOf = self.advanceOf
+        return sum(advanceOf[ch] for ch in text if ch in advanceOf)
+
+
+class Batch:
+    '''Strings queued for one atlas: flat glyph indices plus one entry per string.'''
+
+    def __init__(self):
+        self.glyphs = []
+        self.counts = []
+        self.origins = []
+        self.colors = []
+
+
+class TextBatcher:
+    def __init__(self):
+        self.fonts = []
+        self.batches = {}           # atlas -> Batch
+
+    def loadFont(self, fontFile, size):
+        atlas = GlyphAtlas(fontFile, size)
+        self.fonts.append(atlas)
+        return atlas
+
+    def drawText(self, font, x, y, text, alignment='L', color=(1.0, 1.0, 1.0)):
+        # Only bookkeeping here; the geometry for every queued string is built
+        # in one vectorized pass in flush().
+        index = font.index
+        glyphs = [index[ch] for ch in text if ch in index]
+        if not glyphs:
+            return
+
+        if alignment in ('r', 'R'):
+            x -= font.measure(text)
+        elif alignment in ('c', 'C'):
+            x -= font.measure(text) / 2
+
+        batch = self.batches.get(font)
+        if batch is None:
+            batch = self.batches[font] = Batch()
+        batch.glyphs.extend(glyphs)
+        batch.counts.append(len(glyphs))
+        batch.origins.append((x, y))
+        batch.colors.append(tuple(color) + (1.0,) * (4 - len(color)))
+
+    @staticmethod
+    def buildArrays(font, batch):
+        idx = np.array(batch.glyphs, dtype=np.intp)
+        counts = np.array(batch.counts, dtype=np.intp)
+        origins = np.repeat(np.array(batch.origins, dtype=np.float32), counts, axis=0)
+
+        # Pen position of each glyph: running advance, restarted at every string
+        adv = font.advances[idx]
+        run = np.cumsum(adv) - adv
+        starts = np.repeat(run[np.cumsum(counts) - counts], counts)
+        penX = origins[:, 0] + run - starts
+        penY = origins[:, 1]
+
+        box = font.boxes[idx]
+        x0, y0 = penX + box[:, 0], penY + box[:, 1]
+        x1, y1 = penX + box[:, 2], penY + box[:, 3]
+        verts = np.stack([x0, y0, x1, y0, x1, y1, x0, y1], axis=1).reshape(-1, 2)
+
+        # Atlas rows are stored top-down, so the glyph top (y1) takes v0
+        u0, v0, u1, v1 = font.uvs[idx].T
+        tex = np.stack([u0, v1, u1, v1, u1, v0, u0, v0], axis=1).reshape(-1, 2)
+
+        colors = np.repeat(np.array(batch.colors, dtype=np.float32), counts * 4, axis=0)
+        return (np.ascontiguousarray(verts, dtype=np.float32),
+                np.ascontiguousarray(tex, dtype=np.float32),
+                colors)
+
+    def flush(self):
+        '''Draw everything queued since the last flush: one draw call per font.'''
+        if not self.batches:
+            return
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for font, batch in self.batches.items():
+            verts, tex, colors = self.buildArrays(font, batch)
+            xp.bindTexture2d(font.textureID, 0)
+            glVertexPointer(2, GL_FLOAT, 0, verts)
+            glTexCoordPointer(2, GL_FLOAT, 0, tex)
+            glColorPointer(4, GL_FLOAT, 0, colors)
+            glDrawArrays(GL_QUADS, 0, len(verts))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+        self.batches.clear()
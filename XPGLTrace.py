@@ -0,0 +1,378 @@
+'''
+Author:         Aryan Shukla
+Module Name:    XPGL draw-call trace recording and replay
+Tools Used:     Python 3.13.3, XPPython3 4.5.0, PyOpenGL
+
+Record the xpgl calls a draw routine makes inside X-Plane, then replay them in
+the pygame harness (XPGL.py --replay) at full speed with per-call timings.
+
+Recording (plugin side):
+
+    recorder = TraceRecorder('Output/avionics.xpgt', xpgl)    # before loadFont/loadImage
+    ...
+    def drawCallback(...):
+        with recorder.frame():
+            draw_my_avionics()
+
+Trace format (little endian), after the b'XPGT' magic and a uint8 version:
+
+    uint8 opcode, then per opcode
+      STRING  uint32 id, uint32 length, utf-8 bytes   (interned text and kwarg names)
+      LOAD    uint16 handle, uint8 func, args           (loadFont / loadImage)
+      FRAME   uint32 frame number
+      END     -
+      CALL    uint8 func, args
+      ENTER   uint8 func, args                           (maskContext / graphicsContext)
+      EXIT    -
+    args = uint8 npos, uint8 nkw, npos values, nkw (uint32 name id, value)
+    value = tag byte + payload: f float32, i int64, b bool, n None,
+            s uint32 string id, t uint8 n + n float32, o uint16 handle
+
+At most MAX_STRINGS strings are interned at a time. When the table is full the
+least recently used string gives up its id, and a later STRING record with that
+id replaces it. Ids in version 1 traces (still readable) were uint16 and ints
+int32.
+
+The file is flushed every FLUSH_EVERY frames, so a crash loses at most that many.
+
+NumPy scalars and 1-d arrays are recorded as the equivalent Python values.
+Any other argument type raises TypeError rather than being recorded as None.
+'''
+
+import numbers
+import struct
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MAGIC = b'XPGT'
+VERSION = 2
+MAX_STRINGS = 4096
+FLUSH_EVERY = 60
+INT64 = (-1 << 63, (1 << 63) - 1)
+
+OP_STRING, OP_LOAD, OP_FRAME, OP_END, OP_CALL, OP_ENTER, OP_EXIT = range(7)
+
+# Index in this list is the on-disk function id: only append to it.
+FUNCS = ['drawLine', 'drawText', 'drawTexture', 'drawTriangle', 'drawCircle', 'drawArc',
+         'drawUnderMask', 'setRotateTransform', 'setTranslateTransform', 'drawRectangle',
+         'drawPolyLine', 'maskContext', 'graphicsContext', 'loadFont', 'loadImage']
+CONTEXTS = {'maskContext', 'graphicsContext'}
+LOADERS = {'loadFont', 'loadImage'}
+
+
+class TraceRecorder:
+    def __init__(self, path, xpgl, maxFrames=None, flushEvery=FLUSH_EVERY):
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC + struct.pack('<B', VERSION))
+        self.xpgl = xpgl
+        self.maxFrames = maxFrames
+        self.flushEvery = flushEvery
+        self.frames = 0
+        self.recording = False
+        self.strings = OrderedDict()    # text -> id, least recently used first
+        self.handles = {}           # id(object) -> handle
+        self.objects = []           # keep loaded objects alive so ids stay unique
+        self.originals = {}
+
+        for name in FUNCS:
+            fn = getattr(xpgl, name, None)
+            if fn is None:
+                continue
+            self.originals[name] = fn
+            setattr(xpgl, name, self.wrap(name, fn))
+
+    def uninstall(self):
+        for name, fn in self.originals.items():
+            setattr(self.xpgl, name, fn)
+        self.originals = {}
+
+    def close(self):
+        self.uninstall()
+        if not self.file.closed:
+            self.file.close()
+
+    # ------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------
+    def stringId(self, text):
+        sid = self.strings.get(text)
+        if sid is not None:
+            self.strings.move_to_end(text)
+            return sid
+        if len(self.strings) < MAX_STRINGS:
+            sid = len(self.strings)
+        else:
+            _, sid = self.strings.popitem(last=False)
+        self.strings[text] = sid
+        data = text.encode('utf-8')
+        self.file.write(struct.pack('<BII', OP_STRING, sid, len(data)) + data)
+        return sid
+
+    @staticmethod
+    def scalar(v):
+        '''Python bool / int / float for builtin and NumPy scalars, else v.'''
+        if isinstance(v, (bool, int, float)):
+            return v
+        if hasattr(v, 'item') and hasattr(v, 'dtype') and getattr(v, 'shape', None) == ():
+            v = v.item()            # np.float32, np.int64, np.bool_, 0-d arrays
+        if isinstance(v, bool):
+            return v
+        if isinstance(v, numbers.Integral):
+            return int(v)
+        if isinstance(v, numbers.Real):
+            return float(v)
+        return v
+
+    def value(self, v):
+        v = self.scalar(v)
+        if isinstance(v, bool):
+            return b'b' + struct.pack('<?', v)
+        if isinstance(v, int):
+            if not INT64[0] <= v <= INT64[1]:
+                raise TypeError(f"cannot record int argument {v} (outside int64)")
+            return b'i' + struct.pack('<q', v)
+        if isinstance(v, float):
+            return b'f' + struct.pack('<f', v)
+        if v is None:
+            return b'n'
+        if isinstance(v, str):
+            return b's' + struct.pack('<I', self.stringId(v))
+        if hasattr(v, 'tolist') and getattr(v, 'ndim', None) == 1:
+            v = v.tolist()          # colors / points as 1-d NumPy arrays
+        if isinstance(v, (tuple, list)):
+            items = [self.scalar(x) for x in v]
+            if all(isinstance(x, (int, float)) for x in items):
+                return b't' + struct.pack(f'<B{len(items)}f', len(items), *items)
+        handle = self.handles.get(id(v))
+        if handle is not None:
+            return b'o' + struct.pack('<H', handle)
+        # Writing None here would replay as different geometry without any error
+        raise TypeError(f"cannot record {type(v).__name__} argument {v!r} "
+                        "(fonts / images must be loaded after the TraceRecorder is created)")
+
+    def args(self, args, kwargs):
+        out = [struct.pack('<BB', len(args), len(kwargs))]
+        out += [self.value(a) for a in args]
+        for k, v in kwargs.items():
+            out.append(struct.pack('<I', self.stringId(k)) + self.value(v))
+        return b''.join(out)
+
+    # ------------------------------------------------------------
+    # Wrappers
+    # ------------------------------------------------------------
+    def wrap(self, name, fn):
+        fid = FUNCS.index(name)
+
+        if name in LOADERS:
+            def loader(*args, **kwargs):
+                obj = fn(*args, **kwargs)
+                handle = len(self.objects)
+                self.objects.append(obj)
+                self.handles[id(obj)] = handle
+                self.file.write(struct.pack('<BHB', OP_LOAD, handle, fid) + self.args(args, kwargs))
+                return obj
+            return loader
+
+        if name in CONTEXTS:
+            @contextmanager
+            def context(*args, **kwargs):
+                if self.recording:
+                    self.file.write(struct.pack('<BB', OP_ENTER, fid) + self.args(args, kwargs))
+                try:
+                    with fn(*args, **kwargs) as ctx:
+                        yield ctx
+                finally:
+                    if self.recording:
+                        self.file.write(struct.pack('<B', OP_EXIT))
+            return context
+
+        def call(*args, **kwargs):
+            if self.recording:
+                self.file.write(struct.pack('<BB', OP_CALL, fid) + self.args(args, kwargs))
+            return fn(*args, **kwargs)
+        return call
+
+    @contextmanager
+    def frame(self):
+        '''Record everything drawn inside the block as one frame.'''
+        active = self.maxFrames is None or self.frames < self.maxFrames
+        if active:
+            self.file.write(struct.pack('<BI', OP_FRAME, self.frames))
+            self.recording = True
+        try:
+            yield
+        finally:
+            if active:
+                self.recording = False
+                self.file.write(struct.pack('<B', OP_END))
+                self.frames += 1
+                if self.frames == self.maxFrames or self.frames % self.flushEvery == 0:
+                    self.file.flush()
+
+
+class TraceReader:
+    '''Parses a trace into loads [(handle, name, args, kwargs)] and frames, each
+    frame a list of (op, name, args, kwargs) with op CALL, ENTER or EXIT.
+    Object handles are returned as Handle instances to be resolved on replay.'''
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        if self.data[:4] != MAGIC:
+            raise ValueError(f"{path} is not an XPGL trace")
+        version = self.data[4]
+        if version not in (1, VERSION):
+            raise ValueError(f"{path}: unsupported trace version {version}")
+        # Version 1: uint16 string ids and lengths, int32 ints
+        self.sid, self.int = ('<H', '<i') if version == 1 else ('<I', '<q')
+        self.stringHead = '<HH' if version == 1 else '<II'
+        self.pos = 5
+        self.strings = {}
+        self.loads = []
+        self.frames = []
+        self.parse()
+
+    def read(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def value(self):
+        tag = self.data[self.pos:self.pos + 1]
+        self.pos += 1
+        if tag == b'f':
+            return self.read('<f')[0]
+        if tag == b'i':
+            return self.read(self.int)[0]
+        if tag == b'b':
+            return self.read('<?')[0]
+        if tag == b'n':
+            return None
+        if tag == b's':
+            return self.strings[self.read(self.sid)[0]]
+        if tag == b't':
+            n = self.read('<B')[0]
+            return self.read(f'<{n}f')
+        if tag == b'o':
+            return Handle(self.read('<H')[0])
+        raise ValueError(f"bad value tag {tag!r} at {self.pos - 1}")
+
+    def args(self):
+        npos, nkw = self.read('<BB')
+        args = tuple(self.value() for _ in range(npos))
+        kwargs = {}
+        for _ in range(nkw):
+            key = self.strings[self.read(self.sid)[0]]
+            kwargs[key] = self.value()
+        return args, kwargs
+
+    def parse(self):
+        frame = None
+        while self.pos < len(self.data):
+            op = self.read('<B')[0]
+            if op == OP_STRING:
+                sid, n = self.read(self.stringHead)
+                self.strings[sid] = self.data[self.pos:self.pos + n].decode('utf-8')
+                self.pos += n
+            elif op == OP_LOAD:
+                handle, fid = self.read('<HB')
+                args, kwargs = self.args()
+                self.loads.append((handle, FUNCS[fid], args, kwargs))
+            elif op == OP_FRAME:
+                self.read('<I')
+                frame = []
+            elif op == OP_END:
+                if frame is not None:
+                    self.frames.append(frame)
+                frame = None
+            elif op in (OP_CALL, OP_ENTER):
+                fid = self.read('<B')[0]
+                args, kwargs = self.args()
+                frame.append((op, FUNCS[fid], args, kwargs))
+            elif op == OP_EXIT:
+                frame.append((op, None, (), {}))
+            else:
+                raise ValueError(f"bad opcode {op} at {self.pos - 1}")
+
+
+class Handle:
+    __slots__ = ('id',)
+
+    def __init__(self, id):
+        self.id = id
+
+
+class ReplayStats:
+    '''Per call type: count, total time and a log2 histogram of microseconds.'''
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds)
+
+    def report(self):
+        out = {}
+        for name, values in sorted(self.samples.items(), key=lambda kv: -sum(kv[1])):
+            values = sorted(values)
+            hist = {}
+            for v in values:
+                us = v * 1e6
+                bucket = 1
+                while bucket < us:
+                    bucket *= 2
+                hist[f"<={bucket}us"] = hist.get(f"<={bucket}us", 0) + 1
+            out[name] = {
+                'calls': len(values),
+                'total_ms': round(sum(values) * 1e3, 3),
+                'p50_us': round(values[len(values) // 2] * 1e6, 2),
+                'p99_us': round(values[min(len(values) - 1, int(len(values) * 0.99))] * 1e6, 2),
+                'histogram': hist,
+            }
+        return out
+
+
+def replay(trace, xpgl, stats=None, sync=None, objects=None, beginFrame=None, endFrame=None):
+    '''Replay every frame of `trace` once, returning the ReplayStats.
+
+    sync: optional callable (e.g. glFinish) run after every call so GPU time is
+    attributed to the call that caused it. objects: handle -> loaded object
+    cache, reused across replays. beginFrame/endFrame: optional callables run
+    around each frame (clear, flip), not timed.'''
+    stats = stats or ReplayStats()
+    if objects is None:
+        objects = {}
+    for handle, name, args, kwargs in trace.loads:
+        if handle not in objects:
+            objects[handle] = getattr(xpgl, name)(*args, **kwargs)
+
+    def resolve(v):
+        return objects.get(v.id) if isinstance(v, Handle) else v
+
+    clock = time.perf_counter
+    for frame in trace.frames:
+        if beginFrame is not None:
+            beginFrame()
+        stack = []
+        for op, name, args, kwargs in frame:
+            if op == OP_EXIT:
+                name, ctx = stack.pop()
+                t0 = clock()
+                ctx.__exit__(None, None, None)
+            else:
+                args = tuple(resolve(a) for a in args)
+                kwargs = {k: resolve(v) for k, v in kwargs.items()}
+                t0 = clock()
+                if op == OP_ENTER:
+                    ctx = getattr(xpgl, name)(*args, **kwargs)
+                    ctx.__enter__()
+                    stack.append((name, ctx))
+                else:
+                    getattr(xpgl, name)(*args, **kwargs)
+            if sync is not None:
+                sync()
+            stats.add(name if op != OP_EXIT else name + '.exit', clock() - t0)
+        if endFrame is not None:
+            endFrame()
+    return stats
@@ -0,0 +1,187 @@
+import os
+
+import pytest
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import CoPilotIntents  # noqa: E402
+import CoPilotSpeech  # noqa: E402
+import PI_CoPilot  # noqa: E402
+
+INTENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "CoPilotIntents.json")
+
+
+@pytest.mark.parametrize("text, value", [
+    ("SET HEADING 270", 270),
+    ("HEADING TWO SEVEN ZERO", 270),
+    ("ALTITUDE TEN THOUSAND FIVE HUNDRED", 10500),
+    ("SPEED TWO FIFTY", 250),
+    ("SPEED ONE TWENTY", 120),
+    ("SPEED ONE TWENTY FIVE", 125),
+    ("SPEED TWENTY FIVE", 25),
+    ("ALTITUDE FIFTEEN HUNDRED", 1500),
+    ("VERTICAL SPEED MINUS 1500", -1500),
+    ("VERTICAL SPEED NEGATIVE 800", -800),
+    ("VERTICAL SPEED -1500", -1500),
+    ("VERTICAL SPEED MINUS ONE THOUSAND FIVE HUNDRED", -1500),
+    ("VERTICAL SPEED NEGATIVE FIVE HUNDRED", -500),
+    ("COURSE ONE ONE FIVE POINT FIVE", 115.5),
+    ("SET ALTITUDE 10,000", 10000),
+    ("ALTITUDE ONE ZERO THOUSAND", 10000),
+    ("ALTITUDE 10 THOUSAND", 10000),
+    ("VERTICAL SPEED MINUS 1,500", -1500),
+])
+def test_extract_number(text, value):
+    assert CoPilotIntents.ExtractNumber(text) == pytest.approx(value)
+
+
+def test_extract_number_none():
+    assert CoPilotIntents.ExtractNumber("GEAR UP") is None
+    assert CoPilotIntents.ExtractNumber("MINUS") is None
+
+
+@pytest.fixture
+def registry():
+    plugin = PI_CoPilot.PythonInterface()
+    registry = CoPilotIntents.IntentRegistry.Load(plugin.intent_to_command, INTENTS_PATH)
+    assert registry.Resolve() == []
+    return registry
+
+
+@pytest.mark.parametrize("clause, intent, value", [
+    ("SET HEADING 270", "SET_HEADING", 270),
+    ("HEADING TWO SEVEN ZERO", "SET_HEADING", 270),
+    ("HEADING 370", "SET_HEADING", 10),
+    ("ALTITUDE TEN THOUSAND FIVE HUNDRED", "SET_ALTITUDE", 10500),
+    ("ALTITUDE 60000", "SET_ALTITUDE", 50000),
+    ("SPEED TWO FIFTY", "SET_SPEED", 250),
+    ("AIRSPEED ONE TWENTY", "SET_SPEED", 120),
+    ("VERTICAL SPEED MINUS 1500", "SET_VERTICAL_SPEED", -1500),
+    ("VERTICAL SPEED NEGATIVE ONE THOUSAND", "SET_VERTICAL_SPEED", -1000),
+    ("SET ALTITUDE 10,000", "SET_ALTITUDE", 10000),
+    ("ALTITUDE ONE ZERO THOUSAND", "SET_ALTITUDE", 10000),
+    ("FL 10,000", "SET_ALTITUDE", 10000),
+    ("FLIGHT LEVEL THREE FIVE ZERO", "SET_ALTITUDE", 35000),
+])
+def test_match_dataref(registry, clause, intent, value):
+    matched, parsed = registry.MatchDataref(clause)
+    assert matched.name == intent
+    assert parsed == pytest.approx(value)
+
+
+def test_match_dataref_ignores_commands(registry):
+    assert registry.MatchDataref("GEAR UP") is None
+
+
+def test_execute_writes_dial(registry):
+    intent, value = registry.MatchDataref("VERTICAL SPEED MINUS 1500")
+    intent.Execute(value)
+    assert xp.getDataf(intent.ref) == -1500.0
+
+
+@pytest.fixture
+def plugin():
+    plugin = PI_CoPilot.PythonInterface()
+    plugin.XPluginStart()
+    return plugin
+
+
+def run_commands(plugin, text):
+    plugin.ExecuteCommand(text)
+    while plugin.commandLoopActive:
+        xp.RunFlightLoops(1 / 60.0)
+
+
+def test_segment_keeps_digit_groups():
+    assert PI_CoPilot.PythonInterface.NormalizeTranscript("set altitude 10,000.") == "SET ALTITUDE 10000"
+
+
+@pytest.mark.parametrize("text", [
+    "SET ALTITUDE 10,000 AND HEADING 270",
+    "FL 10,000 AND HEADING 270",
+    "ALTITUDE ONE ZERO THOUSAND, HEADING TWO SEVEN ZERO",
+])
+def test_execute_altitude_and_heading(plugin, text):
+    xp.setDataf("sim/cockpit2/autopilot/altitude_dial_ft", 0.0)
+    xp.setDataf("sim/cockpit2/autopilot/heading_dial_deg_mag_pilot", 0.0)
+    run_commands(plugin, text)
+    assert xp.getDataf("sim/cockpit2/autopilot/altitude_dial_ft") == 10000.0
+    assert xp.getDataf("sim/cockpit2/autopilot/heading_dial_deg_mag_pilot") == 270.0
+
+
+def test_keyword_lookup_prefers_longest(registry):
+    assert registry.MatchName("VERTICAL SPEED 500") == "SET_VERTICAL_SPEED"
+    assert registry.MatchName("SPEED 250") == "SET_SPEED"
+    assert registry.MatchName("GEAR UP") is None
+
+
+def test_pattern_intent_fallback():
+    registry = CoPilotIntents.IntentRegistry()
+    registry.datarefs.append(CoPilotIntents.DatarefIntent(
+        "SET_QNH", "sim/cockpit2/gauges/actuators/barometer_setting_in_hg_pilot",
+        pattern=r"\b(QNH|BARO)\b", min=28, max=31))
+    registry.Index()
+    assert registry.MatchDataref("BARO 29.92") == (registry.datarefs[0], pytest.approx(29.92))
+
+
+def test_matched_clauses_are_cached(plugin):
+    calls = []
+
+    def match(clause):
+        calls.append(clause)
+        return plugin.registry.MatchName(clause)
+
+    assert plugin.ClassifyIntents(["HEADING 270", "ALTITUDE 5000"], match=match) == ["SET_HEADING", "SET_ALTITUDE"]
+    assert plugin.ClassifyIntents(["HEADING 270"], match=match) == ["SET_HEADING"]
+    assert calls == ["HEADING 270", "ALTITUDE 5000"]
+
+
+def test_partial_clauses_run_before_release(plugin):
+    xp.setDataf("sim/cockpit2/autopilot/heading_dial_deg_mag_pilot", 0.0)
+    xp.setDataf("sim/cockpit2/autopilot/altitude_dial_ft", 0.0)
+    plugin.isRecording = True
+    plugin.StartCommandLoop()
+    plugin.OnPartial("heading two seven zero and altitude")
+    plugin.OnPartial("heading two seven zero and altitude five thousand")
+    assert plugin.partialClauses == ["HEADING TWO SEVEN ZERO"]
+    xp.RunFlightLoops(1 / 60.0)
+    assert xp.getDataf("sim/cockpit2/autopilot/heading_dial_deg_mag_pilot") == 270.0
+    assert plugin.commandLoopActive
+
+    # Key released: only the clause that was not complete yet is queued
+    plugin.isRecording = False
+    plugin.ExecuteCommand("HEADING TWO SEVEN ZERO AND ALTITUDE FIVE THOUSAND",
+                          plugin.partialClauses, plugin.partialSpoken)
+    assert len(plugin.commandQueue) == 1
+    while plugin.commandLoopActive:
+        xp.RunFlightLoops(1 / 60.0)
+    assert xp.getDataf("sim/cockpit2/autopilot/altitude_dial_ft") == 5000.0
+    assert xp.spoken[-1] == "Executing SET HEADING 270 and SET ALTITUDE 5000"
+
+
+def test_scripted_recognizer_reports_partials():
+    class Chunks:
+        sample_rate, sample_width = 16000, 2
+
+        def __init__(self):
+            self.left = 3
+
+        def Open(self):
+            pass
+
+        def Read(self):
+            self.left -= 1
+            return b"\0\0" if self.left >= 0 else b""
+
+        def Close(self):
+            pass
+
+    recognizer = CoPilotSpeech.ScriptedRecognizer(Chunks(), ["gear down and flaps"])
+    partials = []
+    recognizer.onPartial = partials.append
+    recognizer.Start()
+    recognizer.thread.join()
+    assert recognizer.Stop() == "gear down and flaps"
+    assert partials == ["gear", "gear down", "gear down and"]
@@ -0,0 +1,42 @@
+from array import array
+
+from SessionJournal import SessionJournal
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    journal = SessionJournal(str(tmp_path / 'session.journal'), capacity=4096)
+    journal.checkpoint({'active': True, 't0': 1.5}, {'time': array('d', [0.0, 0.5, 1.0])})
+    journal.checkpoint({'active': False, 't0': 2.5})
+    journal.close()
+
+    journal = SessionJournal(str(tmp_path / 'session.journal'), capacity=4096)
+    assert journal.load() == ({'active': False, 't0': 2.5}, {})
+    journal.close()
+
+
+def test_reopen_with_larger_capacity(tmp_path):
+    path = str(tmp_path / 'session.journal')
+    journal = SessionJournal(path, capacity=4096)
+    journal.checkpoint({'generation': 1}, {'x': array('d', [1.0])})
+    journal.checkpoint({'generation': 2}, {'x': array('d', [2.0, 3.0])})     # lives in region 1
+    journal.close()
+
+    journal = SessionJournal(path, capacity=1 << 16)
+    assert journal.capacity >= 1 << 16
+    assert journal.load() == ({'generation': 2}, {'x': array('d', [2.0, 3.0])})
+
+    # A larger checkpoint that "crashes" before its headers are written must
+    # leave the live payload intact
+    def crash(*args):
+        raise OSError('crash')
+
+    journal.packHeader = crash
+    try:
+        journal.checkpoint({'generation': 3}, {'x': array('d', [0.0] * 2048)})
+    except OSError:
+        pass
+    journal.close()
+
+    journal = SessionJournal(path, capacity=1 << 16)
+    assert journal.load() == ({'generation': 2}, {'x': array('d', [2.0, 3.0])})
+    journal.close()
@@ -0,0 +1,113 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      AI CoPilot release-to-command latency benchmark
+Tools Used:     Python 3.13.3, SpeechRecognition, Vosk
+
+Replays WAV recordings through each recognizer backend in CoPilotSpeech as if
+the push-to-talk key were held for the length of the recording, then measures
+the time from key release to transcript, and (with --with-commands) to the
+executed X-Plane commands (mock flight loops are stepped one 60 Hz frame at a
+time until CommandFlightLoop has run every queued action; the spacing between
+queued actions is sim time and does not add to the wall-clock figure).
+
+    python -m tools.bench_copilot_asr --wav gear_up.wav flaps_down.wav
+    python -m tools.bench_copilot_asr --wav gear_up.wav --backends vosk scripted --with-commands
+
+Recordings should be 16-bit mono, 16 kHz for Vosk.
+'''
+
+import argparse
+import json
+import os
+import time
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import CoPilotSpeech  # noqa: E402
+import PI_CoPilot  # noqa: E402
+
+FRAME = 1 / 60.0
+
+
+def Percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", nargs="+", required=True)
+    parser.add_argument("--backends", nargs="+", default=["google", "vosk", "scripted"])
+    parser.add_argument("--vosk-model", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--with-commands", action="store_true",
+                        help="load the CoPilot models and include ExecuteCommand in the latency")
+    args = parser.parse_args()
+
+    plugin = PI_CoPilot.PythonInterface()
+    if args.with_commands:
+        plugin.XPluginStart()
+        plugin.LoadModels()
+        if plugin.modelState != "READY":
+            raise SystemExit("\n".join(xp.logs))
+    vosk_model = args.vosk_model or plugin.vosk_model_path
+
+    sr = None
+    if "google" in args.backends:
+        import speech_recognition as sr
+
+    results = {}
+    for backend in args.backends:
+        release_to_text = []
+        release_to_command = []
+        errors = 0
+        for path in args.wav:
+            transcript = os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+            for _ in range(args.repeat):
+                source = CoPilotSpeech.WavFileSource(path, realtime=True)
+                try:
+                    recognizer = CoPilotSpeech.CreateRecognizer(
+                        backend, sr=sr, source=source, vosk_model_path=vosk_model, transcripts=[transcript]
+                    )
+                except Exception as e:
+                    print(f"{backend}: unavailable ({e})")
+                    break
+
+                recognizer.Start()
+                time.sleep(source.Duration())      # key held while the phrase is spoken
+
+                t0 = time.perf_counter()
+                try:
+                    text = recognizer.Stop().upper()
+                except CoPilotSpeech.RecognitionError:
+                    errors += 1
+                    continue
+                t1 = time.perf_counter()
+                release_to_text.append((t1 - t0) * 1e3)
+
+                if args.with_commands:
+                    plugin.ExecuteCommand(text)
+                    # Commands run from CommandFlightLoop; step frames until it has drained the queue
+                    while plugin.commandLoopActive:
+                        xp.RunFlightLoops(FRAME)
+                    release_to_command.append((time.perf_counter() - t0) * 1e3)
+
+        if not release_to_text:
+            continue
+        results[backend] = {
+            "n": len(release_to_text),
+            "errors": errors,
+            "release_to_text_p50_ms": round(Percentile(release_to_text, 50), 2),
+            "release_to_text_p95_ms": round(Percentile(release_to_text, 95), 2),
+        }
+        if release_to_command:
+            results[backend]["release_to_command_p50_ms"] = round(Percentile(release_to_command, 50), 2)
+            results[backend]["release_to_command_p95_ms"] = round(Percentile(release_to_command, 95), 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      AI CoPilot intent benchmark
+Tools Used:     Python 3.13.3, sentence-transformers, scikit-learn
+
+Measures latency and accuracy of PI_CoPilot.ClassifyIntent on a labeled
+utterance corpus (text,intent CSV) for three paths:
+
+    classifier  embedding + full classifier (cache and centroids disabled)
+    centroid    embedding + nearest-centroid fast path, classifier fallback
+    cached      repeated utterances served from the LRU cache
+
+Run from the PythonPlugins folder:
+
+    python -m tools.bench_copilot_intent
+    python -m tools.bench_copilot_intent --build-centroids
+
+--build-centroids writes ml_model/intent_centroids.npz (mean unit embedding
+per intent) from the corpus before benchmarking. Build from a different corpus
+than the one you evaluate on if you want an honest accuracy figure.
+'''
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import numpy as np  # noqa: E402
+import PI_CoPilot  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "copilot_utterances.csv")
+
+
+def LoadCorpus(path):
+    with open(path, newline='') as f:
+        return [(row["text"], row["intent"]) for row in csv.DictReader(f)]
+
+
+def BuildCentroids(plugin, corpus):
+    texts = [plugin.NormalizeTranscript(t) for t, _ in corpus]
+    labels = np.array([i for _, i in corpus])
+    emb = plugin.embedding_model.encode(texts, batch_size=64)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+
+    intents = sorted(set(labels))
+    centroids = np.stack([emb[labels == i].mean(axis=0) for i in intents]).astype(np.float32)
+    os.makedirs(os.path.dirname(plugin.centroids_path), exist_ok=True)
+    np.savez(plugin.centroids_path, intents=np.array(intents), centroids=centroids)
+    return intents, centroids
+
+
+def Run(plugin, corpus, repeat):
+    latencies = []
+    correct = 0
+    for _ in range(repeat):
+        for text, intent in corpus:
+            t0 = time.perf_counter()
+            predicted = plugin.ClassifyIntent(text)
+            latencies.append(time.perf_counter() - t0)
+            correct += predicted == intent
+    ms = np.array(latencies) * 1e3
+    return {
+        "n": len(latencies),
+        "accuracy": round(correct / len(latencies), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--build-centroids", action="store_true")
+    args = parser.parse_args()
+
+    plugin = PI_CoPilot.PythonInterface()
+    plugin.LoadModels()
+    if plugin.modelState != "READY":
+        raise SystemExit("\n".join(xp.logs))
+
+    corpus = LoadCorpus(args.corpus)
+    missing = sorted(set(plugin.intent_to_command) - {i for _, i in corpus})
+    if missing:
+        print(f"WARNING: corpus has no utterances for {missing}")
+
+    if args.build_centroids:
+        plugin.centroid_intents, plugin.centroids = BuildCentroids(plugin, corpus)
+    if args.threshold is not None:
+        plugin.CENTROID_THRESHOLD = args.threshold
+
+    results = {}
+    centroids = plugin.centroids
+
+    plugin.centroids = None
+    plugin.INTENT_CACHE_SIZE = 0
+    results["classifier"] = Run(plugin, corpus, args.repeat)
+
+    if centroids is not None:
+        plugin.centroids = centroids
+        results["centroid"] = Run(plugin, corpus, args.repeat)
+        vecs = plugin.embedding_model.encode([plugin.NormalizeTranscript(t) for t, _ in corpus])
+        vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+        results["centroid"]["fast_path_share"] = round(
+            float(((vecs @ centroids.T).max(axis=1) >= plugin.CENTROID_THRESHOLD).mean()), 4
+        )
+
+    plugin.INTENT_CACHE_SIZE = 256
+    plugin.intentCache.clear()
+    Run(plugin, corpus, 1)
+    results["cached"] = Run(plugin, corpus, args.repeat)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      FDR comparison benchmark
+Tools Used:     Python 3.13.3, NumPy
+
+Writes synthetic approaches to the same runway (3,000 ft to touchdown, with a
+level-off of random length and a random descent rate, so no two flights line
+up in time) and runs tools.fdr_compare on growing sets of them in both modes.
+Reports wall time, time per flight, and how much alignment narrows the
+altitude band compared with lining flights up by elapsed time.
+
+    python -m tools.bench_fdr_compare --counts 50,100,200,400 --workers 4
+'''
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from tools import fdr_compare
+from tools.fdr_files import COLUMNS, WriteFDR
+
+THRESHOLD = (47.4502, -122.3088)
+COURSE = 160.0              # final approach course, deg true
+EPOCH = 1788220800
+
+
+def SyntheticApproach(rng):
+    '''Level at 3,000 ft, descend, level off at 2,000 ft for a random time,
+    then a 3-degree-ish final to the threshold.'''
+    hold1 = int(rng.uniform(20, 60))
+    descent1 = int(rng.uniform(60, 120))
+    hold2 = int(rng.uniform(10, 90))
+    final = int(rng.uniform(180, 300))
+    alt = np.concatenate([
+        np.full(hold1, 3000.0), np.linspace(3000, 2000, descent1),
+        np.full(hold2, 2000.0), np.linspace(2000, 0, final), np.zeros(20)
+    ]) + rng.normal(0, 8, hold1 + descent1 + hold2 + final + 20)
+    n = len(alt)
+    cas = np.interp(np.arange(n), [0, n - final - 20, n - 20, n - 1],
+                    [210, 180, rng.uniform(135, 160), 60]) + rng.normal(0, 1.5, n)
+
+    # Ground track along the course, ending at the threshold at touchdown
+    gs = cas / 3600.0                                   # NM per second
+    togo = np.concatenate([np.cumsum(gs[::-1][20:])[::-1], np.zeros(20)])
+    back = math.radians(COURSE + 180)
+    lat = THRESHOLD[0] + togo / 60.0 * math.cos(back)
+    lon = THRESHOLD[1] + togo / 60.0 * math.sin(back) / math.cos(math.radians(THRESHOLD[0]))
+
+    data = np.zeros((n, len(COLUMNS)))
+    col = {c: k for k, c in enumerate(COLUMNS)}
+    data[:, col['sample']] = np.arange(n)
+    data[:, col['latitude']], data[:, col['longitude']] = lat, lon
+    data[:, col['press_altitude']] = alt
+    data[:, col['baro_altitude']] = alt
+    data[:, col['cas']] = cas
+    data[:, col['vspd']] = np.gradient(alt) * 60
+    data[:, col['mag_heading']] = COURSE + rng.normal(0, 1, n)
+    data[:, col['pitch']] = rng.normal(2, 1, n)
+    data[:, col['roll']] = rng.normal(0, 2, n)
+    data[:, col['flap']] = np.clip((2500 - alt) / 2500, 0, 1)
+    data[:, col['gear_down']] = alt < 1500
+    return data
+
+
+def AltitudeBand(flights):
+    '''Mean p5-p95 width of altitude across flights.'''
+    with np.errstate(invalid='ignore'):
+        lo, hi = np.nanpercentile(flights, [5, 95], axis=0)
+    return round(float(np.nanmean(hi - lo)), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="50,100,200,400")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.counts.split(",")]
+    rng = np.random.default_rng(args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, naive = [], []
+        for i in range(max(counts)):
+            data = SyntheticApproach(rng)
+            path = os.path.join(tmp, f"approach_{i:04d}.fdr")
+            WriteFDR(path, EPOCH + 3600 * i, data)
+            paths.append(path)
+            naive.append(data[:, COLUMNS.index('press_altitude')])
+
+        for n in counts:
+            row = {'flights': n}
+            length = max(len(a) for a in naive[:n])
+            byTime = np.full((n, length), np.nan)
+            for k, a in enumerate(naive[:n]):
+                byTime[k, :len(a)] = a
+            row['alt_band_by_time_ft'] = AltitudeBand(byTime)
+
+            for mode in ('dtw', 'distance'):
+                t0 = time.perf_counter()
+                overlay = fdr_compare.Compare(paths[:n], mode, threshold=THRESHOLD, workers=args.workers)
+                elapsed = time.perf_counter() - t0
+                row[mode] = {
+                    'seconds': round(elapsed, 2), 'ms_per_flight': round(1000 * elapsed / n, 1),
+                    'aligned': len(overlay['paths']),
+                    'alt_band_ft': AltitudeBand(overlay['params']['press_altitude']['flights']),
+                }
+            results.append(row)
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
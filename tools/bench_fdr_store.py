@@ -0,0 +1,164 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      FDR archive store benchmark
+Tools Used:     Python 3.13.3, NumPy, SQLite
+
+Builds a synthetic archive of GenFDR recordings (default 1,000 flights over
+60 days), ingests it with tools.fdr_store, re-runs ingestion to check it is
+incremental, and times a set of queries three ways:
+
+    indexed     fdr_store.Query (zone-map buckets -> sample ranges)
+    full_scan   the same filter as one SQL scan over every sample
+    reparse     reading every .fdr again with NumPy (what the archive needed
+                before the store; timed once)
+
+Indexed and full-scan results are compared row for row.
+
+    python -m tools.bench_fdr_store --flights 1000 --samples 1800 --workers 4
+'''
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from tools import fdr_store
+from tools.fdr_files import COLUMNS, SAMPLE_PERIOD, ReadFDR, SyntheticFlight, WriteFDR
+
+DAY = 86400
+EPOCH = 1788220800          # 2026-09-01 00:00 UTC
+
+QUERIES = {
+    # "all approaches below 1,000 ft with CAS > 160 kt across the last month"
+    'fast_approach_month': dict(start=EPOCH + 30 * DAY, end=EPOCH + 60 * DAY,
+                                where=[('press_altitude', '<', 1000), ('cas', '>', 160)]),
+    'one_day_all_samples': dict(start=EPOCH + 10 * DAY, end=EPOCH + 11 * DAY,
+                                columns=['press_altitude', 'cas']),
+    'steep_descent_any_time': dict(where=[('vspd', '<', -5500)]),
+    'tail_low_alt': dict(tail='N00007', where=[('press_altitude', '<', 500)]),
+}
+
+
+def BuildArchive(folder, flights, samples, seed):
+    rng = np.random.default_rng(seed)
+    pick = random.Random(seed)
+    for i in range(flights):
+        start = EPOCH + int(pick.uniform(0, 60 * DAY))
+        data = SyntheticFlight(rng, samples)
+        acft = pick.choice(['Aircraft/Laminar Research/Airbus A330-300/A330.acf',
+                            'Aircraft/Laminar Research/Boeing 737-800/b738.acf'])
+        WriteFDR(os.path.join(folder, f"flight_{i:05d}.fdr"), start, data, acft, f"N{pick.randrange(20):05d}")
+
+
+def FullScan(db, start=None, end=None, where=(), acft=None, tail=None, columns=None):
+    columns = list(columns or dict.fromkeys(p for p, _, _ in where)) or ['press_altitude']
+    ts = f"(f.t_start + s.sample * {SAMPLE_PERIOD})"
+    cond, args = [], []
+    if start is not None:
+        cond.append(f"{ts} >= ?")
+        args.append(start)
+    if end is not None:
+        cond.append(f"{ts} < ?")
+        args.append(end)
+    for p, op, v in where:
+        cond.append(f"s.{p} {op} ?")
+        args.append(v)
+    if tail is not None:
+        cond.append("f.tail = ?")
+        args.append(tail)
+    sql = f"""
+        SELECT s.flight_id, {ts}, {', '.join('s.' + c for c in columns)}
+        FROM samples s NOT INDEXED JOIN flights f ON f.id = s.flight_id
+        WHERE {' AND '.join(cond) or '1'} ORDER BY s.flight_id, s.sample
+    """
+    return db.execute(sql, args).fetchall()
+
+
+def Reparse(folder, start=None, end=None, where=(), tail=None, **_):
+    ops = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+    hits = 0
+    for name in sorted(os.listdir(folder)):
+        meta, data = ReadFDR(os.path.join(folder, name))
+        if tail is not None and meta.get('TAIL') != tail:
+            continue
+        ts = meta['start'] + data[:, 0] * SAMPLE_PERIOD
+        mask = np.ones(len(data), bool)
+        if start is not None:
+            mask &= ts >= start
+        if end is not None:
+            mask &= ts < end
+        for p, op, v in where:
+            mask &= ops[op](data[:, COLUMNS.index(p)], v)
+        hits += int(mask.sum())
+    return hits
+
+
+def Timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return result, {'p50_ms': round(1000 * times[len(times) // 2], 2),
+                    'p95_ms': round(1000 * times[min(len(times) - 1, int(0.95 * len(times)))], 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flights", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=1800, help="samples (seconds) per flight")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", help="keep the archive and store here instead of a temp dir")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.dir or tmp
+        folder = os.path.join(root, 'fdr_files')
+        os.makedirs(folder, exist_ok=True)
+        report = {'flights': args.flights, 'samples_per_flight': args.samples}
+
+        t0 = time.perf_counter()
+        BuildArchive(folder, args.flights, args.samples, args.seed)
+        report['build_s'] = round(time.perf_counter() - t0, 2)
+
+        db = fdr_store.Connect(os.path.join(root, 'fdr.sqlite'))
+        report['ingest'] = fdr_store.Ingest(db, folder, args.workers, log=None)
+        report['reingest_unchanged'] = fdr_store.Ingest(db, folder, args.workers, log=None)
+
+        changed = sorted(os.listdir(folder))[:10]
+        rng = np.random.default_rng(args.seed + 1)
+        for name in changed:
+            meta, _ = ReadFDR(os.path.join(folder, name))
+            WriteFDR(os.path.join(folder, name), meta['start'], SyntheticFlight(rng, args.samples),
+                     meta['ACFT'], meta['TAIL'])
+        report['reingest_10_changed'] = fdr_store.Ingest(db, folder, args.workers, log=None)
+        report['db_mb'] = round(os.path.getsize(os.path.join(root, 'fdr.sqlite')) / 1e6, 1)
+
+        report['queries'] = {}
+        for name, q in QUERIES.items():
+            (_, rows), indexed = Timed(lambda: fdr_store.Query(db, **q), args.repeat)
+            scanRows, scan = Timed(lambda: FullScan(db, **q), max(1, args.repeat // 5))
+            report['queries'][name] = {
+                'rows': len(rows), 'flights': len({r[0] for r in rows}),
+                'indexed': indexed, 'full_scan': scan, 'match': rows == scanRows,
+            }
+
+        q = QUERIES['fast_approach_month']
+        hits, reparse = Timed(lambda: Reparse(folder, **q), 1)
+        report['queries']['fast_approach_month']['reparse'] = reparse
+        report['queries']['fast_approach_month']['reparse_match'] = \
+            hits == report['queries']['fast_approach_month']['rows']
+        db.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
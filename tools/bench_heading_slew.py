@@ -0,0 +1,137 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      Autopilot Target Controller slew benchmark
+Tools Used:     Python 3.13.3
+
+Drives PI_CustomCommand against tools.mock_xp and records, per slew mode,
+the time to reach the target, the number of flight-loop callbacks and the
+final dial error. The mock's up/down commands move each dial by one step like
+the sim does. Scenarios:
+
+    heading     random heading start/target pairs, one dial at a time
+    all_dials   all five dials slewing at once from the one flight loop
+    retarget    heading target changed half way through every slew
+
+    python -m tools.bench_heading_slew --pairs 500 --fps 30
+'''
+
+import argparse
+import json
+import random
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import PI_CustomCommand  # noqa: E402
+
+RANGES = {
+    "heading": (0, 360),
+    "course": (0, 360),
+    "altitude": (0, 40000),
+    "speed": (100, 350),
+    "vertical_speed": (-4000, 4000),
+}
+
+
+def Summary(values):
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * (len(values) - 1)))]  # noqa: E731
+    return {"mean": round(sum(values) / len(values), 3), "p50": round(pick(0.5), 3),
+            "p95": round(pick(0.95), 3), "max": round(values[-1], 3)}
+
+
+def Nudge(dial, sign):
+    def handler(cmdRef, phase, refcon):
+        if phase == xp.CommandBegin:
+            value = xp.datarefs[dial.dialDR] + sign * dial.step
+            xp.datarefs[dial.dialDR] = value % dial.wrap if dial.wrap else value
+        return 1
+    return handler
+
+
+def Error(dial):
+    err = xp.datarefs[dial.dialDR] - dial.target
+    if dial.wrap:
+        err = (err + dial.wrap / 2) % dial.wrap - dial.wrap / 2
+    return abs(err)
+
+
+def RunUntilIdle(plugin, dt):
+    t0 = xp.simTime
+    calls = 0
+    while plugin.flightLoopActive:
+        calls += xp.RunFlightLoops(dt)
+    return xp.simTime - t0, calls
+
+
+def Quantize(dial, value):
+    return round(value / dial.step) * dial.step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    dt = 1.0 / args.fps
+    results = {}
+
+    for mode in ("command", "dataref"):
+        plugin = PI_CustomCommand.PythonInterface()
+        plugin.SLEW_MODE = mode
+        plugin.XPluginStart()
+        for dial in plugin.dials.values():
+            xp.registerCommandHandler(dial.upCmd, Nudge(dial, +1))
+            xp.registerCommandHandler(dial.downCmd, Nudge(dial, -1))
+
+        heading = plugin.dials["heading"]
+        times, calls, errors = [], [], []
+        for _ in range(args.pairs):
+            xp.datarefs[heading.dialDR] = float(rng.randrange(360))
+            xp.setDataf("vimaan/autopilot/heading_target", float(rng.randrange(360)))
+            t, n = RunUntilIdle(plugin, dt)
+            times.append(t)
+            calls.append(n)
+            errors.append(Error(heading))
+        results[f"{mode}/heading"] = {"time_to_target_s": Summary(times), "callbacks": Summary(calls),
+                                      "final_error": Summary(errors)}
+
+        times, calls, errors = [], [], []
+        for _ in range(args.pairs):
+            for name, dial in plugin.dials.items():
+                lo, hi = RANGES[name]
+                xp.datarefs[dial.dialDR] = Quantize(dial, rng.uniform(lo, hi))
+                xp.setDataf(f"vimaan/autopilot/{name}_target", Quantize(dial, rng.uniform(lo, hi)))
+            t, n = RunUntilIdle(plugin, dt)
+            times.append(t)
+            calls.append(n)
+            errors.append(max(Error(d) for d in plugin.dials.values()))
+        results[f"{mode}/all_dials"] = {"time_to_target_s": Summary(times), "callbacks": Summary(calls),
+                                        "final_error": Summary(errors)}
+
+        times, calls, errors = [], [], []
+        for _ in range(args.pairs):
+            xp.datarefs[heading.dialDR] = float(rng.randrange(360))
+            xp.setDataf("vimaan/autopilot/heading_target", float(rng.randrange(360)))
+            n = 0
+            for _ in range(int(0.5 / dt)):
+                n += xp.RunFlightLoops(dt)
+            xp.setDataf("vimaan/autopilot/heading_target", float(rng.randrange(360)))
+            t, m = RunUntilIdle(plugin, dt)
+            times.append(t)
+            calls.append(n + m)
+            errors.append(Error(heading))
+        results[f"{mode}/retarget"] = {"time_after_retarget_s": Summary(times), "callbacks": Summary(calls),
+                                       "final_error": Summary(errors)}
+
+        plugin.XPluginStop()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      ParaViz layout frame-time benchmark
+Tools Used:     Python 3.13.3, PyQt5, pyqtgraph, NumPy
+
+Opens the ParaViz PlotterWindow off screen with N synthetic parameters (all
+selected), fills the shared buffer with a history of samples, then times
+frames in the overlay and the stacked layout. A frame is one UpdatePlot()
+with a new sample plus a synchronous repaint of the window. The stacked run
+also scrolls to the bottom half way through, so culled panes are redrawn
+as they come into view.
+
+    python -m tools.bench_paraviz_layout --params 20 --history 3600 --frames 200
+'''
+
+import argparse
+import json
+import math
+import os
+import time
+from queue import Queue
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from PyQt5 import QtWidgets  # noqa: E402
+from ParaVizWindow import PlotterWindow  # noqa: E402
+
+
+def Sample(names, t):
+    return {p: 100 * math.sin(0.01 * t * (k + 1)) + k for k, p in enumerate(names)}
+
+
+def Run(app, layout, names, history, frames):
+    q = Queue()
+    window = PlotterWindow(q, list(names), notifyStop=lambda: None, layout=layout)
+    window.timer.stop()
+    window.resize(1600, 900)
+    window.show()
+    for cb in window.checkboxes.values():
+        cb.setChecked(True)
+    app.processEvents()
+
+    t0 = window.t0
+    for t in range(history):
+        window.time.append(float(t))
+        for p, v in Sample(names, t).items():
+            window.data[p].append(v)
+
+    times, draw = [], []
+    for f in range(frames):
+        if layout == "stacked" and f == frames // 2:
+            bar = window.stackScroll.verticalScrollBar()
+            bar.setValue(bar.maximum())
+        q.put((t0 + history + f, Sample(names, history + f)))
+        start = time.perf_counter()
+        window.UpdatePlot()
+        window.repaint()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+        draw.append(window.frameTimes[-1])
+
+    visible = sum(1 for pane in window.panes.values() if not pane.visibleRegion().isEmpty())
+    window.isClosing = True
+    window.close()
+    ms = np.array(times) * 1e3
+    return {
+        "frame_mean_ms": round(float(ms.mean()), 2), "frame_p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "update_mean_ms": round(1e3 * float(np.mean(draw)), 2),
+        "panes": len(window.panes), "panes_visible_at_end": visible,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=20)
+    parser.add_argument("--history", type=int, default=3600)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    names = [f"P{k:02d}" for k in range(args.params)]
+    report = {"params": args.params, "history": args.history}
+    for layout in ("overlay", "stacked"):
+        report[layout] = Run(app, layout, names, args.history, args.frames)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      Plugin startup benchmark
+Tools Used:     Python 3.13.3
+
+Measures what each plugin costs X-Plane at load: module import time and
+PythonInterface() + XPluginStart() time, against tools.mock_xp. Every plugin
+is measured in a fresh interpreter so imports are cold; --repeat takes the
+median of several runs.
+
+    python -m tools.bench_startup
+    python -m tools.bench_startup --enable --repeat 5 PI_ParaViz.py PI_CoPilot.py
+
+--enable also times XPluginEnable() (background preloaders only start there).
+If PythonInterface() or XPluginStart() raises, the import time is still
+reported, with the error and start_ms up to the failure.
+--tree imports the plugins from another checkout (still against this tree's
+mock_xp), e.g. to compare with an older commit:
+
+    git worktree add /tmp/before <commit>
+    python -m tools.bench_startup --tree /tmp/before --repeat 5 PI_ParaViz.py
+'''
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, sys, time
+sys.path.insert(0, {root!r})
+from tools import mock_xp
+sys.path.remove({root!r})
+sys.path.insert(0, {tree!r})
+xp = mock_xp.install()
+t0 = time.perf_counter()
+module = __import__({module!r})
+t1 = time.perf_counter()
+result = {{"import_ms": (t1 - t0) * 1e3, "modules": len(sys.modules)}}
+try:
+    plugin = module.PythonInterface()
+    plugin.XPluginStart()
+    t2 = time.perf_counter()
+    if {enable!r}:
+        plugin.XPluginEnable()
+    t3 = time.perf_counter()
+    result.update(start_ms=(t2 - t1) * 1e3, enable_ms=(t3 - t2) * 1e3, modules=len(sys.modules))
+except Exception as e:
+    # Keep the import time: a plugin that needs hardware or model files still
+    # shows what its imports cost
+    result.update(start_ms=(time.perf_counter() - t1) * 1e3, error=f"{{type(e).__name__}}: {{e}}")
+print(json.dumps(result))
+'''
+
+
+def Probe(module, enable, tree=ROOT):
+    code = PROBE.format(root=ROOT, tree=tree, module=module, enable=enable)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=tree, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("plugins", nargs="*", help="plugin files (default: PI_*.py and xPI_*.py)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--enable", action="store_true")
+    parser.add_argument("--tree", default=ROOT, help="checkout to import the plugins from (default: this one)")
+    args = parser.parse_args()
+
+    tree = os.path.abspath(args.tree)
+    files = args.plugins or sorted(glob.glob(os.path.join(tree, "PI_*.py")) + glob.glob(os.path.join(tree, "xPI_*.py")))
+    results = {}
+    for path in files:
+        module = os.path.splitext(os.path.basename(path))[0]
+        runs = [Probe(module, args.enable, tree) for _ in range(args.repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        timed = [r for r in runs if "import_ms" in r]
+        if not timed:
+            results[module] = {"error": errors[0]}
+            continue
+        results[module] = {
+            key: round(sorted(r[key] for r in timed)[len(timed) // 2], 3)
+            for key in ("import_ms", "start_ms", "enable_ms", "modules") if all(key in r for r in timed)
+        }
+        if errors:
+            # start_ms is then the time until PythonInterface() / XPluginStart() failed
+            results[module]["error"] = errors[0]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      GenFDR traffic logging benchmark
+Tools Used:     Python 3.13.3, NumPy
+
+Drives xPI_GenerateFDR's traffic mode against tools.mock_xp with 1 to 63
+traffic aircraft and reports the per-sample cost of reading them. The same
+fields are also read the per-scalar way (one getDataf per aircraft per
+field, as the legacy sim/multiplayer/position/planeN_* datarefs need) for
+comparison. The sidecar file is read back and checked row for row.
+
+    python -m tools.bench_traffic_log --samples 2000
+'''
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import xPI_GenerateFDR  # noqa: E402
+from TrafficLog import ReadTraffic  # noqa: E402
+
+
+def FillTraffic(plugin, n, rng):
+    slots = plugin.MAX_TRAFFIC
+    xp.datarefs[plugin.traffic_count_dataref] = n + 1
+    xp.datarefs[plugin.traffic_id_dataref] = [0] + [0xA00000 + i for i in range(slots - 1)]
+    for ref in plugin.traffic_datarefs.values():
+        xp.datarefs[ref] = [rng.uniform(-180, 180) for _ in range(slots)]
+
+
+def PerScalar(plugin, n):
+    refs = [[f"{ref}[{i}]" for ref in plugin.traffic_datarefs.values()] for i in range(1, n + 1)]
+    for row in refs:
+        for ref in row:
+            xp.datarefs[ref] = 0.0
+
+    def read():
+        return [[xp.getDataf(ref) for ref in row] for row in refs]
+    return read
+
+
+def Timed(fn, samples):
+    times = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return {"mean_us": round(1e6 * sum(times) / len(times), 2),
+            "p95_us": round(1e6 * times[int(0.95 * (len(times) - 1))], 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--counts", default="1,8,16,32,60,63")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(c) for c in args.counts.split(",")]:
+            xp.flightLoops.clear()
+            plugin = xPI_GenerateFDR.PythonInterface()
+            plugin.output_dir = os.path.join(tmp, str(n))
+            os.mkdir(plugin.output_dir)
+            plugin.XPluginStart()
+            plugin.logTraffic = True
+            FillTraffic(plugin, n, rng)
+            plugin.StartLogging()
+
+            sample = iter(range(1 << 30))
+            vectorized = Timed(lambda: plugin.SampleTraffic(next(sample)), args.samples)
+            scalar = Timed(PerScalar(plugin, n), args.samples)
+
+            path = plugin.traffic.path
+            plugin.StopLogging()
+            plugin.XPluginStop()
+
+            cols = ReadTraffic(path)
+            lat = xp.datarefs[plugin.traffic_datarefs['lat']][1:n + 1]
+            ok = (len(cols['id']) == n * args.samples
+                  and list(cols['id'][:n]) == list(range(0xA00000, 0xA00000 + n))
+                  and all(abs(a - b) < 1e-4 for a, b in zip(cols['lat'][-n:], lat)))
+            results.append({"aircraft": n, "vectorized": vectorized, "per_scalar": scalar,
+                            "rows": int(len(cols['id'])), "file_bytes": os.path.getsize(path),
+                            "roundtrip_ok": ok})
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
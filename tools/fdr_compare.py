@@ -0,0 +1,293 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      FDR flight-to-flight comparison
+Tools Used:     Python 3.13.3, NumPy (PyQt5 + pyqtgraph for --show)
+
+Lines up the approach segment of many GenFDR recordings and computes
+per-parameter deviation bands across them, e.g. to compare technique over
+repeated flights of the same approach.
+
+Alignment modes:
+
+    distance    resample every flight onto a distance-to-threshold grid
+                (--threshold LAT,LON, from --max-nm down to 0)
+    dtw         align every flight to a reference flight by banded dynamic
+                time warping on pressure altitude, from --from-alt down to
+                touchdown; the reference is the median-length approach
+
+Each flight is only aligned against the reference (N pairs, not N^2), in a
+process pool, so the cost grows linearly with the number of flights.
+
+    python -m tools.fdr_compare fdr_files/ --mode dtw --output approach.npz
+    python -m tools.fdr_compare fdr_files/ --mode distance --threshold 47.4502,-122.3088 --show
+    python -m tools.fdr_compare --load approach.npz --show
+
+The .npz overlay holds the common x axis and, per parameter, the mean,
+p5 / p95 band and every aligned flight; ParaViz's PlotterWindow.ShowOverlay()
+displays it.
+'''
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tools.fdr_files import COLUMNS, ReadFDR
+
+PARAMS = ['press_altitude', 'cas', 'vspd', 'pitch', 'roll', 'mag_heading', 'flap']
+BAND_FRACTION = 0.1         # Sakoe-Chiba radius as a fraction of segment length
+EARTH_NM = 3440.065
+
+
+# ============================================================
+# Segments
+# ============================================================
+def ApproachSegment(data, fromAlt):
+    '''Rows from the last time the aircraft was at or above `fromAlt` down to
+    touchdown (first sample within 20 ft of the lowest altitude after that).'''
+    alt = data[:, COLUMNS.index('press_altitude')]
+    above = np.flatnonzero(alt >= fromAlt)
+    if len(above) == 0:
+        return None
+    start = above[-1]
+    tail = alt[start:]
+    end = start + int(np.flatnonzero(tail <= tail.min() + 20)[0])
+    return data[start:end + 1] if end - start >= 10 else None
+
+
+def DistanceNM(data, lat, lon):
+    la = np.radians(data[:, COLUMNS.index('latitude')])
+    lo = np.radians(data[:, COLUMNS.index('longitude')])
+    la0, lo0 = np.radians(lat), np.radians(lon)
+    h = np.sin((la - la0) / 2) ** 2 + np.cos(la) * np.cos(la0) * np.sin((lo - lo0) / 2) ** 2
+    return 2 * EARTH_NM * np.arcsin(np.sqrt(h))
+
+
+# ============================================================
+# Alignment
+# ============================================================
+def BandedDTW(ref, sig, band=BAND_FRACTION):
+    '''Warping path between `ref` (length m) and `sig` (length n) restricted to
+    a Sakoe-Chiba band around the diagonal. Cells are filled one
+    anti-diagonal at a time, each as a single NumPy step. Returns
+    (i, j) index arrays into sig and ref.'''
+    n, m = len(sig), len(ref)
+    slope = m / n
+    radius = max(int(band * max(n, m)), int(np.ceil(slope)) + 1)
+    D = np.full((n + 1, m + 1), np.inf)
+    D[0, 0] = 0.0
+    step = np.zeros((n + 1, m + 1), np.int8)     # 0 diagonal, 1 up, 2 left
+
+    for k in range(2, n + m + 1):
+        i = np.arange(max(1, k - m), min(n, k - 1) + 1)
+        j = k - i
+        keep = np.abs(j - i * slope) <= radius
+        i, j = i[keep], j[keep]
+        if len(i) == 0:
+            continue
+        prev = np.stack((D[i - 1, j - 1], D[i - 1, j], D[i, j - 1]))
+        best = prev.argmin(axis=0)
+        D[i, j] = np.abs(sig[i - 1] - ref[j - 1]) + prev[best, np.arange(len(i))]
+        step[i, j] = best
+
+    # Walk back from the corner; the path is at most n + m long
+    path = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        path.append((i - 1, j - 1))
+        s = step[i, j]
+        if s == 0:
+            i, j = i - 1, j - 1
+        elif s == 1:
+            i -= 1
+        else:
+            j -= 1
+    path = np.array(path[::-1])
+    return path[:, 0], path[:, 1]
+
+
+def WarpToReference(values, i, j, m):
+    '''Average the flight rows matched to each reference index.'''
+    counts = np.bincount(j, minlength=m)
+    out = np.empty((m, values.shape[1]))
+    for c in range(values.shape[1]):
+        out[:, c] = np.bincount(j, weights=values[i, c], minlength=m)
+    return out / np.maximum(counts, 1)[:, None]
+
+
+# ============================================================
+# Workers (one call per flight; the reference is set once per process)
+# ============================================================
+Job = {}
+
+
+def InitWorker(job):
+    Job.clear()
+    Job.update(job)
+
+
+def AlignFlight(path):
+    _, data = ReadFDR(path)
+    cols = [COLUMNS.index(p) for p in Job['params']]
+
+    if Job['mode'] == 'distance':
+        d = DistanceNM(data, *Job['threshold'])
+        end = int(np.argmin(d))
+        out = np.flatnonzero(d[:end + 1] > Job['max_nm'])
+        start = out[-1] if len(out) else 0
+        seg = data[start:end + 1]
+        dist = np.minimum.accumulate(d[start:end + 1])      # monotonic toward the runway
+        if len(seg) < 10:
+            return path, None
+        # np.interp wants increasing x, so run it from the runway outwards
+        aligned = np.column_stack([
+            np.interp(Job['grid'], dist[::-1], seg[::-1, c], left=np.nan, right=np.nan)
+            for c in cols
+        ])
+        return path, aligned
+
+    seg = ApproachSegment(data, Job['from_alt'])
+    if seg is None:
+        return path, None
+    alt = seg[:, COLUMNS.index('press_altitude')]
+    i, j = BandedDTW(Job['reference'], alt, Job['band'])
+    return path, WarpToReference(seg[:, cols], i, j, len(Job['reference']))
+
+
+# ============================================================
+# Comparison
+# ============================================================
+def Compare(paths, mode='dtw', params=PARAMS, threshold=None, maxNM=10.0, stepNM=0.05,
+            fromAlt=3000.0, band=BAND_FRACTION, reference=None, workers=None):
+    '''Align `paths` and return the overlay dict (see module docstring).
+    Raises ValueError if none of them can be aligned.'''
+    job = {'mode': mode, 'params': list(params), 'band': band, 'from_alt': fromAlt}
+    if mode == 'distance':
+        if threshold is None:
+            raise ValueError("distance mode needs threshold=(lat, lon)")
+        job.update(threshold=tuple(threshold), max_nm=maxNM, grid=np.arange(0.0, maxNM + 1e-9, stepNM))
+        x, xlabel = job['grid'], 'Distance to threshold (NM)'
+    else:
+        if reference is None:
+            reference = MedianApproach(paths, fromAlt)
+        seg = ApproachSegment(ReadFDR(reference)[1], fromAlt)
+        job['reference'] = seg[:, COLUMNS.index('press_altitude')]
+        x, xlabel = np.arange(len(seg), dtype=float), f'Reference time (s) from {fromAlt:.0f} ft'
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=InitWorker, initargs=(job,)) as pool:
+        results = [r for r in pool.map(AlignFlight, paths, chunksize=8) if r[1] is not None]
+    if not results:
+        raise ValueError(f"none of the {len(paths)} flights could be aligned ({mode} mode)")
+
+    flights = np.stack([a for _, a in results])         # [N, len(x), P]
+    overlay = {'x': x, 'xlabel': xlabel, 'invert_x': mode == 'distance',
+               'paths': [p for p, _ in results], 'reference': reference, 'params': {}}
+    with np.errstate(invalid='ignore'):
+        for k, p in enumerate(params):
+            f = flights[:, :, k]
+            mean = np.nanmean(f, axis=0)
+            std = np.nanstd(f, axis=0)
+            lo, mid, hi = np.nanpercentile(f, [5, 50, 95], axis=0)
+            # RMS deviation from the mean, in units of the local spread
+            score = np.sqrt(np.nanmean(((f - mean) / np.where(std > 0, std, np.nan)) ** 2, axis=1))
+            overlay['params'][p] = {'mean': mean, 'std': std, 'lo': lo, 'median': mid, 'hi': hi,
+                                    'flights': f, 'score': score}
+    return overlay
+
+
+def MedianApproach(paths, fromAlt):
+    lengths = []
+    for path in paths:
+        seg = ApproachSegment(ReadFDR(path)[1], fromAlt)
+        if seg is not None:
+            lengths.append((len(seg), path))
+    if not lengths:
+        raise ValueError(f"no flight descends through {fromAlt} ft")
+    lengths.sort()
+    return lengths[len(lengths) // 2][1]
+
+
+def SaveOverlay(path, overlay):
+    arrays = {'x': overlay['x']}
+    for p, d in overlay['params'].items():
+        arrays.update({f"{p}/{k}": v for k, v in d.items()})
+    meta = {k: overlay[k] for k in ('xlabel', 'invert_x', 'paths', 'reference')}
+    meta['params'] = list(overlay['params'])
+    np.savez_compressed(path, __meta__=json.dumps(meta), **arrays)
+
+
+def LoadOverlay(path):
+    z = np.load(path)
+    meta = json.loads(str(z['__meta__']))
+    overlay = {k: meta[k] for k in ('xlabel', 'invert_x', 'paths', 'reference')}
+    overlay['x'] = z['x']
+    overlay['params'] = {
+        p: {k.split('/', 1)[1]: z[k] for k in z.files if k.startswith(p + '/')}
+        for p in meta['params']
+    }
+    return overlay
+
+
+def Show(overlay):
+    from queue import Queue
+    from PyQt5 import QtWidgets
+    from ParaVizWindow import PlotterWindow
+
+    app = QtWidgets.QApplication([])
+    window = PlotterWindow(Queue(), list(overlay['params']), notifyStop=lambda: None)
+    window.setWindowTitle(f"ParaViz - {len(overlay['paths'])} flights")
+    window.ShowOverlay(overlay)
+    window.show()
+    app.exec_()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', help='.fdr files or folders')
+    parser.add_argument('--mode', choices=['dtw', 'distance'], default='dtw')
+    parser.add_argument('--threshold', help='runway threshold "LAT,LON" (distance mode)')
+    parser.add_argument('--max-nm', type=float, default=10.0)
+    parser.add_argument('--step-nm', type=float, default=0.05)
+    parser.add_argument('--from-alt', type=float, default=3000.0)
+    parser.add_argument('--band', type=float, default=BAND_FRACTION)
+    parser.add_argument('--reference', help='reference .fdr (dtw mode; default median-length approach)')
+    parser.add_argument('--params', nargs='*', default=PARAMS)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--output', help='save the overlay as .npz')
+    parser.add_argument('--load', help='show / report a saved overlay instead of computing one')
+    parser.add_argument('--show', action='store_true', help='open the overlay in the ParaViz window')
+    args = parser.parse_args()
+
+    if args.load:
+        overlay = LoadOverlay(args.load)
+    else:
+        paths = []
+        for item in args.inputs:
+            if os.path.isdir(item):
+                paths += [os.path.join(root, name) for root, _, names in os.walk(item)
+                          for name in names if name.endswith('.fdr')]
+            else:
+                paths.append(item)
+        paths.sort()
+        threshold = [float(v) for v in args.threshold.split(',')] if args.threshold else None
+        t0 = time.perf_counter()
+        overlay = Compare(paths, args.mode, args.params, threshold, args.max_nm, args.step_nm,
+                          args.from_alt, args.band, args.reference, args.workers)
+        print(f"# aligned {len(overlay['paths'])}/{len(paths)} flights in {time.perf_counter() - t0:.2f}s")
+        if args.output:
+            SaveOverlay(args.output, overlay)
+
+    # Flights furthest from the pack first
+    scores = np.nanmean([d['score'] for d in overlay['params'].values()], axis=0)
+    for k in np.argsort(-scores)[:10]:
+        print(json.dumps({'path': overlay['paths'][k], 'score': round(float(scores[k]), 3)}))
+
+    if args.show:
+        Show(overlay)
+
+
+if __name__ == "__main__":
+    main()
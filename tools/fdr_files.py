@@ -0,0 +1,119 @@
+'''
+Author:         Aryan Shukla
+Module Name:    GenFDR file reader / synthetic writer
+Tools Used:     Python 3.13.3, NumPy
+
+Reads the .fdr files written by xPI_GenerateFDR into a metadata dict and a
+NumPy array (one row per sample), and writes synthetic recordings in the same
+format for benchmarks.
+
+    meta, data = ReadFDR('[FDR]_01-10-2026_14-05-00.fdr')
+    alt = data[:, COLUMNS.index('press_altitude')]
+'''
+
+import calendar
+import datetime
+import math
+
+import numpy as np
+
+# DATA row layout written by GenFDR: the sample counter, then its datarefs in
+# declaration order. (The COMM line in the file header omits CAS, so the
+# layout is taken from here rather than from the file.)
+COLUMNS = [
+    'sample', 'longitude', 'latitude', 'press_altitude', 'mag_heading', 'pitch', 'roll',
+    'baro_altitude', 'cas', 'vspd', 'slat', 'flap', 'gear_down'
+]
+SAMPLE_PERIOD = 1.0         # GenFDR's sampling_rate
+
+
+def StartTime(date, time):
+    '''GenFDR's DATE (dd-mm-YYYY) and TIME (HH-MM-SS) as seconds since the
+    epoch, reading the sim's wall clock as if it were UTC.'''
+    dt = datetime.datetime.strptime(f"{date} {time}", '%d-%m-%Y %H-%M-%S')
+    return calendar.timegm(dt.timetuple())
+
+
+def ReadFDR(path):
+    '''Return (meta, data). meta holds ACFT, TAIL, DATE, TIME, the derived
+    'start' timestamp and the DREF list; data is float64 [nsamples, len(COLUMNS)].
+    A torn final line (crash while logging) is dropped.'''
+    with open(path, 'r', errors='replace') as f:
+        text = f.read()
+
+    meta = {'DREF': []}
+    rows = []
+    for line in text.splitlines():
+        if line.startswith('DATA,'):
+            rows.append(line[5:])
+            continue
+        key, sep, value = line.partition(',')
+        if not sep:
+            continue
+        if key == 'DREF':
+            meta['DREF'].append(value.split()[0])
+        elif key in ('ACFT', 'TAIL', 'TIME', 'DATE', 'PRES', 'DISA', 'WIND'):
+            meta[key] = value.strip()
+
+    width = len(COLUMNS)
+    if rows and rows[-1].count(',') != width - 1:
+        rows.pop()
+    data = np.fromstring(','.join(rows), sep=',') if rows else np.empty(0)
+    data = data[:len(data) - len(data) % width].reshape(-1, width)
+
+    meta['start'] = StartTime(meta['DATE'], meta['TIME']) if 'DATE' in meta and 'TIME' in meta else 0
+    return meta, data
+
+
+def WriteFDR(path, start, data, acft='Aircraft/Laminar Research/Airbus A330-300/A330.acf', tail='N12345'):
+    '''Write `data` (rows laid out as COLUMNS) the way GenFDR does.'''
+    when = datetime.datetime.fromtimestamp(start, datetime.timezone.utc)
+    time, date = when.strftime('%H-%M-%S'), when.strftime('%d-%m-%Y')
+    with open(path, 'w') as f:
+        f.write("A\n3\n\n")
+        f.write(f"ACFT, {acft}\n")
+        f.write(f"TAIL, {tail}\n")
+        f.write(f"TIME, {time}\n")
+        f.write(f"DATE, {date}\n")
+        f.write("PRES, 29.92\nDISA, 0\nWIND, 180,10\n\n")
+        f.write("\nCOMM,Sample,Long,Lat,PressureAlt,MagHeading,Pitch,Roll,BaroAlt,VSPD,SLAT,FLAP,LDG\n")
+        body = '\n'.join("DATA," + ",".join(f"{v:.5f}" for v in row) for row in data.tolist())
+        f.write(body + "\n")
+
+
+def SyntheticFlight(rng, samples, cruise=None, lat0=None, lon0=None):
+    '''A climb / cruise / descent / approach profile with noise, laid out as
+    COLUMNS. The last quarter is the approach: descending through 3,000 ft
+    to the runway with CAS settling around 140-170 kt.'''
+    n = samples
+    t = np.arange(n, dtype=float)
+    cruise = cruise if cruise is not None else rng.uniform(18000, 38000)
+    lat0 = lat0 if lat0 is not None else rng.uniform(-60, 60)
+    lon0 = lon0 if lon0 is not None else rng.uniform(-170, 170)
+
+    # Altitude: climb 25 %, cruise 35 %, descend 20 %, approach 20 %
+    a, b, c = int(0.25 * n), int(0.60 * n), int(0.80 * n)
+    alt = np.empty(n)
+    alt[:a] = np.linspace(0, cruise, a)
+    alt[a:b] = cruise
+    alt[b:c] = np.linspace(cruise, 3000, c - b)
+    alt[c:] = np.linspace(3000, 0, n - c)
+    alt += rng.normal(0, 15, n).cumsum() * 0.1
+
+    cas = np.interp(t, [0, a, b, c, n - 1], [150, 300, 280, 220, rng.uniform(130, 175)])
+    cas += rng.normal(0, 2, n)
+    vspd = np.gradient(alt) * 60.0
+    heading = (rng.uniform(0, 360) + rng.normal(0, 0.5, n).cumsum()) % 360
+    track = np.radians(heading)
+    step = cas / 3600.0 / 60.0          # deg of arc per second, near enough
+    lat = lat0 + np.cumsum(step * np.cos(track))
+    lon = lon0 + np.cumsum(step * np.sin(track)) / max(math.cos(math.radians(lat0)), 0.2)
+
+    data = np.column_stack([
+        t, lon, lat, alt, heading,
+        rng.normal(2, 1.5, n), rng.normal(0, 5, n),
+        alt + rng.normal(0, 10, n), cas, vspd,
+        (alt < 5000).astype(float), np.clip((3000 - alt) / 3000, 0, 1),
+        (alt < 1500).astype(float)
+    ])
+    return data
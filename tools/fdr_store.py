@@ -0,0 +1,305 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      FDR archive store (ingest + query)
+Tools Used:     Python 3.13.3, NumPy, SQLite
+
+Loads GenFDR recordings into one SQLite file so the whole archive can be
+queried without reparsing every .fdr.
+
+    python -m tools.fdr_store ingest "X-Plane 12/Output/fdr_files" --db fdr.sqlite
+    python -m tools.fdr_store query --db fdr.sqlite --from 2026-09-01 --to 2026-10-01 \\
+        --where "press_altitude<1000" --where "cas>160" --flights
+
+Tables:
+
+    flights   one row per file: path, mtime, size, ACFT, TAIL, DATE, TIME,
+              start / end timestamps, sample count
+    samples   every DATA row, keyed (flight_id, sample), WITHOUT ROWID so a
+              flight's rows sit together on disk
+    buckets   one row per flight per BUCKET_SECONDS of recording with the
+              min / max of every parameter in it (a zone map)
+
+A query first picks buckets by time range and by the min / max bounds of its
+thresholds, then reads only those buckets' sample ranges through the samples
+primary key. Ingestion is incremental (files whose size and mtime are
+unchanged are skipped, changed files are replaced) and parses files in a
+process pool while the main process does the writing.
+'''
+
+import argparse
+import calendar
+import datetime
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tools.fdr_files import COLUMNS, SAMPLE_PERIOD, ReadFDR
+
+BUCKET_SECONDS = 60
+PARAMS = COLUMNS[1:]
+OPS = {'<': 'min', '<=': 'min', '>': 'max', '>=': 'max'}
+WHERE = re.compile(r'^\s*(\w+)\s*(<=|>=|<|>)\s*(-?[\d.]+)\s*$')
+
+
+# ============================================================
+# Schema
+# ============================================================
+def Connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    params = ", ".join(f"{p} REAL" for p in PARAMS)
+    zones = ", ".join(f"{p}_min REAL, {p}_max REAL" for p in PARAMS)
+    db.executescript(f"""
+        CREATE TABLE IF NOT EXISTS flights (
+            id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime REAL, size INTEGER,
+            acft TEXT, tail TEXT, date TEXT, time TEXT,
+            t_start REAL, t_end REAL, nsamples INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS flights_start ON flights (t_start);
+        CREATE INDEX IF NOT EXISTS flights_tail ON flights (tail);
+        CREATE INDEX IF NOT EXISTS flights_acft ON flights (acft);
+
+        CREATE TABLE IF NOT EXISTS samples (
+            flight_id INTEGER, sample INTEGER, {params},
+            PRIMARY KEY (flight_id, sample)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS buckets (
+            flight_id INTEGER, bucket INTEGER, sample_lo INTEGER, sample_hi INTEGER, {zones},
+            PRIMARY KEY (flight_id, bucket)
+        );
+        CREATE INDEX IF NOT EXISTS buckets_time ON buckets (bucket);
+    """)
+    return db
+
+
+# ============================================================
+# Ingestion
+# ============================================================
+def ParseFile(path):
+    '''Worker: parse one file into rows ready for executemany().'''
+    meta, data = ReadFDR(path)
+    n = len(data)
+    start = meta['start']
+    end = start + (data[-1, 0] if n else 0) * SAMPLE_PERIOD
+    flight = (meta.get('ACFT'), meta.get('TAIL'), meta.get('DATE'), meta.get('TIME'), start, end, n)
+    if n == 0:
+        return path, flight, [], []
+
+    # Bucket by absolute time so buckets from different flights line up
+    ts = start + data[:, 0] * SAMPLE_PERIOD
+    ids = (ts // BUCKET_SECONDS).astype(np.int64)
+    cuts = np.flatnonzero(np.diff(ids)) + 1
+    lo = np.concatenate(([0], cuts))
+    values = data[:, 1:]
+    mins = np.minimum.reduceat(values, lo, axis=0)
+    maxs = np.maximum.reduceat(values, lo, axis=0)
+    zones = np.empty((len(lo), 2 * len(PARAMS)))
+    zones[:, 0::2], zones[:, 1::2] = mins, maxs
+    hi = np.concatenate((cuts, [n])) - 1
+    buckets = [
+        (int(ids[a]), int(data[a, 0]), int(data[b, 0]), *z)
+        for a, b, z in zip(lo.tolist(), hi.tolist(), zones.tolist())
+    ]
+    samples = [(int(r[0]), *r[1:]) for r in data.tolist()]
+    return path, flight, samples, buckets
+
+
+def Pending(db, paths):
+    '''Return (files to ingest, flight ids they replace, flight ids whose
+    file is no longer in `paths`).'''
+    known = {p: (fid, m, s) for fid, p, m, s in db.execute("SELECT id, path, mtime, size FROM flights")}
+    todo, stale = [], []
+    for path in paths:
+        st = os.stat(path)
+        old = known.pop(path, None)
+        if old and old[1] == st.st_mtime and old[2] == st.st_size:
+            continue
+        if old:
+            stale.append(old[0])
+        todo.append(path)
+    return todo, stale, [fid for fid, _, _ in known.values()]
+
+
+def Drop(db, flightIds):
+    for fid in flightIds:
+        db.execute("DELETE FROM samples WHERE flight_id = ?", (fid,))
+        db.execute("DELETE FROM buckets WHERE flight_id = ?", (fid,))
+        db.execute("DELETE FROM flights WHERE id = ?", (fid,))
+
+
+def Ingest(db, folder, workers=None, prune=False, log=print):
+    '''Bring the store up to date with the .fdr files under `folder`.
+    Returns a stats dict.'''
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(folder)
+        for name in names if name.endswith('.fdr')
+    )
+    todo, stale, missing = Pending(db, paths)
+    t0 = time.perf_counter()
+    with db:
+        Drop(db, stale + (missing if prune else []))
+
+    cols = len(PARAMS)
+    sampleSQL = f"INSERT INTO samples VALUES (?, ?, {', '.join('?' * cols)})"
+    bucketSQL = f"INSERT INTO buckets VALUES (?, ?, ?, ?, {', '.join('?' * 2 * cols)})"
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, (path, flight, samples, buckets) in enumerate(pool.map(ParseFile, todo, chunksize=4)):
+            st = os.stat(path)
+            with db:
+                fid = db.execute(
+                    "INSERT INTO flights (path, mtime, size, acft, tail, date, time, t_start, t_end, nsamples) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, st.st_mtime, st.st_size, *flight)
+                ).lastrowid
+                db.executemany(sampleSQL, ((fid, *r) for r in samples))
+                db.executemany(bucketSQL, ((fid, *b) for b in buckets))
+            rows += len(samples)
+            if log and (i + 1) % 100 == 0:
+                log(f"  {i + 1}/{len(todo)} files")
+    if todo:
+        db.execute("ANALYZE")
+
+    return {
+        'files': len(paths), 'ingested': len(todo), 'replaced': len(stale),
+        'skipped': len(paths) - len(todo), 'rows': rows,
+        'seconds': round(time.perf_counter() - t0, 3),
+    }
+
+
+# ============================================================
+# Queries
+# ============================================================
+def ParseWhere(text):
+    m = WHERE.match(text)
+    if not m or m.group(1) not in PARAMS:
+        raise ValueError(f"bad filter {text!r}: expected <param><op><value> with param in {PARAMS}")
+    return m.group(1), m.group(2), float(m.group(3))
+
+
+def ParseTime(text):
+    '''ISO date or date-time, read as UTC like the stored timestamps.'''
+    if text is None:
+        return None
+    return calendar.timegm(datetime.datetime.fromisoformat(text).timetuple())
+
+
+def Query(db, start=None, end=None, where=(), acft=None, tail=None, columns=None, limit=None):
+    '''Samples inside [start, end) (epoch seconds) matching every
+    (param, op, value) in `where`. Returns (column names, rows); each row is
+    flight_id, timestamp, then `columns` (default: the filtered params).'''
+    columns = list(columns or dict.fromkeys(p for p, _, _ in where)) or ['press_altitude']
+    # Names and operators are spliced into the SQL, so only known ones get through
+    bad = [c for c in columns if c not in PARAMS]
+    bad += [f"{p} {op}" for p, op, _ in where if p not in PARAMS or op not in OPS]
+    if bad:
+        raise ValueError(f"bad column / filter {bad}: params must be in {PARAMS}, operators in {list(OPS)}")
+
+    # Stage 1: candidate buckets from the zone map
+    cond, args = [], []
+    if start is not None:
+        cond.append("b.bucket >= ?")
+        args.append(int(start // BUCKET_SECONDS))
+    if end is not None:
+        cond.append("b.bucket <= ?")
+        args.append(int(end // BUCKET_SECONDS))
+    for p, op, v in where:
+        cond.append(f"b.{p}_{OPS[op]} {op} ?")
+        args.append(v)
+    if acft is not None:
+        cond.append("f.acft = ?")
+        args.append(acft)
+    if tail is not None:
+        cond.append("f.tail = ?")
+        args.append(tail)
+
+    # Stage 2: exact filter on just those buckets' rows
+    ts = f"(f.t_start + s.sample * {SAMPLE_PERIOD})"
+    rowCond = [f"{ts} >= ?"] * (start is not None) + [f"{ts} < ?"] * (end is not None)
+    rowArgs = [start] * (start is not None) + [end] * (end is not None)
+    for p, op, v in where:
+        rowCond.append(f"s.{p} {op} ?")
+        rowArgs.append(v)
+
+    # CROSS JOIN pins the join order so SQLite never starts from a samples scan
+    # (flights first only when filtering by aircraft / tail)
+    bySample = "samples s ON s.flight_id = b.flight_id AND s.sample BETWEEN b.sample_lo AND b.sample_hi"
+    if acft is not None or tail is not None:
+        tables = f"flights f CROSS JOIN buckets b ON b.flight_id = f.id CROSS JOIN {bySample}"
+    else:
+        tables = f"buckets b CROSS JOIN {bySample} JOIN flights f ON f.id = b.flight_id"
+    sql = f"""
+        SELECT s.flight_id, {ts}, {', '.join('s.' + c for c in columns)}
+        FROM {tables}
+        WHERE {' AND '.join(cond) or '1'} AND {' AND '.join(rowCond) or '1'}
+        ORDER BY s.flight_id, s.sample
+    """ + (f" LIMIT {int(limit)}" if limit else "")
+    return ['flight_id', 'timestamp'] + columns, db.execute(sql, args + rowArgs).fetchall()
+
+
+def Flights(db, rows):
+    '''Summarise Query() rows per flight.'''
+    hits = {}
+    for fid, ts, *_ in rows:
+        first, last, count = hits.get(fid, (ts, ts, 0))
+        hits[fid] = (min(first, ts), max(last, ts), count + 1)
+    out = []
+    for fid, (first, last, count) in hits.items():
+        path, acft, tail, date, tme = db.execute(
+            "SELECT path, acft, tail, date, time FROM flights WHERE id = ?", (fid,)).fetchone()
+        out.append({'flight_id': fid, 'path': path, 'acft': acft, 'tail': tail, 'date': date,
+                    'time': tme, 'samples': count, 'first': first, 'last': last})
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='cmd', required=True)
+
+    ing = sub.add_parser('ingest', help='add new / changed .fdr files to the store')
+    ing.add_argument('folder')
+    ing.add_argument('--db', default='fdr.sqlite')
+    ing.add_argument('--workers', type=int, default=None)
+    ing.add_argument('--prune', action='store_true', help='drop flights whose file is gone')
+
+    qry = sub.add_parser('query', help='time-range / threshold query')
+    qry.add_argument('--db', default='fdr.sqlite')
+    qry.add_argument('--from', dest='start')
+    qry.add_argument('--to', dest='end')
+    qry.add_argument('--where', action='append', default=[], help='e.g. "cas>160" (repeatable)')
+    qry.add_argument('--acft')
+    qry.add_argument('--tail')
+    qry.add_argument('--columns', nargs='*')
+    qry.add_argument('--limit', type=int)
+    qry.add_argument('--flights', action='store_true', help='one summary line per matching flight')
+    args = parser.parse_args()
+
+    db = Connect(args.db)
+    if args.cmd == 'ingest':
+        print(json.dumps(Ingest(db, args.folder, args.workers, args.prune), indent=2))
+        return
+
+    t0 = time.perf_counter()
+    names, rows = Query(db, ParseTime(args.start), ParseTime(args.end),
+                        [ParseWhere(w) for w in args.where], args.acft, args.tail, args.columns, args.limit)
+    elapsed = time.perf_counter() - t0
+    if args.flights:
+        for f in Flights(db, rows):
+            print(json.dumps(f))
+    else:
+        print(",".join(names))
+        for r in rows:
+            print(",".join(f"{v:.5f}" if isinstance(v, float) else str(v) for v in r))
+    print(f"# {len(rows)} samples in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
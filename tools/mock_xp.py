@@ -0,0 +1,208 @@
+'''
+Author:         Aryan Shukla
+Module Name:    Mock xp (for offline tools and benchmarks)
+Tools Used:     Python 3.13.3
+
+Stand-in for XPPython3's `xp` module so plugins can be imported and driven
+outside X-Plane. Datarefs are plain floats / lists, commands are counted, and
+flight loops are only called when the caller runs `RunFlightLoops()`.
+
+    from tools import mock_xp
+    xp = mock_xp.install()
+    import PI_CustomCommand
+'''
+
+import os
+import sys
+import types
+
+
+class MockXP:
+    CommandBegin = 0
+    CommandContinue = 1
+    CommandEnd = 2
+
+    DownFlag = 1
+    UpFlag = 2
+    VK_Z = 0x5A
+
+    Phase_Window = 1
+    Font_Proportional = 18
+    Type_Float = 2
+    Type_Double = 4
+    Type_FloatArray = 8
+    Type_Int = 1
+    Type_IntArray = 16
+
+    def __init__(self):
+        self.Counter = 0
+        self.datarefs = {}
+        self.accessors = {}
+        self.commands = {}
+        self.commandCounts = {}
+        self.flightLoops = {}
+        self.logs = []
+        self.spoken = []
+        self.simTime = 0.0
+        # X-Plane root as returned by getSystemPath(); point it at an install
+        # to use that install's Resources/plugins/DataRefs.txt
+        self.systemPath = os.path.join(os.getcwd(), '')
+
+    # ------------------------------------------------------------
+    # Utilities
+    # ------------------------------------------------------------
+    def log(self, msg=""):
+        self.logs.append(msg)
+
+    def speakString(self, msg):
+        self.spoken.append(msg)
+
+    def getCycleNumber(self):
+        return self.Counter
+
+    def getElapsedTime(self):
+        return self.simTime
+
+    def getScreenSize(self):
+        return 1920, 1080
+
+    def getSystemPath(self):
+        return self.systemPath
+
+    # ------------------------------------------------------------
+    # Datarefs
+    # ------------------------------------------------------------
+    def findDataRef(self, name):
+        if name not in self.datarefs:
+            self.datarefs[name] = 0.0
+        return name
+
+    def canWriteDataRef(self, ref):
+        return 1
+
+    def isDataRefGood(self, ref):
+        return 1
+
+    def getDataf(self, ref):
+        if ref in self.accessors:
+            acc = self.accessors[ref]
+            return float(acc['readFloat'](acc.get('readRefCon')))
+        return float(self.datarefs[ref])
+
+    def setDataf(self, ref, value):
+        if ref in self.accessors:
+            acc = self.accessors[ref]
+            acc['writeFloat'](acc.get('writeRefCon'), float(value))
+            return
+        self.datarefs[ref] = float(value)
+
+    getDatad = getDataf
+    setDatad = setDataf
+
+    def getDatai(self, ref):
+        return int(self.datarefs[ref])
+
+    def setDatai(self, ref, value):
+        self.datarefs[ref] = int(value)
+
+    def getDatavf(self, ref, values, offset=0, count=-1):
+        src = self.datarefs[ref]
+        if not isinstance(src, (list, tuple)):
+            return 0
+        if values is None:
+            return len(src)
+        n = len(src) - offset if count < 0 else min(count, len(src) - offset)
+        values[:n] = src[offset:offset + n]
+        return n
+
+    getDatavi = getDatavf
+
+    def registerDataAccessor(self, name, **kwargs):
+        if kwargs.get('readFloat'):
+            self.accessors[name] = kwargs
+        else:
+            self.datarefs.setdefault(name, 0.0)
+        return name
+
+    def unregisterDataAccessor(self, ref):
+        self.accessors.pop(ref, None)
+
+    # ------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------
+    def findCommand(self, name):
+        self.commandCounts.setdefault(name, 0)
+        return name
+
+    def createCommand(self, name, desc=""):
+        return self.findCommand(name)
+
+    def registerCommandHandler(self, cmdRef, handler, before=1, refCon=None):
+        self.commands[cmdRef] = (handler, refCon)
+
+    def unregisterCommandHandler(self, cmdRef, handler, before=1, refCon=None):
+        self.commands.pop(cmdRef, None)
+
+    def commandOnce(self, cmdRef):
+        self.commandCounts[cmdRef] = self.commandCounts.get(cmdRef, 0) + 1
+        if cmdRef in self.commands:
+            handler, refCon = self.commands[cmdRef]
+            handler(cmdRef, self.CommandBegin, refCon)
+            handler(cmdRef, self.CommandEnd, refCon)
+
+    # ------------------------------------------------------------
+    # Flight loops
+    # ------------------------------------------------------------
+    def registerFlightLoopCallback(self, callback, interval=0.0, refCon=None):
+        self.flightLoops[callback] = [self.simTime + interval, refCon]
+
+    def unregisterFlightLoopCallback(self, callback, refCon=None):
+        self.flightLoops.pop(callback, None)
+
+    def setFlightLoopCallbackInterval(self, callback, interval, relativeToNow=1, refCon=None):
+        if callback in self.flightLoops:
+            self.flightLoops[callback][0] = self.simTime + interval
+
+    def RunFlightLoops(self, dt):
+        '''Advance sim time by `dt` and call every flight loop that is due.
+        Returns the number of callbacks made.'''
+        self.simTime += dt
+        self.Counter += 1
+        calls = 0
+        for callback, entry in list(self.flightLoops.items()):
+            due, refCon = entry
+            if due > self.simTime + 1e-9:
+                continue
+            calls += 1
+            nxt = callback(dt, dt, self.Counter, refCon)
+            if callback not in self.flightLoops:
+                continue
+            if not nxt:
+                self.flightLoops.pop(callback, None)
+            elif nxt > 0:
+                self.flightLoops[callback][0] = self.simTime + nxt
+            else:
+                self.flightLoops[callback][0] = self.simTime + dt * -nxt
+        return calls
+
+    # ------------------------------------------------------------
+    # Anything else (menus, hotkeys, drawing) is a harmless no-op
+    # ------------------------------------------------------------
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def noop(*args, **kwargs):
+            return 0
+        return noop
+
+
+def install():
+    '''Register a fresh MockXP as `XPPython3.xp` and return it.'''
+    xp = MockXP()
+    pkg = types.ModuleType('XPPython3')
+    pkg.xp = xp
+    sys.modules['XPPython3'] = pkg
+    sys.modules['XPPython3.xp'] = xp
+    return xp
+
@@ -0,0 +1,105 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      Telemetry reference client
+Tools Used:     Python 3.13.3, NumPy
+
+Subscribes to PI_Telemetry and prints decoded frames:
+
+    python -m tools.telemetry_client --params ALT CAS --rate 5
+
+--loopback runs a local Publisher fed with synthetic samples instead of the
+sim, with two subscribers (all parameters at full rate, two parameters at
+5 Hz), and checks what each one receives; it exits non-zero if either client
+counts a dropped frame. Use it as the offline stand-in.
+'''
+
+import argparse
+import math
+import threading
+import time
+
+import numpy as np
+
+from Telemetry import Publisher, TelemetryClient, DEFAULT_PORT
+
+
+def Loopback(seconds, hz):
+    params = ['ALT', 'CAS', 'PTCH', 'ROLL', 'VSPD']
+    publisher = Publisher(params, port=0)
+    publisher.start()
+
+    full = TelemetryClient(port=publisher.port)
+    slow = TelemetryClient(port=publisher.port, params=['CAS', 'ALT'], rate=5)
+    time.sleep(0.2)                     # let both subscriptions register
+
+    received = {'full': [], 'slow': []}
+
+    def Drain(name, client):
+        deadline = time.monotonic() + seconds + 1.0
+        while time.monotonic() < deadline:
+            try:
+                received[name].append(client.receive())
+            except OSError:
+                break
+
+    threads = [threading.Thread(target=Drain, args=item) for item in (('full', full), ('slow', slow))]
+    for t in threads:
+        t.start()
+
+    n = int(seconds * hz)
+    t0 = time.time()
+    for i in range(n):
+        t = t0 + i / hz
+        publisher.push(t, (1000.0 + i, 250.0 + math.sin(i / 10), 2.5, -1.0, -500.0))
+        time.sleep(1.0 / hz)
+
+    for t in threads:
+        t.join()
+    full.close()
+    slow.close()
+    publisher.stop()
+
+    clients = {'full': full, 'slow': slow}
+    for name, frames in received.items():
+        times = np.concatenate([f[1] for f in frames]) if frames else np.empty(0)
+        values = np.concatenate([f[2] for f in frames]) if frames else np.empty((0, 0))
+        rate = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 else 0.0
+        print(f"{name:>4}: frames={len(frames)} samples={len(times)}/{n} params={frames[0][0] if frames else []} "
+              f"rate={rate:.1f}Hz shape={values.shape} dropped={clients[name].dropped}")
+
+    # Loopback UDP does not lose datagrams, so any seq gap is a sequencing bug
+    lossy = [name for name, client in clients.items() if client.dropped != 0]
+    if lossy:
+        raise SystemExit(f"dropped frames reported by: {', '.join(lossy)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--params', nargs='*', default=None)
+    parser.add_argument('--rate', type=float, default=0)
+    parser.add_argument('--loopback', action='store_true')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--hz', type=float, default=60.0)
+    args = parser.parse_args()
+
+    if args.loopback:
+        Loopback(args.seconds, args.hz)
+        return
+
+    client = TelemetryClient(args.host, args.port, params=args.params, rate=args.rate, timeout=5.0)
+    try:
+        while True:
+            names, times, values = client.receive()
+            print(f"{time.strftime('%H:%M:%S')} {len(times)} samples | "
+                  + " ".join(f"{n}={v:.2f}" for n, v in zip(names, values[-1]))
+                  + (f" | dropped {client.dropped}" if client.dropped else ""))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+'''
+Author:         Aryan Shukla
+Tool Name:      AI CoPilot intent training
+Tools Used:     Python 3.13.3, sentence-transformers, scikit-learn, NumPy
+
+Retrains the intent classifier PI_CoPilot loads (ml_model/ai_copilot.pkl, a
+joblib-pickled scikit-learn classifier over all-MiniLM-L6-v2 embeddings) and
+the nearest-centroid table (ml_model/intent_centroids.npz) from one or more
+labeled corpora (text,intent CSV).
+
+Embeddings are kept in an on-disk cache keyed by a hash of the model name and
+the normalized utterance, so a rerun only embeds utterances that are new or
+were edited:
+
+    python -m tools.train_copilot                          # tools/copilot_utterances.csv
+    python -m tools.train_copilot --corpus a.csv b.csv --holdout 0.2
+    python -m tools.train_copilot --growth 4 --no-export   # throughput / retrain time as the corpus grows
+
+Cache layout (ml_model/embedding_cache/):
+
+    meta.json     {"model": ..., "dim": 384}
+    vectors.f32   float32 rows, appended, read through np.memmap
+    keys.bin      20-byte sha1 digests, one per row, appended after its row
+
+Vectors are written before their key, so a crash mid-append leaves at most
+an orphan vector that the next run overwrites. --compact rewrites the cache
+with only the utterances in the current corpora.
+'''
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import time
+
+from tools import mock_xp
+
+xp = mock_xp.install()
+
+import numpy as np  # noqa: E402
+import PI_CoPilot  # noqa: E402
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+DIGEST = 20
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT, "tools", "copilot_utterances.csv")
+DEFAULT_CACHE = os.path.join(ROOT, "ml_model", "embedding_cache")
+
+
+# ============================================================
+# Embedding cache
+# ============================================================
+class EmbeddingCache:
+    def __init__(self, folder, model=MODEL_NAME, dim=384):
+        self.folder = folder
+        self.model = model
+        os.makedirs(folder, exist_ok=True)
+        self.metaPath = os.path.join(folder, 'meta.json')
+        self.vectorPath = os.path.join(folder, 'vectors.f32')
+        self.keyPath = os.path.join(folder, 'keys.bin')
+
+        if os.path.exists(self.metaPath):
+            with open(self.metaPath) as f:
+                meta = json.load(f)
+            if meta['model'] != model:
+                raise ValueError(f"{folder} holds {meta['model']} embeddings, not {model}")
+            if meta['dim'] != dim:
+                raise ValueError(f"{folder} holds {meta['dim']}-d embeddings, the encoder makes {dim}-d")
+            self.dim = meta['dim']
+        else:
+            self.dim = dim
+            self.Reset()
+
+        with open(self.keyPath, 'rb') as f:
+            keys = f.read()
+        rows = min(len(keys) // DIGEST, os.path.getsize(self.vectorPath) // (4 * self.dim))
+        self.index = {keys[i * DIGEST:(i + 1) * DIGEST]: i for i in range(rows)}
+        self.rows = rows
+        # Drop anything past the last complete (vector, key) pair
+        os.truncate(self.vectorPath, rows * 4 * self.dim)
+        os.truncate(self.keyPath, rows * DIGEST)
+        self.vectors = None
+
+    def Reset(self):
+        with open(self.metaPath, 'w') as f:
+            json.dump({'model': self.model, 'dim': self.dim}, f)
+        open(self.vectorPath, 'wb').close()
+        open(self.keyPath, 'wb').close()
+
+    def Key(self, text):
+        return hashlib.sha1(f"{self.model}\0{text}".encode('utf-8')).digest()
+
+    def Missing(self, texts):
+        '''Distinct texts with no cached vector, in first-seen order.'''
+        seen = set()
+        out = []
+        for t in texts:
+            k = self.Key(t)
+            if k not in self.index and k not in seen:
+                seen.add(k)
+                out.append(t)
+        return out
+
+    def Add(self, texts, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"expected {self.dim}-d vectors, got {vectors.shape[1]}")
+        keys = [self.Key(t) for t in texts]
+        with open(self.vectorPath, 'ab') as f:
+            f.write(vectors.tobytes())
+        with open(self.keyPath, 'ab') as f:
+            f.write(b''.join(keys))
+        for k in keys:
+            self.index[k] = self.rows
+            self.rows += 1
+        self.vectors = None
+
+    def Lookup(self, texts):
+        if self.vectors is None or len(self.vectors) != self.rows:
+            self.vectors = np.memmap(self.vectorPath, np.float32, 'r', shape=(self.rows, self.dim)) \
+                if self.rows else np.empty((0, self.dim), np.float32)
+        return np.asarray(self.vectors[[self.index[self.Key(t)] for t in texts]])
+
+    def Compact(self, texts):
+        '''Keep only the vectors for `texts`.'''
+        texts = list(dict.fromkeys(texts))
+        vectors = self.Lookup(texts)
+        self.vectors = None
+        self.Reset()
+        self.index, self.rows = {}, 0
+        self.Add(texts, vectors)
+
+
+# ============================================================
+# Training
+# ============================================================
+def LoadCorpora(paths):
+    rows = []
+    for path in paths:
+        with open(path, newline='') as f:
+            rows += [(PI_CoPilot.PythonInterface.NormalizeTranscript(r['text']), r['intent'])
+                     for r in csv.DictReader(f)]
+    return [(t, i) for t, i in rows if t]
+
+
+def Embed(cache, encoder, texts, batchSize):
+    '''Embed the texts the cache does not have yet. Returns (count, seconds).'''
+    missing = cache.Missing(texts)
+    t0 = time.perf_counter()
+    for i in range(0, len(missing), batchSize):
+        batch = missing[i:i + batchSize]
+        cache.Add(batch, encoder.encode(batch, batch_size=batchSize, convert_to_numpy=True))
+    return len(missing), time.perf_counter() - t0
+
+
+def Train(X, y, C):
+    from sklearn.linear_model import LogisticRegression
+
+    clf = LogisticRegression(C=C, max_iter=2000)
+    t0 = time.perf_counter()
+    clf.fit(X, y)
+    return clf, time.perf_counter() - t0
+
+
+def Centroids(X, y):
+    '''Mean unit embedding per intent, as PI_CoPilot's fast path expects.'''
+    X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+    intents = sorted(set(y))
+    y = np.asarray(y)
+    return intents, np.stack([X[y == i].mean(axis=0) for i in intents]).astype(np.float32)
+
+
+def Export(plugin, clf, X, y):
+    import joblib
+
+    os.makedirs(os.path.dirname(plugin.model_path), exist_ok=True)
+    tmp = plugin.model_path + '.tmp'
+    joblib.dump(clf, tmp)
+    os.replace(tmp, plugin.model_path)
+    intents, centroids = Centroids(X, y)
+    tmp = plugin.centroids_path + '.tmp'
+    with open(tmp, 'wb') as f:      # a file object, so savez does not append .npz
+        np.savez(f, intents=np.array(intents), centroids=centroids)
+    os.replace(tmp, plugin.centroids_path)
+
+
+def Step(cache, encoder, corpus, holdout, C, batchSize, rng):
+    texts = [t for t, _ in corpus]
+    embedded, embedSeconds = Embed(cache, encoder, texts, batchSize)
+
+    order = list(range(len(corpus)))
+    rng.shuffle(order)
+    cut = int(len(order) * holdout)
+    test, train = order[:cut], order[cut:]
+
+    X = cache.Lookup(texts)
+    y = [i for _, i in corpus]
+    clf, trainSeconds = Train(X[train], [y[k] for k in train], C)
+    report = {
+        'utterances': len(corpus), 'intents': len(set(y)), 'embedded': embedded,
+        'embed_s': round(embedSeconds, 3),
+        'utt_per_s': round(embedded / embedSeconds, 1) if embedded else None,
+        'train_s': round(trainSeconds, 3), 'cache_rows': cache.rows,
+    }
+    if test:
+        report['holdout_accuracy'] = round(float(np.mean(clf.predict(X[test]) == np.array([y[k] for k in test]))), 4)
+    return clf, X, y, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs='+', default=[DEFAULT_CORPUS])
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--C", type=float, default=10.0, help="inverse regularisation of the classifier")
+    parser.add_argument("--holdout", type=float, default=0.0, help="fraction held out to report accuracy")
+    parser.add_argument("--growth", type=int, default=0,
+                        help="train on 1/N, 2/N ... N/N of the corpus and report each step")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--no-export", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    plugin = PI_CoPilot.PythonInterface()
+    rng = random.Random(args.seed)
+    corpus = LoadCorpora(args.corpus)
+
+    t0 = time.perf_counter()
+    encoder = SentenceTransformer(MODEL_NAME)
+    print(json.dumps({'model_load_s': round(time.perf_counter() - t0, 2)}))
+    cache = EmbeddingCache(args.cache, MODEL_NAME, encoder.get_sentence_embedding_dimension())
+
+    steps = [corpus]
+    if args.growth:
+        shuffled = corpus[:]
+        rng.shuffle(shuffled)
+        steps = [shuffled[:len(shuffled) * k // args.growth] for k in range(1, args.growth + 1)]
+
+    for part in steps:
+        clf, X, y, report = Step(cache, encoder, part, args.holdout, args.C, args.batch_size, rng)
+        print(json.dumps(report))
+
+    if args.holdout:
+        clf, _ = Train(X, y, args.C)        # export a model trained on everything
+    if args.compact:
+        cache.Compact([t for t, _ in corpus])
+    if not args.no_export:
+        Export(plugin, clf, X, y)
+        print(json.dumps({'exported': [plugin.model_path, plugin.centroids_path]}))
+
+
+if __name__ == "__main__":
+    main()
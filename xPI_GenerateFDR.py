@@ -7,6 +7,8 @@ Tools Used:     Python 3.13.3, XPPython3 4.5.0
 from XPPython3 import xp  # type: ignore
 import os
 import datetime
+from SessionJournal import SessionJournal
+from TrafficLog import TrafficWriter
 
 
 class PythonInterface:
@@ -34,10 +36,84 @@ class PythonInterface:
         }
         self.parameters = list(self.datarefs.keys())
 
+        # Multiplayer / AI traffic, read from the TCAS target arrays (slot 0 is
+        # the user aircraft). Each field is one getDatavf() per sample however
+        # many aircraft there are.
+        self.traffic_datarefs = {
+            'lat': 'sim/cockpit2/tcas/targets/position/lat',
+            'lon': 'sim/cockpit2/tcas/targets/position/lon',
+            'ele': 'sim/cockpit2/tcas/targets/position/ele',
+            'psi': 'sim/cockpit2/tcas/targets/position/psi',
+            'the': 'sim/cockpit2/tcas/targets/position/the',
+            'phi': 'sim/cockpit2/tcas/targets/position/phi',
+            'vx': 'sim/cockpit2/tcas/targets/position/vx',
+            'vy': 'sim/cockpit2/tcas/targets/position/vy',
+            'vz': 'sim/cockpit2/tcas/targets/position/vz',
+        }
+        self.traffic_count_dataref = 'sim/cockpit2/tcas/indicators/tcas_num_acf'
+        self.traffic_id_dataref = 'sim/cockpit2/tcas/targets/modeS_id'
+        self.MAX_TRAFFIC = 64
+        self.logTraffic = False
+        self.traffic = None
+        self.trafficCount = 0
+
         self.isLogging = False
         self.sampling_rate = 1
         self.counter = 0
         self.file = None
+        self.log_path = None
+
+        self.output_dir = 'G:\\SteamLibrary\\steamapps\\common\\X-Plane 12\\Output\\fdr_files'
+
+        # Crash recovery: every CHECKPOINT_EVERY samples the file path, the byte
+        # offset after the last complete DATA line and the sample counter are
+        # journaled. A session that was not stopped cleanly is resumed by the
+        # next StartLogging().
+        self.CHECKPOINT_EVERY = 10
+        self.journal = None
+
+    def ResumeLogging(self):
+        state = self.journal.load()
+        if state is None:
+            return False
+        meta, _ = state
+        if not meta.get('active') or not os.path.exists(meta.get('path', '')):
+            return False
+
+        # Drop anything after the last checkpoint, e.g. a half-written final line
+        with open(meta['path'], 'r+b') as f:
+            f.truncate(meta['offset'])
+        self.log_path = meta['path']
+        self.file = open(self.log_path, 'a')
+        self.counter = meta['counter']
+        if meta.get('traffic_path'):
+            self.traffic = TrafficWriter(
+                meta['traffic_path'], list(self.traffic_datarefs), resumeAt=meta['traffic_offset']
+            )
+        xp.log(f"Logging --> Resumed {self.log_path} at sample {self.counter}.")
+        return True
+
+    def Checkpoint(self, active=True):
+        self.journal.checkpoint({
+            'active': active,
+            'path': self.log_path,
+            'offset': self.file.tell(),
+            'counter': self.counter,
+            'traffic_path': self.traffic.path if self.traffic else None,
+            'traffic_offset': self.traffic.flush() if self.traffic else 0,
+        })
+
+    def SampleTraffic(self, sample):
+        # Everything below is a fixed number of calls; per-aircraft work is
+        # only the C-level slice/extend inside TrafficWriter.append()
+        n = min(xp.getDatai(self.traffic_pointers['count']), self.MAX_TRAFFIC)
+        self.trafficCount = max(n - 1, 0)
+        if n <= 1:
+            return
+        xp.getDatavi(self.traffic_pointers['id'], self.trafficIds, 1, n - 1)
+        for field, ref in self.traffic_pointers['fields'].items():
+            xp.getDatavf(ref, self.trafficBuffers[field], 1, n - 1)
+        self.traffic.append(xp.getElapsedTime(), sample, self.trafficIds[:n - 1], self.trafficBuffers)
 
     def StartLogging(self):
         xp.log("Logging --> Started.")
@@ -45,13 +121,20 @@ class PythonInterface:
         self.isLogging = True
         xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: OFF")
 
+        if self.journal is None:
+            self.journal = SessionJournal(os.path.join(self.output_dir, 'genfdr.journal'), capacity=4096)
+        if self.ResumeLogging():
+            xp.registerFlightLoopCallback(self.FlightLoopCallback, self.sampling_rate, 0)
+            xp.registerDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
+            return
+
         time = datetime.datetime.now().strftime('%H-%M-%S')
         date = datetime.datetime.now().strftime('%d-%m-%Y')
-        log_path = os.path.join(
-            'G:\\SteamLibrary\\steamapps\\common\\X-Plane 12\\Output\\fdr_files',
-            f"[FDR]_{date + "_" + time}.fdr"
+        self.log_path = os.path.join(
+            self.output_dir,
+            f"[FDR]_{date}_{time}.fdr"
         )
-        self.file = open(log_path, 'w')
+        self.file = open(self.log_path, 'w')
 
         self.file.write("A\n")
         self.file.write("3\n\n")
@@ -69,27 +152,47 @@ class PythonInterface:
             if name not in ['latitude', 'longitude', 'press_altitude', 'mag_heading', 'pitch', 'roll']:
                 self.file.write(f"DREF, {ref}\t\t\t1.0\n")
 
+        if self.logTraffic:
+            self.traffic = TrafficWriter(self.log_path + '.traffic', list(self.traffic_datarefs))
+
         self.file.write("\nCOMM,Sample,Long,Lat,PressureAlt,MagHeading,Pitch,Roll,BaroAlt,VSPD,SLAT,FLAP,LDG\n")
         self.counter = 0
+        self.file.flush()
+        self.Checkpoint()
         xp.registerFlightLoopCallback(self.FlightLoopCallback, self.sampling_rate, 0)
         xp.registerDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
 
     def StopLogging(self):
         if self.file:
+            self.file.flush()
+            self.Checkpoint(active=False)
             self.file.close()
             self.file = None
+        if self.traffic:
+            self.traffic.close()
+            self.traffic = None
         xp.unregisterFlightLoopCallback(self.FlightLoopCallback, 0)
         xp.unregisterDrawCallback(self.DrawCallback, xp.Phase_Window, 0, 0)
         self.isLogging = False
-        xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: ON")
+        if self.menuId is not None:
+            xp.setMenuItemName(self.menuId, self.menuIndex, "Toggle: ON")
         xp.log("Logging --> Stopped.")
 
     def ToggleLogging(self, menuRefCon, itemRefCon):
+        if itemRefCon == 2:
+            self.ToggleTraffic()
+            return
         if self.isLogging:
             self.StopLogging()
         else:
             self.StartLogging()
 
+    def ToggleTraffic(self):
+        # Takes effect from the next StartLogging()
+        self.logTraffic = not self.logTraffic
+        xp.setMenuItemName(self.menuId, self.trafficMenuIndex,
+                           "Traffic: OFF" if self.logTraffic else "Traffic: ON")
+
     def FlightLoopCallback(self, elapsedSinceLastCall, elapsedTimeSinceLastFlightLoop, loopCounter, refcon):
         i = self.counter
         values = [i] + [
@@ -98,7 +201,11 @@ class PythonInterface:
         ]
         self.file.write("DATA," + ",".join(f"{val:.5f}" for val in values) + "\n")
         self.file.flush()
+        if self.traffic:
+            self.SampleTraffic(i)
         self.counter += 1
+        if self.counter % self.CHECKPOINT_EVERY == 0:
+            self.Checkpoint()
 
         return 1
 
@@ -108,7 +215,8 @@ class PythonInterface:
             rgb=(1.0, 0.0, 0.0),
             x=screen_width - 250,
             y=screen_height + 5 - screen_height,
-            value=f"[LOGGING TIMESERIES DATA] | Samples: {self.counter:,}",
+            value=f"[LOGGING TIMESERIES DATA] | Samples: {self.counter:,}"
+                  + (f" | Traffic: {self.trafficCount}" if self.traffic else ""),
             fontID=xp.Font_Proportional
         )
         return 1
@@ -121,6 +229,16 @@ class PythonInterface:
 
         self.menuId = xp.createMenu("Generate FDR", None, 0, self.ToggleLogging, 0)
         self.menuIndex = xp.appendMenuItem(self.menuId, "Toggle: ON", 1, 1)
+        self.trafficMenuIndex = xp.appendMenuItem(self.menuId, "Traffic: ON", 2, 1)
+
+        self.traffic_pointers = {
+            'count': xp.findDataRef(self.traffic_count_dataref),
+            'id': xp.findDataRef(self.traffic_id_dataref),
+            'fields': {f: xp.findDataRef(ref) for f, ref in self.traffic_datarefs.items()},
+        }
+        # Reused every sample by getDatavf / getDatavi
+        self.trafficBuffers = {f: [0.0] * self.MAX_TRAFFIC for f in self.traffic_datarefs}
+        self.trafficIds = [0] * self.MAX_TRAFFIC
 
         return self.Name, self.Sig, self.Desc
     
@@ -136,4 +254,13 @@ class PythonInterface:
             self.menuId = None
 
     def XPluginStop(self):
-        pass
\ No newline at end of file
+        # A clean shutdown closes the session, so the journal is marked
+        # inactive and the next start does not resume it
+        if self.isLogging:
+            self.StopLogging()
+        if self.traffic is not None:
+            self.traffic.close()
+            self.traffic = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
\ No newline at end of file